@@ -1,7 +1,10 @@
+import os
 import json
-import copy
-from uuid import uuid4
-from typing import Tuple, Optional
+import pickle
+import random
+import numpy as np
+from itertools import compress
+from typing import Callable, Sequence, Tuple, Optional
 from blade.units.Aircraft import Aircraft
 from blade.units.Airbase import Airbase
 from blade.units.Facility import Facility
@@ -10,7 +13,7 @@ from blade.units.Weapon import Weapon
 from blade.units.ReferencePoint import ReferencePoint
 from blade.mission.PatrolMission import PatrolMission
 from blade.mission.StrikeMission import StrikeMission
-from blade.Scenario import Scenario
+from blade.Scenario import Scenario, EntityType
 from blade.Side import Side
 from blade.Relationships import Relationships
 from blade.Doctrine import DoctrineType
@@ -18,21 +21,32 @@ from blade.Doctrine import DoctrineType
 from blade.utils.constants import NAUTICAL_MILES_TO_METERS
 from blade.utils.colors import SIDE_COLOR
 from blade.utils.PlaybackRecorder import PlaybackRecorder
-from blade.utils.utils import (
-    get_bearing_between_two_points,
-    get_next_coordinates,
-    get_distance_between_two_points,
-    to_camelcase,
+from blade.utils.Profiler import Profiler
+from blade.utils.actions import ACTION_METHODS, iter_actions
+from blade.utils.ColumnarScenario import (
+    read_columnar_scenario,
+    write_columnar_scenario,
 )
+from blade.utils.serialization import deserialize_scenario, serialize_scenario
+from blade.utils.ScenarioStreamReader import read_scenario_stream
+from blade.utils.utils import get_distance_between_two_points, random_uuid
 from blade.engine.weaponEngagement import (
     aircraft_pursuit,
-    is_threat_detected,
+    get_detected_threats,
+    get_threat_indices,
     check_target_tracked_by_count,
     launch_weapon,
     route_aircraft_to_strike_position,
-    weapon_engagement,
+    weapon_engagement_batch,
     weapon_can_engage_target,
 )
+from blade.engine.kinematics import (
+    burn_fuel,
+    burn_fuel_groups,
+    jump_units_along_routes,
+    move_unit_groups_along_routes,
+)
+from blade.engine.fastForward import get_event_horizon
 
 
 class Game:
@@ -42,13 +56,31 @@ class Game:
         current_scenario: Scenario,
         record_every_seconds: Optional[int] = None,
         recording_export_path: Optional[str] = ".",
+        use_state_store: bool = False,
+        enable_profiler: bool = False,
+        delta_recording: bool = False,
+        recording_keyframe_interval: Optional[int] = None,
+        recording_compression: Optional[str] = None,
     ):
         self.current_scenario = current_scenario
         self.initial_scenario = current_scenario
+        self.use_state_store = use_state_store
+        if self.use_state_store:
+            self.current_scenario.enable_state_store()
+        self.profiler = Profiler(enabled=enable_profiler)
+        # random draws come from the global random module until a seeded reset gives
+        # the game a generator of its own
+        self.rng: Optional[random.Random] = None
 
         self.current_side_id = ""
         self.recording_scenario = False
-        self.recorder = PlaybackRecorder(record_every_seconds, recording_export_path)
+        self.recorder = PlaybackRecorder(
+            record_every_seconds,
+            recording_export_path,
+            delta_encoding=delta_recording,
+            keyframe_interval=recording_keyframe_interval,
+            compression=recording_compression,
+        )
         self.scenario_paused = True
         self.current_attacker_id = ""
         self.map_view = {
@@ -58,8 +90,83 @@ class Game:
             "currentCameraZoom": 0,
         }
 
+    @property
+    def initial_scenario(self) -> Scenario:
+        # scenarios loaded from json decode their initial copy only when it is needed
+        if self._initial_scenario is None:
+            self._initial_scenario = self._load_saved_scenario()
+            self._saved_scenario = None
+            self._saved_scenario_path = None
+        # the caller may modify the returned scenario, so the next reset snapshots it
+        # again
+        self._initial_snapshot = None
+        return self._initial_scenario
+
+    @initial_scenario.setter
+    def initial_scenario(self, scenario: Scenario) -> None:
+        self._initial_scenario = scenario
+        self._initial_snapshot = None
+        self._saved_scenario = None
+        self._saved_scenario_path = None
+        self._saved_scenario_reset = False
+
+    def _load_saved_scenario(self) -> Optional[Scenario]:
+        if self._initial_snapshot is not None:
+            return pickle.loads(self._initial_snapshot)
+        elif self._saved_scenario is not None:
+            return deserialize_scenario(self._saved_scenario)
+        elif self._saved_scenario_path is not None:
+            return self._read_saved_scenario_file()
+        return None
+
+    def _read_saved_scenario_file(self) -> Scenario:
+        # the file is only read again if it still looks like the one loaded, going by
+        # its size and modification time, rather than silently resetting to new content
+        with open(self._saved_scenario_path, "r", encoding="utf-8") as scenario_file:
+            file_stat = os.fstat(scenario_file.fileno())
+            if (file_stat.st_size, file_stat.st_mtime_ns) != self._saved_scenario_stat:
+                raise ValueError(
+                    f"Scenario file {self._saved_scenario_path} changed after it was "
+                    "loaded, load it again to reset to its new content"
+                )
+            return read_scenario_stream(scenario_file)[1]
+
+    def _get_initial_snapshot(self) -> bytes:
+        # restoring a pickle is several times faster than deepcopying the object graph
+        # or decoding the saved scenario
+        if self._initial_snapshot is None:
+            initial_scenario = self._initial_scenario
+            if initial_scenario is None:
+                initial_scenario = self._load_saved_scenario()
+            self._initial_snapshot = pickle.dumps(
+                initial_scenario, pickle.HIGHEST_PROTOCOL
+            )
+            self._saved_scenario = None
+            self._saved_scenario_path = None
+        return self._initial_snapshot
+
+    def clone(self) -> "Game":
+        # the clone restores its scenarios from this game's initial snapshot instead
+        # of decoding them again. It does not record, and has no random generator
+        # until it is reset with a seed.
+        initial_snapshot = self._get_initial_snapshot()
+        game = Game(
+            current_scenario=pickle.loads(
+                pickle.dumps(self.current_scenario, pickle.HIGHEST_PROTOCOL)
+            ),
+            use_state_store=self.use_state_store,
+            enable_profiler=self.profiler.enabled,
+        )
+        game._initial_scenario = None
+        game._initial_snapshot = initial_snapshot
+        game.current_side_id = self.current_side_id
+        game.scenario_paused = self.scenario_paused
+        game.current_attacker_id = self.current_attacker_id
+        game.map_view = dict(self.map_view)
+        return game
+
     def remove_aircraft(self, aircraft_id: str) -> None:
-        self.current_scenario.aircraft.remove(
+        self.current_scenario.remove_entity(
             self.current_scenario.get_aircraft(aircraft_id)
         )
 
@@ -98,7 +205,7 @@ class Game:
             return None
 
         reference_point = ReferencePoint(
-            id=str(uuid4()),
+            id=random_uuid(self.rng),
             name=reference_point_name,
             side_id=self.current_side_id,
             latitude=latitude,
@@ -106,11 +213,11 @@ class Game:
             altitude=0,
             side_color=self.current_scenario.get_side_color(self.current_side_id),
         )
-        self.current_scenario.reference_points.append(reference_point)
+        self.current_scenario.add_entity(reference_point)
         return reference_point
 
     def remove_reference_point(self, reference_point_id: str) -> None:
-        self.current_scenario.reference_points.remove(
+        self.current_scenario.remove_entity(
             self.current_scenario.get_reference_point(reference_point_id)
         )
 
@@ -122,7 +229,7 @@ class Game:
         if ship and len(ship.aircraft) > 0:
             aircraft = ship.aircraft.pop(0)
             if aircraft:
-                self.current_scenario.aircraft.append(aircraft)
+                self.current_scenario.add_entity(aircraft)
                 return aircraft
 
     def launch_aircraft_from_airbase(self, airbase_id: str) -> Aircraft | None:
@@ -133,7 +240,7 @@ class Game:
         if airbase and len(airbase.aircraft) > 0:
             aircraft = airbase.aircraft.pop(0)
             if aircraft:
-                self.current_scenario.aircraft.append(aircraft)
+                self.current_scenario.add_entity(aircraft)
                 return aircraft
 
     def create_patrol_mission(
@@ -146,14 +253,14 @@ class Game:
             return
         current_side_id = self.current_scenario.get_side(self.current_side_id).id
         mission = PatrolMission(
-            id=str(uuid4()),
+            id=random_uuid(self.rng),
             name=mission_name,
             side_id=current_side_id if current_side_id else self.current_side_id,
             assigned_unit_ids=assigned_units,
             assigned_area=assigned_area,
             active=True,
         )
-        self.current_scenario.missions.append(mission)
+        self.current_scenario.add_entity(mission)
 
     def update_patrol_mission(
         self,
@@ -180,14 +287,14 @@ class Game:
     ) -> None:
         current_side_id = self.current_scenario.get_side(self.current_side_id).id
         strike_mission = StrikeMission(
-            id=str(uuid4()),
+            id=random_uuid(self.rng),
             name=mission_name,
             side_id=current_side_id if current_side_id else self.current_side_id,
             assigned_unit_ids=assigned_attackers,
             assigned_target_ids=assigned_targets,
             active=True,
         )
-        self.current_scenario.missions.append(strike_mission)
+        self.current_scenario.add_entity(strike_mission)
 
     def update_strike_mission(
         self,
@@ -206,11 +313,11 @@ class Game:
                 strike_mission.assigned_target_ids = assigned_targets
 
     def delete_mission(self, mission_id: str) -> None:
-        self.current_scenario.missions = [
-            mission
-            for mission in self.current_scenario.missions
-            if mission.id != mission_id
-        ]
+        mission = self.current_scenario.get_patrol_mission(
+            mission_id
+        ) or self.current_scenario.get_strike_mission(mission_id)
+        if mission is not None:
+            self.current_scenario.remove_entity(mission)
 
     def move_aircraft(self, aircraft_id: str, new_coordinates: list) -> Aircraft | None:
         aircraft = self.current_scenario.get_aircraft(aircraft_id)
@@ -248,7 +355,12 @@ class Game:
             weapon = aircraft.get_weapon(weapon_id)
             if weapon:
                 launch_weapon(
-                    self.current_scenario, aircraft, target, weapon, weapon_quantity
+                    self.current_scenario,
+                    aircraft,
+                    target,
+                    weapon,
+                    weapon_quantity,
+                    rng=self.rng,
                 )
 
     def handle_ship_attack(
@@ -262,7 +374,12 @@ class Game:
             weapon = ship.get_weapon(weapon_id)
             if weapon:
                 launch_weapon(
-                    self.current_scenario, ship, target, weapon, weapon_quantity
+                    self.current_scenario,
+                    ship,
+                    target,
+                    weapon,
+                    weapon_quantity,
+                    rng=self.rng,
                 )
 
     def aircraft_return_to_base(self, aircraft_id: str) -> Aircraft | None:
@@ -317,11 +434,17 @@ class Game:
         return 0
 
     def facility_auto_defense(self) -> None:
+        aircraft_indices = get_threat_indices(
+            self.current_scenario, EntityType.AIRCRAFT
+        )
+        weapon_indices = get_threat_indices(self.current_scenario, EntityType.WEAPON)
         for facility in self.current_scenario.facilities:
             if self.current_scenario.check_side_doctrine(
                 facility.side_id, DoctrineType.SAM_ATTACK_HOSTILE
             ):
-                for aircraft in self.current_scenario.aircraft:
+                for aircraft in get_detected_threats(
+                    self.current_scenario, aircraft_indices, facility
+                ):
                     if self.current_scenario.is_hostile(facility.side_id, aircraft.side_id):
                         facility_weapon = (
                             facility.get_weapon_with_highest_engagement_range()
@@ -329,8 +452,7 @@ class Game:
                         if facility_weapon is None:
                             continue
                         if (
-                            is_threat_detected(aircraft, facility)
-                            and weapon_can_engage_target(aircraft, facility_weapon)
+                            weapon_can_engage_target(aircraft, facility_weapon)
                             and check_target_tracked_by_count(
                                 self.current_scenario, aircraft
                             )
@@ -342,8 +464,11 @@ class Game:
                                 aircraft,
                                 facility_weapon,
                                 1,
+                                rng=self.rng,
                             )
-            for weapon in self.current_scenario.weapons:
+            for weapon in get_detected_threats(
+                self.current_scenario, weapon_indices, facility
+            ):
                 if self.current_scenario.is_hostile(facility.side_id, weapon.side_id):
                     facility_weapon = (
                         facility.get_weapon_with_highest_engagement_range()
@@ -352,7 +477,6 @@ class Game:
                         continue
                     if (
                         weapon.target_id == facility.id
-                        and is_threat_detected(weapon, facility)
                         and weapon_can_engage_target(weapon, facility_weapon)
                         and check_target_tracked_by_count(self.current_scenario, weapon)
                         < 5
@@ -363,21 +487,27 @@ class Game:
                             weapon,
                             facility_weapon,
                             1,
+                            rng=self.rng,
                         )
 
     def ship_auto_defense(self) -> None:
+        aircraft_indices = get_threat_indices(
+            self.current_scenario, EntityType.AIRCRAFT
+        )
+        weapon_indices = get_threat_indices(self.current_scenario, EntityType.WEAPON)
         for ship in self.current_scenario.ships:
             if self.current_scenario.check_side_doctrine(
                 ship.side_id, DoctrineType.SHIP_ATTACK_HOSTILE
             ):
-                for aircraft in self.current_scenario.aircraft:
+                for aircraft in get_detected_threats(
+                    self.current_scenario, aircraft_indices, ship
+                ):
                     if self.current_scenario.is_hostile(ship.side_id, aircraft.side_id):
                         ship_weapon = ship.get_weapon_with_highest_engagement_range()
                         if ship_weapon is None:
                             continue
                         if (
-                            is_threat_detected(aircraft, ship)
-                            and weapon_can_engage_target(aircraft, ship_weapon)
+                            weapon_can_engage_target(aircraft, ship_weapon)
                             and check_target_tracked_by_count(
                                 self.current_scenario, aircraft
                             )
@@ -389,15 +519,17 @@ class Game:
                                 aircraft,
                                 ship_weapon,
                                 1,
+                                rng=self.rng,
                             )
-            for weapon in self.current_scenario.weapons:
+            for weapon in get_detected_threats(
+                self.current_scenario, weapon_indices, ship
+            ):
                 if self.current_scenario.is_hostile(ship.side_id, weapon.side_id):
                     ship_weapon = ship.get_weapon_with_highest_engagement_range()
                     if ship_weapon is None:
                         continue
                     if (
                         weapon.target_id == ship.id
-                        and is_threat_detected(weapon, ship)
                         and weapon_can_engage_target(weapon, ship_weapon)
                         and check_target_tracked_by_count(self.current_scenario, weapon)
                         < 5
@@ -408,9 +540,14 @@ class Game:
                             weapon,
                             ship_weapon,
                             1,
+                            rng=self.rng,
                         )
 
     def aircraft_air_to_air_engagement(self) -> None:
+        aircraft_indices = get_threat_indices(
+            self.current_scenario, EntityType.AIRCRAFT
+        )
+        weapon_indices = get_threat_indices(self.current_scenario, EntityType.WEAPON)
         for aircraft in self.current_scenario.aircraft:
             if len(aircraft.weapons) == 0:
                 continue
@@ -422,15 +559,16 @@ class Game:
             if self.current_scenario.check_side_doctrine(
                 aircraft.side_id, DoctrineType.AIRCRAFT_ATTACK_HOSTILE
             ):
-                for enemy_aircraft in self.current_scenario.aircraft:
+                for enemy_aircraft in get_detected_threats(
+                    self.current_scenario, aircraft_indices, aircraft
+                ):
                     if self.current_scenario.is_hostile(
                         aircraft.side_id, enemy_aircraft.side_id
                     ) and (
                         aircraft.target_id == "" or aircraft.target_id == enemy_aircraft.id
                     ):
                         if (
-                            is_threat_detected(enemy_aircraft, aircraft)
-                            and weapon_can_engage_target(
+                            weapon_can_engage_target(
                                 enemy_aircraft, aircraft_weapon_with_max_range
                             )
                             and check_target_tracked_by_count(
@@ -444,15 +582,17 @@ class Game:
                                 enemy_aircraft,
                                 aircraft_weapon_with_max_range,
                                 1,
+                                rng=self.rng,
                             )
                             aircraft.target_id = enemy_aircraft.id
-            for enemy_weapon in self.current_scenario.weapons:
+            for enemy_weapon in get_detected_threats(
+                self.current_scenario, weapon_indices, aircraft
+            ):
                 if self.current_scenario.is_hostile(
                     aircraft.side_id, enemy_weapon.side_id
                 ):
                     if (
                         enemy_weapon.target_id == aircraft.id
-                        and is_threat_detected(enemy_weapon, aircraft)
                         and weapon_can_engage_target(
                             enemy_weapon, aircraft_weapon_with_max_range
                         )
@@ -467,6 +607,7 @@ class Game:
                             enemy_weapon,
                             aircraft_weapon_with_max_range,
                             1,
+                            rng=self.rng,
                         )
             if self.current_scenario.check_side_doctrine(
                 aircraft.side_id, DoctrineType.AIRCRAFT_CHASE_HOSTILE
@@ -492,7 +633,7 @@ class Game:
                     continue
                 if len(unit.route) == 0:
                     random_waypoint_in_patrol_area = (
-                        mission.generate_random_coordinates_within_patrol_area()
+                        mission.generate_random_coordinates_within_patrol_area(self.rng)
                     )
                     unit.route.append(random_waypoint_in_patrol_area)
                 elif len(unit.route) > 0:
@@ -501,7 +642,9 @@ class Game:
                     ):
                         unit.route = []
                         random_waypoint_in_patrol_area = (
-                            mission.generate_random_coordinates_within_patrol_area()
+                            mission.generate_random_coordinates_within_patrol_area(
+                                self.rng
+                            )
                         )
                         unit.route.append(random_waypoint_in_patrol_area)
 
@@ -547,9 +690,13 @@ class Game:
             else:
                 return True
 
-        self.current_scenario.missions = list(
-            filter(mission_filter, self.current_scenario.missions)
-        )
+        completed_missions = [
+            mission
+            for mission in self.current_scenario.missions
+            if not mission_filter(mission)
+        ]
+        for mission in completed_missions:
+            self.current_scenario.remove_entity(mission)
 
     def update_units_on_strike_mission(self):
         active_strike_missions = list(
@@ -637,11 +784,17 @@ class Game:
                     if launched_weapon is None:
                         continue
                     launch_weapon(
-                        self.current_scenario, attacker, target, launched_weapon, 1
+                        self.current_scenario,
+                        attacker,
+                        target,
+                        launched_weapon,
+                        1,
+                        rng=self.rng,
                     )
                     attacker.target_id = target.id
 
-    def update_all_aircraft_position(self) -> None:
+    def land_returning_aircraft(self) -> list[Aircraft]:
+        landed_aircraft_ids = []
         for aircraft in self.current_scenario.aircraft:
             if aircraft.rtb:
                 aircraft_homebase = (
@@ -659,100 +812,74 @@ class Game:
                     )
                     < 0.5
                 ):
-                    self.land_aicraft(aircraft.id)
-                    continue
+                    landed_aircraft_ids.append(aircraft.id)
+        for aircraft_id in landed_aircraft_ids:
+            self.land_aicraft(aircraft_id)
+        return list(self.current_scenario.aircraft)
 
-            route = aircraft.route
-            if len(route) > 0:
-                next_waypoint = route[0]
-                next_waypoint_latitude = next_waypoint[0]
-                next_waypoint_longitude = next_waypoint[1]
-                if (
-                    get_distance_between_two_points(
-                        aircraft.latitude,
-                        aircraft.longitude,
-                        next_waypoint_latitude,
-                        next_waypoint_longitude,
-                    )
-                    < 0.5
-                ):
-                    aircraft.latitude = next_waypoint_latitude
-                    aircraft.longitude = next_waypoint_longitude
-                    aircraft.route.pop(0)
-                else:
-                    next_aircraft_coordinates = get_next_coordinates(
-                        aircraft.latitude,
-                        aircraft.longitude,
-                        next_waypoint_latitude,
-                        next_waypoint_longitude,
-                        aircraft.speed,
-                    )
-                    next_aircraft_latitude = next_aircraft_coordinates[0]
-                    next_aircraft_longitude = next_aircraft_coordinates[1]
-                    aircraft.latitude = next_aircraft_latitude
-                    aircraft.longitude = next_aircraft_longitude
-                    aircraft.heading = get_bearing_between_two_points(
-                        aircraft.latitude,
-                        aircraft.longitude,
-                        next_waypoint_latitude,
-                        next_waypoint_longitude,
-                    )
-            aircraft.current_fuel -= aircraft.fuel_rate / 3600
-            fuel_needed_to_return_to_base = self.get_fuel_needed_to_return_to_base(
-                aircraft
-            )
-            if aircraft.current_fuel <= 0:
+    def handle_aircraft_fuel(
+        self, airborne_aircraft: list[Aircraft], remaining_fuel: np.ndarray
+    ) -> None:
+        for aircraft, current_fuel in zip(airborne_aircraft, remaining_fuel.tolist()):
+            if current_fuel <= 0:
                 self.remove_aircraft(aircraft.id)
             elif (
                 self.current_scenario.check_side_doctrine(
                     aircraft.side_id, DoctrineType.AIRCRAFT_RTB_WHEN_OUT_OF_RANGE
-                ) and
-                aircraft.current_fuel < fuel_needed_to_return_to_base * 1.1
+                )
                 and not aircraft.rtb
+                and current_fuel
+                < self.get_fuel_needed_to_return_to_base(aircraft) * 1.1
             ):
                 self.aircraft_return_to_base(aircraft.id)
 
+    def update_all_aircraft_position(self) -> None:
+        Game.update_aircraft_positions([self])
+
+    @staticmethod
+    def update_aircraft_positions(games: Sequence["Game"]) -> None:
+        # the aircraft of all games move and burn fuel as one batch of array operations
+        aircraft_groups = [
+            (
+                game.land_returning_aircraft(),
+                game.current_scenario.get_state_store(EntityType.AIRCRAFT),
+            )
+            for game in games
+        ]
+        move_unit_groups_along_routes(aircraft_groups)
+        for game, (airborne_aircraft, _), remaining_fuel in zip(
+            games, aircraft_groups, burn_fuel_groups(aircraft_groups)
+        ):
+            game.handle_aircraft_fuel(airborne_aircraft, remaining_fuel)
+
+    def remove_ships_out_of_fuel(
+        self, moving_ships: list[Ship], remaining_fuel: np.ndarray
+    ) -> None:
+        for ship in compress(moving_ships, (remaining_fuel <= 0).tolist()):
+            self.current_scenario.remove_entity(ship)
+
     def update_all_ship_position(self) -> None:
-        for ship in self.current_scenario.ships:
-            route = ship.route
-            if len(route) < 1:
-                continue
-            next_waypoint = route[0]
-            next_waypoint_latitude = next_waypoint[0]
-            next_waypoint_longitude = next_waypoint[1]
-            if (
-                get_distance_between_two_points(
-                    ship.latitude,
-                    ship.longitude,
-                    next_waypoint_latitude,
-                    next_waypoint_longitude,
-                )
-                < 0.5
-            ):
-                ship.latitude = next_waypoint_latitude
-                ship.longitude = next_waypoint_longitude
-                ship.route.pop(0)
-            else:
-                next_ship_coordinates = get_next_coordinates(
-                    ship.latitude,
-                    ship.longitude,
-                    next_waypoint_latitude,
-                    next_waypoint_longitude,
-                    ship.speed,
-                )
-                next_ship_latitude = next_ship_coordinates[0]
-                next_ship_longitude = next_ship_coordinates[1]
-                ship.latitude = next_ship_latitude
-                ship.longitude = next_ship_longitude
-                ship.heading = get_bearing_between_two_points(
-                    ship.latitude,
-                    ship.longitude,
-                    next_waypoint_latitude,
-                    next_waypoint_longitude,
-                )
-            ship.current_fuel -= ship.fuel_rate / 3600
-            if ship.current_fuel <= 0:
-                self.current_scenario.ships.remove(ship)
+        Game.update_ship_positions([self])
+
+    @staticmethod
+    def update_ship_positions(games: Sequence["Game"]) -> None:
+        ship_groups = [
+            (
+                game.current_scenario.ships,
+                game.current_scenario.get_state_store(EntityType.SHIP),
+            )
+            for game in games
+        ]
+        moving_ship_groups = [
+            (moving_ships, state_store)
+            for moving_ships, (_, state_store) in zip(
+                move_unit_groups_along_routes(ship_groups), ship_groups
+            )
+        ]
+        for game, (moving_ships, _), remaining_fuel in zip(
+            games, moving_ship_groups, burn_fuel_groups(moving_ship_groups)
+        ):
+            game.remove_ships_out_of_fuel(moving_ships, remaining_fuel)
 
     def update_onboard_weapon_positions(self) -> None:
         for aircraft in self.current_scenario.aircraft:
@@ -768,33 +895,71 @@ class Game:
                 weapon.latitude = ship.latitude
                 weapon.longitude = ship.longitude
 
-    def update_game_state(self) -> None:
-        self.current_scenario.current_time += 1
-
-        self.facility_auto_defense()
-        self.ship_auto_defense()
-        self.aircraft_air_to_air_engagement()
+    def update_engagements_and_missions(self) -> None:
+        # everything update_game_state does before units move
+        profiler = self.profiler
+        with profiler.phase("facility_auto_defense"):
+            self.facility_auto_defense()
+        with profiler.phase("ship_auto_defense"):
+            self.ship_auto_defense()
+        with profiler.phase("aircraft_air_to_air_engagement"):
+            self.aircraft_air_to_air_engagement()
+
+        with profiler.phase("update_units_on_patrol_mission"):
+            self.update_units_on_patrol_mission()
+        with profiler.phase("clear_completed_strike_missions"):
+            self.clear_completed_strike_missions()
+        with profiler.phase("update_units_on_strike_mission"):
+            self.update_units_on_strike_mission()
+
+        with profiler.phase("weapon_engagement"):
+            weapon_engagement_batch(self.current_scenario, self.rng)
+
+    @staticmethod
+    def update_unit_positions(games: Sequence["Game"], profiler: Profiler) -> None:
+        # everything update_game_state does once engagements and missions are updated
+        with profiler.phase("update_all_aircraft_position"):
+            Game.update_aircraft_positions(games)
+        with profiler.phase("update_all_ship_position"):
+            Game.update_ship_positions(games)
+        with profiler.phase("update_onboard_weapon_positions"):
+            for game in games:
+                game.update_onboard_weapon_positions()
 
-        self.update_units_on_patrol_mission()
-        self.clear_completed_strike_missions()
-        self.update_units_on_strike_mission()
-
-        for weapon in self.current_scenario.weapons:
-            weapon_engagement(self.current_scenario, weapon)
-
-        self.update_all_aircraft_position()
-        self.update_all_ship_position()
-        self.update_onboard_weapon_positions()
+    def update_game_state(self) -> None:
+        Game.update_game_states([self])
+
+    @staticmethod
+    def update_game_states(games: Sequence["Game"]) -> None:
+        # runs one tick of every game, with the units of all games moving and burning
+        # fuel in one batch. Games with an enabled profiler finish their tick on their
+        # own instead, so that its phases and counters only cover their own work.
+        batched_games = []
+        for game in games:
+            game.current_scenario.current_time += 1
+
+            profiler = game.profiler
+            with profiler.activate(), profiler.phase("update_game_state"):
+                game.update_engagements_and_missions()
+                if profiler.enabled:
+                    Game.update_unit_positions([game], profiler)
+                else:
+                    batched_games.append(game)
+        if len(batched_games) > 0:
+            # none of these profilers is enabled, so the phases record nothing
+            Game.update_unit_positions(batched_games, batched_games[0].profiler)
 
-    def handle_action(self, action: list | str) -> None:
-        if not action or action == "" or len(action) == 0:
-            return
+    def handle_action(self, action: list | tuple | str | np.ndarray) -> None:
         try:
-            if isinstance(action, str):
-                exec(f"{"self." if "self." not in action else ""}{action}")
-            elif isinstance(action, list):
-                for sub_action in action:
+            for sub_action in iter_actions(action):
+                if isinstance(sub_action, str):
                     exec(f"{"self." if "self." not in sub_action else ""}{sub_action}")
+                    continue
+                action_type, arguments = sub_action
+                method_name = ACTION_METHODS.get(action_type)
+                if method_name is None:
+                    raise ValueError(f"Unknown action type {action_type}")
+                getattr(self, method_name)(*arguments)
         except Exception as e:
             print(e)
 
@@ -802,20 +967,93 @@ class Game:
         return self.current_scenario
 
     def _get_info(self) -> dict:
+        if self.profiler.enabled:
+            return {"profiler": self.profiler.get_info()}
         return {}
 
-    def step(self, action) -> Tuple[Scenario, float, bool, bool, None]:
-        self.handle_action(action)
-        self.update_game_state()
-        terminated = False
+    def get_tick_result(
+        self,
+        termination_fnc: Optional[Callable[[Scenario], bool]] = None,
+        reward_fnc: Optional[Callable[[Scenario], float]] = None,
+    ) -> Tuple[float, bool, bool]:
+        reward = 0 if reward_fnc is None else reward_fnc(self.current_scenario)
+        terminated = (
+            False if termination_fnc is None else termination_fnc(self.current_scenario)
+        )
         truncated = self.check_game_ended()
-        reward = 0
+        return reward, terminated, truncated
+
+    def advance(
+        self,
+        ticks: int = 1,
+        termination_fnc: Optional[Callable[[Scenario], bool]] = None,
+        reward_fnc: Optional[Callable[[Scenario], float]] = None,
+    ) -> Tuple[float, bool, bool]:
+        # runs up to ticks updates, summing their rewards and stopping at the first
+        # tick that ends the episode
+        total_reward = 0
+        terminated = truncated = False
+        for _ in range(ticks):
+            self.update_game_state()
+            reward, terminated, truncated = self.get_tick_result(
+                termination_fnc, reward_fnc
+            )
+            total_reward += reward
+            if terminated or truncated:
+                break
+        return total_reward, terminated, truncated
+
+    def fast_forward(self, ticks: int) -> None:
+        # same as ticks calls of update_game_state when nothing but movement and
+        # fuel burn happens in between, see get_event_horizon
+        scenario = self.current_scenario
+        scenario.current_time += ticks
+        aircraft_state_store = scenario.get_state_store(EntityType.AIRCRAFT)
+        jump_units_along_routes(scenario.aircraft, aircraft_state_store, ticks)
+        burn_fuel(scenario.aircraft, aircraft_state_store, ticks)
+        ship_state_store = scenario.get_state_store(EntityType.SHIP)
+        moving_ships = jump_units_along_routes(scenario.ships, ship_state_store, ticks)
+        burn_fuel(moving_ships, ship_state_store, ticks)
+        self.update_onboard_weapon_positions()
+
+    def advance_until_event(self, max_seconds: int) -> int:
+        # skips over the quiet ticks before the next possible event in one jump,
+        # then runs the tick that may hold the event. Returns the seconds advanced.
+        if max_seconds <= 0:
+            return 0
+        ticks = get_event_horizon(self.current_scenario, max_seconds)
+        if ticks > 0:
+            self.fast_forward(ticks)
+        if ticks < max_seconds:
+            self.update_game_state()
+            ticks += 1
+        return ticks
+
+    def step(self, action, ticks: int = 1) -> Tuple[Scenario, float, bool, bool, None]:
+        self.handle_action(action)
+        reward, terminated, truncated = self.advance(ticks)
         observation = self._get_observation()
         info = self._get_info()
         return observation, reward, terminated, truncated, info
 
-    def reset(self):
-        self.current_scenario = copy.deepcopy(self.initial_scenario)
+    def reset(self, seed: Optional[int] = None):
+        if seed is not None:
+            self.rng = random.Random(seed)
+        if self._initial_snapshot is None and self._initial_scenario is None:
+            # decoding a saved scenario costs about as much as restoring a snapshot,
+            # so the snapshot is only taken once the scenario is reset a second time
+            self.current_scenario = self._load_saved_scenario()
+            if self._saved_scenario_reset:
+                self._initial_snapshot = pickle.dumps(
+                    self.current_scenario, pickle.HIGHEST_PROTOCOL
+                )
+                self._saved_scenario = None
+                self._saved_scenario_path = None
+            self._saved_scenario_reset = True
+        else:
+            self.current_scenario = pickle.loads(self._get_initial_snapshot())
+        if self.use_state_store:
+            self.current_scenario.enable_state_store()
         assert len(self.current_scenario.sides) > 0
         self.current_side_id = self.current_scenario.sides[0].id
         self.scenario_paused = True
@@ -825,11 +1063,8 @@ class Game:
         return False
 
     def export_scenario(self) -> dict:
-        scenario_json_string = self.current_scenario.toJson()
-        scenario_json_no_underscores = to_camelcase(scenario_json_string)
-
         export_object = {
-            "currentScenario": json.loads(scenario_json_no_underscores),
+            "currentScenario": serialize_scenario(self.current_scenario),
             "currentSideId": self.current_side_id,
             "selectedUnitId": "",
             "mapView": self.map_view,
@@ -837,392 +1072,60 @@ class Game:
 
         return export_object
 
+    def export_scenario_columnar(self, file_path: str) -> None:
+        write_columnar_scenario(self.export_scenario(), file_path)
+
     def load_scenario(self, scenario_string: str) -> None:
-        import_object = json.loads(scenario_string)
+        self.load_scenario_object(json.loads(scenario_string))
+
+    def load_scenario_columnar(self, file_path: str) -> None:
+        self.load_scenario_object(read_columnar_scenario(file_path))
+
+    def load_scenario_object(self, import_object: dict) -> None:
         self.current_side_id = import_object["currentSideId"]
         self.map_view = import_object["mapView"]
 
         saved_scenario = import_object["currentScenario"]
-        saved_sides = []
-        for side in saved_scenario["sides"]:
-            saved_sides.append(
-                Side(
-                    id=side["id"],
-                    name=side["name"],
-                    total_score=side["totalScore"],
-                    color=side["color"],
-                )
-            )
-        loaded_scenario = Scenario(
-            id=saved_scenario["id"],
-            name=saved_scenario["name"],
-            start_time=saved_scenario["startTime"],
-            current_time=saved_scenario["currentTime"],
-            duration=saved_scenario["duration"],
-            sides=saved_sides,
-            time_compression=saved_scenario["timeCompression"],
-            relationships=Relationships(
-                hostiles=(
-                    saved_scenario["relationships"]["hostiles"]
-                    if "relationships" in saved_scenario.keys()
-                    and saved_scenario["relationships"]["hostiles"]
-                    else {}
-                ),
-                allies=(
-                    saved_scenario["relationships"]["allies"]
-                    if "relationships" in saved_scenario.keys()
-                    and saved_scenario["relationships"]["allies"]
-                    else {}
-                ),
-            ),
-            doctrine=saved_scenario["doctrine"]
-        )
-        for aircraft in saved_scenario["aircraft"]:
-            aircraft_weapons = []
-            if aircraft["weapons"]:
-                for weapon in aircraft["weapons"]:
-                    aircraft_weapons.append(
-                        Weapon(
-                            id=weapon["id"],
-                            name=weapon["name"],
-                            side_id=weapon["sideId"],
-                            class_name=weapon["className"],
-                            latitude=weapon["latitude"],
-                            longitude=weapon["longitude"],
-                            altitude=weapon["altitude"],
-                            heading=weapon["heading"],
-                            speed=weapon["speed"],
-                            current_fuel=weapon["currentFuel"],
-                            max_fuel=weapon["maxFuel"],
-                            fuel_rate=weapon["fuelRate"],
-                            range=weapon["range"],
-                            route=weapon["route"],
-                            side_color=weapon["sideColor"],
-                            target_id=weapon["targetId"],
-                            lethality=weapon["lethality"],
-                            max_quantity=weapon["maxQuantity"],
-                            current_quantity=weapon["currentQuantity"],
-                        )
-                    )
-            loaded_scenario.aircraft.append(
-                Aircraft(
-                    id=aircraft["id"],
-                    name=aircraft["name"],
-                    side_id=aircraft["sideId"],
-                    class_name=aircraft["className"],
-                    latitude=aircraft["latitude"],
-                    longitude=aircraft["longitude"],
-                    altitude=aircraft["altitude"],
-                    heading=aircraft["heading"],
-                    speed=aircraft["speed"],
-                    current_fuel=aircraft["currentFuel"],
-                    max_fuel=aircraft["maxFuel"],
-                    fuel_rate=aircraft["fuelRate"],
-                    range=aircraft["range"],
-                    route=aircraft["route"],
-                    selected=aircraft["selected"],
-                    side_color=aircraft["sideColor"],
-                    weapons=aircraft_weapons,
-                    home_base_id=aircraft["homeBaseId"],
-                    rtb=aircraft["rtb"],
-                    target_id=(
-                        aircraft["targetId"] if "targetId" in aircraft.keys() else ""
-                    ),
-                )
-            )
-        for airbase in saved_scenario["airbases"]:
-            airbase_aircraft = []
-            for aircraft in airbase["aircraft"]:
-                aircraft_weapons = []
-                if aircraft["weapons"]:
-                    for weapon in aircraft["weapons"]:
-                        aircraft_weapons.append(
-                            Weapon(
-                                id=weapon["id"],
-                                name=weapon["name"],
-                                side_id=weapon["sideId"],
-                                class_name=weapon["className"],
-                                latitude=weapon["latitude"],
-                                longitude=weapon["longitude"],
-                                altitude=weapon["altitude"],
-                                heading=weapon["heading"],
-                                speed=weapon["speed"],
-                                current_fuel=weapon["currentFuel"],
-                                max_fuel=weapon["maxFuel"],
-                                fuel_rate=weapon["fuelRate"],
-                                range=weapon["range"],
-                                route=weapon["route"],
-                                side_color=weapon["sideColor"],
-                                target_id=weapon["targetId"],
-                                lethality=weapon["lethality"],
-                                max_quantity=weapon["maxQuantity"],
-                                current_quantity=weapon["currentQuantity"],
-                            )
-                        )
-                new_aircraft = Aircraft(
-                    id=aircraft["id"],
-                    name=aircraft["name"],
-                    side_id=aircraft["sideId"],
-                    class_name=aircraft["className"],
-                    latitude=aircraft["latitude"],
-                    longitude=aircraft["longitude"],
-                    altitude=aircraft["altitude"],
-                    heading=aircraft["heading"],
-                    speed=aircraft["speed"],
-                    current_fuel=aircraft["currentFuel"],
-                    max_fuel=aircraft["maxFuel"],
-                    fuel_rate=aircraft["fuelRate"],
-                    range=aircraft["range"],
-                    route=aircraft["route"],
-                    selected=aircraft["selected"],
-                    side_color=aircraft["sideColor"],
-                    weapons=aircraft_weapons,
-                    home_base_id=aircraft["homeBaseId"],
-                    rtb=aircraft["rtb"],
-                    target_id=(
-                        aircraft["targetId"] if "targetId" in aircraft.keys() else ""
-                    ),
-                )
-                airbase_aircraft.append(new_aircraft)
-            loaded_scenario.airbases.append(
-                Airbase(
-                    id=airbase["id"],
-                    name=airbase["name"],
-                    side_id=airbase["sideId"],
-                    class_name=airbase["className"],
-                    latitude=airbase["latitude"],
-                    longitude=airbase["longitude"],
-                    altitude=airbase["altitude"],
-                    side_color=airbase["sideColor"],
-                    aircraft=airbase_aircraft,
-                )
-            )
-        for facility in saved_scenario["facilities"]:
-            facility_weapons = []
-            if facility["weapons"]:
-                for weapon in facility["weapons"]:
-                    facility_weapons.append(
-                        Weapon(
-                            id=weapon["id"],
-                            name=weapon["name"],
-                            side_id=weapon["sideId"],
-                            class_name=weapon["className"],
-                            latitude=weapon["latitude"],
-                            longitude=weapon["longitude"],
-                            altitude=weapon["altitude"],
-                            heading=weapon["heading"],
-                            speed=weapon["speed"],
-                            current_fuel=weapon["currentFuel"],
-                            max_fuel=weapon["maxFuel"],
-                            fuel_rate=weapon["fuelRate"],
-                            range=weapon["range"],
-                            route=weapon["route"],
-                            side_color=weapon["sideColor"],
-                            target_id=weapon["targetId"],
-                            lethality=weapon["lethality"],
-                            max_quantity=weapon["maxQuantity"],
-                            current_quantity=weapon["currentQuantity"],
-                        )
-                    )
-            loaded_scenario.facilities.append(
-                Facility(
-                    id=facility["id"],
-                    name=facility["name"],
-                    side_id=facility["sideId"],
-                    class_name=facility["className"],
-                    latitude=facility["latitude"],
-                    longitude=facility["longitude"],
-                    altitude=facility["altitude"],
-                    range=facility["range"],
-                    side_color=facility["sideColor"],
-                    weapons=facility_weapons,
-                )
-            )
-        for weapon in saved_scenario["weapons"]:
-            loaded_scenario.weapons.append(
-                Weapon(
-                    id=weapon["id"],
-                    name=weapon["name"],
-                    side_id=weapon["sideId"],
-                    class_name=weapon["className"],
-                    latitude=weapon["latitude"],
-                    longitude=weapon["longitude"],
-                    altitude=weapon["altitude"],
-                    heading=weapon["heading"],
-                    speed=weapon["speed"],
-                    current_fuel=weapon["currentFuel"],
-                    max_fuel=weapon["maxFuel"],
-                    fuel_rate=weapon["fuelRate"],
-                    range=weapon["range"],
-                    route=weapon["route"],
-                    side_color=weapon["sideColor"],
-                    target_id=weapon["targetId"],
-                    lethality=weapon["lethality"],
-                    max_quantity=weapon["maxQuantity"],
-                    current_quantity=weapon["currentQuantity"],
-                )
-            )
-        for ship in saved_scenario["ships"]:
-            ship_aircraft = []
-            for aircraft in ship["aircraft"]:
-                aircraft_weapons = []
-                if aircraft["weapons"]:
-                    for weapon in aircraft["weapons"]:
-                        aircraft_weapons.append(
-                            Weapon(
-                                id=weapon["id"],
-                                name=weapon["name"],
-                                side_id=weapon["sideId"],
-                                class_name=weapon["className"],
-                                latitude=weapon["latitude"],
-                                longitude=weapon["longitude"],
-                                altitude=weapon["altitude"],
-                                heading=weapon["heading"],
-                                speed=weapon["speed"],
-                                current_fuel=weapon["currentFuel"],
-                                max_fuel=weapon["maxFuel"],
-                                fuel_rate=weapon["fuelRate"],
-                                range=weapon["range"],
-                                route=weapon["route"],
-                                side_color=weapon["sideColor"],
-                                target_id=weapon["targetId"],
-                                lethality=weapon["lethality"],
-                                max_quantity=weapon["maxQuantity"],
-                                current_quantity=weapon["currentQuantity"],
-                            )
-                        )
-                new_aircraft = Aircraft(
-                    id=aircraft["id"],
-                    name=aircraft["name"],
-                    side_id=aircraft["sideId"],
-                    class_name=aircraft["className"],
-                    latitude=aircraft["latitude"],
-                    longitude=aircraft["longitude"],
-                    altitude=aircraft["altitude"],
-                    heading=aircraft["heading"],
-                    speed=aircraft["speed"],
-                    current_fuel=aircraft["currentFuel"],
-                    max_fuel=aircraft["maxFuel"],
-                    fuel_rate=aircraft["fuelRate"],
-                    range=aircraft["range"],
-                    route=aircraft["route"],
-                    selected=aircraft["selected"],
-                    side_color=aircraft["sideColor"],
-                    weapons=aircraft_weapons,
-                    home_base_id=aircraft["homeBaseId"],
-                    rtb=aircraft["rtb"],
-                    target_id=aircraft["targetId"] if aircraft["targetId"] else "",
-                )
-                ship_aircraft.append(new_aircraft)
-            ship_weapons = []
-            if ship["weapons"]:
-                for weapon in ship["weapons"]:
-                    ship_weapons.append(
-                        Weapon(
-                            id=weapon["id"],
-                            name=weapon["name"],
-                            side_id=weapon["sideId"],
-                            class_name=weapon["className"],
-                            latitude=weapon["latitude"],
-                            longitude=weapon["longitude"],
-                            altitude=weapon["altitude"],
-                            heading=weapon["heading"],
-                            speed=weapon["speed"],
-                            current_fuel=weapon["currentFuel"],
-                            max_fuel=weapon["maxFuel"],
-                            fuel_rate=weapon["fuelRate"],
-                            range=weapon["range"],
-                            route=weapon["route"],
-                            side_color=weapon["sideColor"],
-                            target_id=weapon["targetId"],
-                            lethality=weapon["lethality"],
-                            max_quantity=weapon["maxQuantity"],
-                            current_quantity=weapon["currentQuantity"],
-                        )
-                    )
-            loaded_scenario.ships.append(
-                Ship(
-                    id=ship["id"],
-                    name=ship["name"],
-                    side_id=ship["sideId"],
-                    class_name=ship["className"],
-                    latitude=ship["latitude"],
-                    longitude=ship["longitude"],
-                    altitude=ship["altitude"],
-                    heading=ship["heading"],
-                    speed=ship["speed"],
-                    current_fuel=ship["currentFuel"],
-                    max_fuel=ship["maxFuel"],
-                    fuel_rate=ship["fuelRate"],
-                    range=ship["range"],
-                    route=ship["route"],
-                    side_color=ship["sideColor"],
-                    weapons=ship_weapons,
-                    aircraft=ship_aircraft,
-                )
-            )
-        if "referencePoints" in saved_scenario.keys():
-            for reference_point in saved_scenario["referencePoints"]:
-                loaded_scenario.reference_points.append(
-                    ReferencePoint(
-                        id=reference_point["id"],
-                        name=reference_point["name"],
-                        side_id=reference_point["sideId"],
-                        latitude=reference_point["latitude"],
-                        longitude=reference_point["longitude"],
-                        altitude=reference_point["altitude"],
-                        side_color=reference_point["sideColor"],
-                    )
-                )
-        if "missions" in saved_scenario.keys():
-            for mission in saved_scenario["missions"]:
-                if "assignedArea" in mission.keys():
-                    assigned_area = []
-                    for point in mission["assignedArea"]:
-                        assigned_area.append(
-                            ReferencePoint(
-                                id=point["id"],
-                                name=point["name"],
-                                side_id=point["sideId"],
-                                latitude=point["latitude"],
-                                longitude=point["longitude"],
-                                altitude=point["altitude"],
-                                side_color=point["sideColor"],
-                            )
-                        )
-                    loaded_scenario.missions.append(
-                        PatrolMission(
-                            id=mission["id"],
-                            name=mission["name"],
-                            side_id=mission["sideId"],
-                            assigned_unit_ids=mission["assignedUnitIds"],
-                            assigned_area=assigned_area,
-                            active=mission["active"],
-                        )
-                    )
-                else:
-                    loaded_scenario.missions.append(
-                        StrikeMission(
-                            id=mission["id"],
-                            name=mission["name"],
-                            side_id=mission["sideId"],
-                            assigned_unit_ids=mission["assignedUnitIds"],
-                            assigned_target_ids=mission["assignedTargetIds"],
-                            active=mission["active"],
-                        )
-                    )
-
-        self.initial_scenario = copy.deepcopy(loaded_scenario)
-        self.current_scenario = loaded_scenario
+        self.current_scenario = deserialize_scenario(saved_scenario)
+        self._initial_scenario = None
+        self._initial_snapshot = None
+        self._saved_scenario = saved_scenario
+        self._saved_scenario_path = None
+        self._saved_scenario_reset = False
+        if self.use_state_store:
+            self.current_scenario.enable_state_store()
+
+    def load_scenario_file(self, file_path: str) -> None:
+        # streams the file so the whole json text and dict tree are never in memory;
+        # the initial scenario is streamed again from the file when it is needed
+        with open(file_path, "r", encoding="utf-8") as scenario_file:
+            file_stat = os.fstat(scenario_file.fileno())
+            import_object, self.current_scenario = read_scenario_stream(scenario_file)
+        self.current_side_id = import_object["currentSideId"]
+        self.map_view = import_object["mapView"]
+        self._initial_scenario = None
+        self._initial_snapshot = None
+        self._saved_scenario = None
+        self._saved_scenario_path = file_path
+        self._saved_scenario_stat = (file_stat.st_size, file_stat.st_mtime_ns)
+        self._saved_scenario_reset = False
+        if self.use_state_store:
+            self.current_scenario.enable_state_store()
 
     def start_recording(self):
         self.recorder.start_recording(self.current_scenario)
 
     def record_step(self, force: bool = False):
         if self.recorder.should_record(self.current_scenario.current_time) or force:
-            self.recorder.record_step(
-                json.dumps(self.export_scenario()), self.current_scenario.current_time
-            )
+            if self.recorder.delta_encoding:
+                self.recorder.record_frame(
+                    self.export_scenario(), self.current_scenario.current_time
+                )
+            else:
+                self.recorder.record_step(
+                    json.dumps(self.export_scenario()),
+                    self.current_scenario.current_time,
+                )
 
     def export_recording(self):
         self.recorder.export_recording(self.current_scenario.current_time)
@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional
+import numpy as np
+from typing import Dict, List, Optional, Sequence
 
 
 class Relationships:
@@ -9,12 +10,66 @@ class Relationships:
     ):
         self.hostiles: Dict[str, List[str]] = hostiles if hostiles is not None else {}
         self.allies: Dict[str, List[str]] = allies if allies is not None else {}
+        self.compile()
+
+    def compile(self):
+        self._side_indices: Dict[str, int] = {}
+        self._hostility_matrix = np.zeros((0, 0), dtype=bool)
+        self._alliance_matrix = np.zeros((0, 0), dtype=bool)
+        for side_id, hostile_ids in self.hostiles.items():
+            for hostile_id in hostile_ids:
+                self._set_hostile(side_id, hostile_id, True)
+        for side_id, ally_ids in self.allies.items():
+            for ally_id in ally_ids:
+                self._set_ally(side_id, ally_id, True)
+
+    def get_side_index(self, side_id: str) -> int:
+        index = self._side_indices.get(side_id)
+        if index is None:
+            index = len(self._side_indices)
+            self._side_indices[side_id] = index
+            capacity = self._hostility_matrix.shape[0]
+            if index >= capacity:
+                new_capacity = max(capacity * 2, 4)
+                self._hostility_matrix = self._grow_matrix(
+                    self._hostility_matrix, new_capacity
+                )
+                self._alliance_matrix = self._grow_matrix(
+                    self._alliance_matrix, new_capacity
+                )
+        return index
+
+    def find_side_indices(self, side_ids: Sequence[str] | str) -> np.ndarray:
+        # read-only lookup, unknown sides map to -1 instead of being added
+        if isinstance(side_ids, str):
+            return np.intp(self._side_indices.get(side_ids, -1))
+        return np.fromiter(
+            (self._side_indices.get(side_id, -1) for side_id in side_ids),
+            dtype=np.intp,
+            count=len(side_ids),
+        )
+
+    def _grow_matrix(self, matrix: np.ndarray, capacity: int) -> np.ndarray:
+        grown_matrix = np.zeros((capacity, capacity), dtype=bool)
+        grown_matrix[: matrix.shape[0], : matrix.shape[1]] = matrix
+        return grown_matrix
+
+    def _set_hostile(self, side_id: str, hostile_id: str, value: bool):
+        side_index = self.get_side_index(side_id)
+        hostile_index = self.get_side_index(hostile_id)
+        self._hostility_matrix[side_index, hostile_index] = value
+
+    def _set_ally(self, side_id: str, ally_id: str, value: bool):
+        side_index = self.get_side_index(side_id)
+        ally_index = self.get_side_index(ally_id)
+        self._alliance_matrix[side_index, ally_index] = value
 
     def add_hostile(self, side_id: str, hostile_id: str):
         if side_id not in self.hostiles:
             self.hostiles[side_id] = []
         if hostile_id not in self.hostiles[side_id]:
             self.hostiles[side_id].append(hostile_id)
+        self._set_hostile(side_id, hostile_id, True)
         self.remove_ally(side_id, hostile_id)
 
     def remove_hostile(self, side_id: str, hostile_id: str):
@@ -22,23 +77,46 @@ class Relationships:
             self.hostiles[side_id] = [
                 id for id in self.hostiles[side_id] if id != hostile_id
             ]
+            self._set_hostile(side_id, hostile_id, False)
 
     def add_ally(self, side_id: str, ally_id: str):
         if side_id not in self.allies:
             self.allies[side_id] = []
         if ally_id not in self.allies[side_id]:
             self.allies[side_id].append(ally_id)
+        self._set_ally(side_id, ally_id, True)
         self.remove_hostile(side_id, ally_id)
 
     def remove_ally(self, side_id: str, ally_id: str):
         if side_id in self.allies:
             self.allies[side_id] = [id for id in self.allies[side_id] if id != ally_id]
+            self._set_ally(side_id, ally_id, False)
 
     def is_ally(self, side_id: str, ally_id: str) -> bool:
-        return ally_id in self.allies.get(side_id, [])
+        side_index = self._side_indices.get(side_id)
+        ally_index = self._side_indices.get(ally_id)
+        if side_index is None or ally_index is None:
+            return False
+        return self._alliance_matrix.item(side_index, ally_index)
 
     def is_hostile(self, side_id: str, hostile_id: str) -> bool:
-        return hostile_id in self.hostiles.get(side_id, [])
+        side_index = self._side_indices.get(side_id)
+        hostile_index = self._side_indices.get(hostile_id)
+        if side_index is None or hostile_index is None:
+            return False
+        return self._hostility_matrix.item(side_index, hostile_index)
+
+    def get_hostility_mask(
+        self, side_ids: Sequence[str] | str, hostile_ids: Sequence[str] | str
+    ) -> np.ndarray:
+        side_indices = self.find_side_indices(side_ids)
+        hostile_indices = self.find_side_indices(hostile_ids)
+        known = (side_indices >= 0) & (hostile_indices >= 0)
+        if not np.any(known):
+            return np.zeros(np.shape(known), dtype=bool)
+        return known & self._hostility_matrix[
+            np.where(known, side_indices, 0), np.where(known, hostile_indices, 0)
+        ]
 
     def get_allies(self, side_id: str) -> List[str]:
         return self.allies.get(side_id, [])
@@ -49,6 +127,13 @@ class Relationships:
     def update_relationship(self, side_id: str, hostiles: List[str], allies: List[str]):
         self.hostiles[side_id] = hostiles
         self.allies[side_id] = allies
+        side_index = self.get_side_index(side_id)
+        self._hostility_matrix[side_index, :] = False
+        self._alliance_matrix[side_index, :] = False
+        for hostile_id in hostiles:
+            self._set_hostile(side_id, hostile_id, True)
+        for ally_id in allies:
+            self._set_ally(side_id, ally_id, True)
 
     def delete_side(self, side_id: str):
         for key in self.hostiles:
@@ -57,6 +142,11 @@ class Relationships:
             self.allies[key] = [id for id in self.allies[key] if id != side_id]
         self.hostiles.pop(side_id, None)
         self.allies.pop(side_id, None)
+        side_index = self._side_indices.get(side_id)
+        if side_index is not None:
+            for matrix in (self._hostility_matrix, self._alliance_matrix):
+                matrix[side_index, :] = False
+                matrix[:, side_index] = False
 
     def to_dict(self):
         return {
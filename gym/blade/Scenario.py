@@ -1,4 +1,6 @@
 import json
+import numpy as np
+from enum import Enum
 
 from blade.units.Aircraft import Aircraft
 from blade.units.Ship import Ship
@@ -9,15 +11,95 @@ from blade.units.ReferencePoint import ReferencePoint
 from blade.Side import Side
 from blade.mission.PatrolMission import PatrolMission
 from blade.mission.StrikeMission import StrikeMission
-from blade.utils.utils import get_distance_between_two_points
+from blade.utils.utils import get_distance_between_two_points_batch
 from blade.utils.colors import SIDE_COLOR
 from blade.Relationships import Relationships
 from blade.Doctrine import Doctrine, DoctrineType, SideDoctrine
+from blade.utils.UnitStateStore import UnitStateStore
+from blade.utils.Profiler import profile_count
 
 HomeBase = Airbase | Ship
 
 Target = Aircraft | Facility | Weapon | Airbase | Ship
 
+Entity = Target | ReferencePoint | PatrolMission | StrikeMission
+
+
+class EntityType(str, Enum):
+    AIRCRAFT = "aircraft"
+    SHIP = "ship"
+    FACILITY = "facility"
+    AIRBASE = "airbase"
+    WEAPON = "weapon"
+    REFERENCE_POINT = "reference_point"
+    PATROL_MISSION = "patrol_mission"
+    STRIKE_MISSION = "strike_mission"
+
+
+ENTITY_TYPES = {
+    Aircraft: EntityType.AIRCRAFT,
+    Ship: EntityType.SHIP,
+    Facility: EntityType.FACILITY,
+    Airbase: EntityType.AIRBASE,
+    Weapon: EntityType.WEAPON,
+    ReferencePoint: EntityType.REFERENCE_POINT,
+    PatrolMission: EntityType.PATROL_MISSION,
+    StrikeMission: EntityType.STRIKE_MISSION,
+}
+
+ENTITY_COLLECTIONS = {
+    EntityType.AIRCRAFT: "aircraft",
+    EntityType.SHIP: "ships",
+    EntityType.FACILITY: "facilities",
+    EntityType.AIRBASE: "airbases",
+    EntityType.WEAPON: "weapons",
+    EntityType.REFERENCE_POINT: "reference_points",
+    EntityType.PATROL_MISSION: "missions",
+    EntityType.STRIKE_MISSION: "missions",
+}
+
+STATE_STORE_ENTITY_CLASSES = {
+    EntityType.AIRCRAFT: Aircraft,
+    EntityType.SHIP: Ship,
+    EntityType.FACILITY: Facility,
+    EntityType.WEAPON: Weapon,
+}
+
+TARGET_ENTITY_TYPES = frozenset(
+    [
+        EntityType.AIRCRAFT,
+        EntityType.SHIP,
+        EntityType.FACILITY,
+        EntityType.AIRBASE,
+        EntityType.WEAPON,
+    ]
+)
+
+SIDE_PARTITIONED_ENTITY_TYPES = (
+    EntityType.AIRCRAFT,
+    EntityType.FACILITY,
+    EntityType.SHIP,
+    EntityType.AIRBASE,
+    EntityType.WEAPON,
+)
+
+ENEMY_TARGET_ENTITY_TYPES = (
+    EntityType.AIRCRAFT,
+    EntityType.FACILITY,
+    EntityType.SHIP,
+    EntityType.AIRBASE,
+)
+
+
+def get_entity_type(entity: Entity) -> EntityType:
+    entity_type = ENTITY_TYPES.get(type(entity))
+    if entity_type is not None:
+        return entity_type
+    for entity_class, entity_type in ENTITY_TYPES.items():
+        if isinstance(entity, entity_class):
+            return entity_type
+    raise TypeError(f"Unsupported scenario entity: {type(entity).__name__}")
+
 
 class Scenario:
     def __init__(
@@ -55,6 +137,96 @@ class Scenario:
         self.missions = missions if missions is not None else []
         self.relationships = relationships
         self.doctrine = doctrine if doctrine is not None else self.get_default_doctrine()
+        self._entities: dict[str, tuple[EntityType, Entity]] = {}
+        self._weapon_target_counts: dict[str, int] = {}
+        self._entity_sequence: dict[str, int] = {}
+        self._next_entity_sequence = 0
+        self._side_units: dict[str, dict[EntityType, list[Entity]]] = {}
+        self._state_stores: dict[EntityType, UnitStateStore] | None = None
+        self.rebuild_entity_registry()
+
+    def rebuild_entity_registry(self) -> None:
+        self._entities = {}
+        self._weapon_target_counts = {}
+        self._entity_sequence = {}
+        self._next_entity_sequence = 0
+        self._side_units = {}
+        for collection in dict.fromkeys(ENTITY_COLLECTIONS.values()):
+            for entity in getattr(self, collection):
+                self._register_entity(entity)
+
+    def _register_entity(self, entity: Entity) -> EntityType:
+        entity_type = get_entity_type(entity)
+        self._entities[entity.id] = (entity_type, entity)
+        self._entity_sequence[entity.id] = self._next_entity_sequence
+        self._next_entity_sequence += 1
+        if entity_type in SIDE_PARTITIONED_ENTITY_TYPES:
+            self.get_side_units(entity.side_id, entity_type).append(entity)
+        if entity_type == EntityType.WEAPON:
+            self._weapon_target_counts[entity.target_id] = (
+                self._weapon_target_counts.get(entity.target_id, 0) + 1
+            )
+        return entity_type
+
+    def _unregister_entity(self, entity: Entity) -> None:
+        entry = self._entities.get(entity.id)
+        if entry is not None and entry[1] is entity:
+            del self._entities[entity.id]
+            del self._entity_sequence[entity.id]
+            if entry[0] in SIDE_PARTITIONED_ENTITY_TYPES:
+                self.get_side_units(entity.side_id, entry[0]).remove(entity)
+            if entry[0] == EntityType.WEAPON:
+                count = self._weapon_target_counts[entity.target_id] - 1
+                if count > 0:
+                    self._weapon_target_counts[entity.target_id] = count
+                else:
+                    del self._weapon_target_counts[entity.target_id]
+
+    def add_entity(self, entity: Entity) -> None:
+        entity_type = self._register_entity(entity)
+        getattr(self, ENTITY_COLLECTIONS[entity_type]).append(entity)
+        if self._state_stores is not None and entity_type in self._state_stores:
+            self._state_stores[entity_type].attach(entity)
+
+    def remove_entity(self, entity: Entity) -> None:
+        entity_type = get_entity_type(entity)
+        getattr(self, ENTITY_COLLECTIONS[entity_type]).remove(entity)
+        self._unregister_entity(entity)
+        profile_count("entity_removals")
+        if self._state_stores is not None and entity_type in self._state_stores:
+            self._state_stores[entity_type].detach(entity)
+
+    def enable_state_store(self) -> None:
+        if self._state_stores is not None:
+            return
+        self._state_stores = {}
+        for entity_type, entity_class in STATE_STORE_ENTITY_CLASSES.items():
+            units = getattr(self, ENTITY_COLLECTIONS[entity_type])
+            store = UnitStateStore(entity_class.STATE_FIELDS, capacity=len(units))
+            for unit in units:
+                store.attach(unit)
+            self._state_stores[entity_type] = store
+
+    def disable_state_store(self) -> None:
+        if self._state_stores is None:
+            return
+        for entity_type, store in self._state_stores.items():
+            for unit in getattr(self, ENTITY_COLLECTIONS[entity_type]):
+                store.detach(unit)
+        self._state_stores = None
+
+    def get_state_store(self, entity_type: EntityType) -> UnitStateStore | None:
+        if self._state_stores is None:
+            return None
+        return self._state_stores.get(entity_type)
+
+    def get_entity(
+        self, entity_id: str, entity_type: EntityType | None = None
+    ) -> Entity | None:
+        entry = self._entities.get(entity_id)
+        if entry is None or (entity_type is not None and entry[0] != entity_type):
+            return None
+        return entry[1]
 
     def get_default_doctrine(self) -> Doctrine:
         default_doctrine: Doctrine = {}
@@ -109,60 +281,57 @@ class Scenario:
         return side.color if side is not None else SIDE_COLOR.BLACK
 
     def get_aircraft(self, aircraft_id: str) -> Aircraft | None:
-        for aircraft in self.aircraft:
-            if aircraft.id == aircraft_id:
-                return aircraft
-        return None
+        return self.get_entity(aircraft_id, EntityType.AIRCRAFT)
 
     def get_facility(self, facility_id: str) -> Facility | None:
-        for facility in self.facilities:
-            if facility.id == facility_id:
-                return facility
-        return None
+        return self.get_entity(facility_id, EntityType.FACILITY)
 
     def get_airbase(self, airbase_id: str) -> Airbase | None:
-        for airbase in self.airbases:
-            if airbase.id == airbase_id:
-                return airbase
-        return None
+        return self.get_entity(airbase_id, EntityType.AIRBASE)
 
     def get_ship(self, ship_id: str) -> Ship | None:
-        for ship in self.ships:
-            if ship.id == ship_id:
-                return ship
-        return None
+        return self.get_entity(ship_id, EntityType.SHIP)
 
     def get_weapon(self, weapon_id: str) -> Weapon | None:
-        for weapon in self.weapons:
-            if weapon.id == weapon_id:
-                return weapon
-        return None
+        return self.get_entity(weapon_id, EntityType.WEAPON)
 
     def get_target(self, target_id: str) -> Target | None:
-        for target in (
-            self.aircraft + self.ships + self.facilities + self.airbases + self.weapons
-        ):
-            if target.id == target_id:
-                return target
-        return None
+        entry = self._entities.get(target_id)
+        if entry is None or entry[0] not in TARGET_ENTITY_TYPES:
+            return None
+        return entry[1]
+
+    def get_side_units(self, side_id: str, entity_type: EntityType) -> list[Entity]:
+        side_units = self._side_units.get(side_id)
+        if side_units is None:
+            side_units = {
+                partitioned_type: [] for partitioned_type in SIDE_PARTITIONED_ENTITY_TYPES
+            }
+            self._side_units[side_id] = side_units
+        return side_units[entity_type]
+
+    def get_units_by_side(self, entity_type: EntityType) -> dict[str, list[Entity]]:
+        for side in self.sides:
+            self.get_side_units(side.id, entity_type)
+        return {
+            side_id: side_units[entity_type]
+            for side_id, side_units in self._side_units.items()
+        }
+
+    def sort_entities(self, entities: list[Entity]) -> list[Entity]:
+        return sorted(entities, key=lambda entity: self._entity_sequence[entity.id])
+
+    def get_target_tracked_by_count(self, target_id: str) -> int:
+        return self._weapon_target_counts.get(target_id, 0)
 
     def get_reference_point(self, reference_point_id: str) -> ReferencePoint | None:
-        for reference_point in self.reference_points:
-            if reference_point.id == reference_point_id:
-                return reference_point
-        return None
+        return self.get_entity(reference_point_id, EntityType.REFERENCE_POINT)
 
     def get_patrol_mission(self, mission_id: str) -> PatrolMission | None:
-        for mission in self.missions:
-            if isinstance(mission, PatrolMission) and mission.id == mission_id:
-                return mission
-        return None
+        return self.get_entity(mission_id, EntityType.PATROL_MISSION)
 
     def get_strike_mission(self, mission_id: str) -> StrikeMission | None:
-        for mission in self.missions:
-            if isinstance(mission, StrikeMission) and mission.id == mission_id:
-                return mission
-        return None
+        return self.get_entity(mission_id, EntityType.STRIKE_MISSION)
 
     def get_all_patrol_missions(self) -> list[PatrolMission]:
         return [
@@ -256,34 +425,38 @@ class Scenario:
     def get_closest_base_to_aircraft(self, aircraft_id: str) -> HomeBase | None:
         aircraft = self.get_aircraft(aircraft_id)
         if aircraft is not None:
-            closest_base = None
-            closest_distance = float("inf")
-            for base in self.airbases + self.ships:
-                if base.side_id != aircraft.side_id:
-                    continue
-                distance = get_distance_between_two_points(
-                    aircraft.latitude, aircraft.longitude, base.latitude, base.longitude
-                )
-                if distance < closest_distance:
-                    closest_base = base
-                    closest_distance = distance
-            return closest_base
+            bases = [
+                base
+                for base in self.airbases + self.ships
+                if base.side_id == aircraft.side_id
+            ]
+            if len(bases) == 0:
+                return None
+            distances = get_distance_between_two_points_batch(
+                aircraft.latitude,
+                aircraft.longitude,
+                [base.latitude for base in bases],
+                [base.longitude for base in bases],
+            )
+            return bases[int(np.argmin(distances))]
         return None
 
     def get_all_targets_from_enemy_sides(self, side_id: str) -> Target:
+        hostile_side_ids = [
+            unit_side_id
+            for unit_side_id in self._side_units
+            if self.is_hostile(unit_side_id, side_id)
+        ]
         targets = []
-        for aircraft in self.aircraft:
-            if self.is_hostile(aircraft.side_id, side_id):
-                targets.append(aircraft)
-        for facility in self.facilities:
-            if self.is_hostile(facility.side_id, side_id):
-                targets.append(facility)
-        for ship in self.ships:
-            if self.is_hostile(ship.side_id, side_id):
-                targets.append(ship)
-        for airbase in self.airbases:
-            if self.is_hostile(airbase.side_id, side_id):
-                targets.append(airbase)
+        for entity_type in ENEMY_TARGET_ENTITY_TYPES:
+            units = [
+                unit
+                for hostile_side_id in hostile_side_ids
+                for unit in self.get_side_units(hostile_side_id, entity_type)
+            ]
+            targets.extend(
+                self.sort_entities(units) if len(hostile_side_ids) > 1 else units
+            )
         return targets
 
     def is_hostile(self, side_id: str, target_id: str) -> bool:
@@ -300,7 +473,9 @@ class Scenario:
             else:
                 return obj
 
-        return serialize(self.__dict__)
+        return serialize(
+            {key: value for key, value in self.__dict__.items() if key[0] != "_"}
+        )
 
     def toJson(self):
         return json.dumps(self.to_dict(), sort_keys=True, indent=4)
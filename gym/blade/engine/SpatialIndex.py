@@ -0,0 +1,47 @@
+import numpy as np
+
+from blade.units.Aircraft import Aircraft
+from blade.units.Weapon import Weapon
+
+IndexedUnit = Aircraft | Weapon
+
+
+# latitude-sorted index over unit positions for radius queries in degree space
+# units appended to the indexed list after the index is built (e.g. weapons launched
+# during an engagement pass) are not indexed but are always returned as candidates
+class SpatialIndex:
+
+    def __init__(self, units: list[IndexedUnit]):
+        self.units = units
+        self.indexed_count = len(units)
+        self.latitudes = np.fromiter(
+            (unit.latitude for unit in units), dtype=np.float64, count=len(units)
+        )
+        self.longitudes = np.fromiter(
+            (unit.longitude for unit in units), dtype=np.float64, count=len(units)
+        )
+        self.order = np.argsort(self.latitudes, kind="stable")
+        self.sorted_latitudes = self.latitudes[self.order]
+
+    def query_radius(
+        self, latitude: float, longitude: float, radius: float
+    ) -> list[IndexedUnit]:
+        unindexed_units = self.units[self.indexed_count :]
+        if not radius > 0 or self.indexed_count == 0:
+            return list(unindexed_units)
+
+        # pad the radius slightly so points on the boundary are never dropped
+        radius = radius * (1 + 1e-9)
+        lower = np.searchsorted(self.sorted_latitudes, latitude - radius, side="left")
+        upper = np.searchsorted(self.sorted_latitudes, latitude + radius, side="right")
+        candidates = self.order[lower:upper]
+        latitude_offsets = self.latitudes[candidates] - latitude
+        longitude_offsets = self.longitudes[candidates] - longitude
+        candidates = np.sort(
+            candidates[
+                latitude_offsets * latitude_offsets
+                + longitude_offsets * longitude_offsets
+                <= radius * radius
+            ]
+        )
+        return [self.units[index] for index in candidates.tolist()] + unindexed_units
@@ -0,0 +1,255 @@
+import math
+import numpy as np
+
+from blade.Scenario import Scenario, EntityType
+from blade.Doctrine import DoctrineType
+from blade.units.Aircraft import Aircraft
+from blade.engine.kinematics import (
+    SECONDS_PER_HOUR,
+    WAYPOINT_ARRIVAL_DISTANCE_KM,
+    get_route_legs,
+)
+from blade.utils.constants import EARTH_RADIUS_KM, NAUTICAL_MILES_TO_METERS
+from blade.utils.utils import get_distance_between_two_points, get_distance_matrix
+
+DEGREES_PER_KM = 180 / (math.pi * EARTH_RADIUS_KM)
+LANDING_DISTANCE_KM = 0.5
+RTB_FUEL_MARGIN = 1.1
+MAX_LATITUDE = 89.0
+
+# the doctrine that lets each kind of shooter fire at hostile aircraft
+ATTACK_DOCTRINES = {
+    "facilities": DoctrineType.SAM_ATTACK_HOSTILE,
+    "ships": DoctrineType.SHIP_ATTACK_HOSTILE,
+    "aircraft": DoctrineType.AIRCRAFT_ATTACK_HOSTILE,
+}
+
+
+def get_ticks_until_closing(
+    distances: np.ndarray, thresholds: np.ndarray, closing_speeds: np.ndarray
+) -> np.ndarray:
+    # ticks that surely pass before a distance shrinking by at most closing_speeds
+    # per tick drops below its threshold
+    margins = distances - thresholds
+    return np.where(
+        closing_speeds > 0,
+        np.floor(margins / np.where(closing_speeds > 0, closing_speeds, 1)),
+        np.where(margins >= 0, np.inf, 0),
+    )
+
+
+def has_per_tick_events(scenario: Scenario) -> bool:
+    # weapons in flight, strike missions and chasing aircraft change the scenario
+    # on every tick, and patrolling aircraft do when they need a new waypoint
+    if len(scenario.weapons) > 0 or len(scenario.get_all_strike_missions()) > 0:
+        return True
+    for aircraft in scenario.aircraft:
+        if aircraft.target_id and scenario.check_side_doctrine(
+            aircraft.side_id, DoctrineType.AIRCRAFT_CHASE_HOSTILE
+        ):
+            return True
+    for mission in scenario.get_all_patrol_missions():
+        if not mission.active or len(mission.assigned_area) < 3:
+            continue
+        for unit_id in mission.assigned_unit_ids:
+            unit = scenario.get_aircraft(unit_id)
+            if unit is not None and (
+                len(unit.route) == 0
+                or not mission.check_if_coordinates_is_within_patrol_area(
+                    [unit.route[0][1], unit.route[0][0]]
+                )
+            ):
+                return True
+    return False
+
+
+def get_fuel_ticks(units: list) -> float:
+    # ticks of fuel burn every unit surely survives, one short of the exact count
+    # to absorb rounding
+    if len(units) == 0:
+        return np.inf
+    current_fuel = np.array([unit.current_fuel for unit in units])
+    burn_rates = np.array([unit.fuel_rate for unit in units]) / SECONDS_PER_HOUR
+    return np.min(
+        np.where(
+            burn_rates > 0,
+            np.floor(current_fuel / np.where(burn_rates > 0, burn_rates, 1)) - 1,
+            np.inf,
+        )
+    )
+
+
+def get_base_ticks(
+    scenario: Scenario, aircraft: Aircraft, unit_legs: dict[str, float]
+) -> float:
+    # ticks before a returning aircraft lands, or before one that may return to
+    # base on its own runs short of the fuel to get there
+    watch_fuel = (
+        not aircraft.rtb
+        and aircraft.speed > 0
+        and scenario.check_side_doctrine(
+            aircraft.side_id, DoctrineType.AIRCRAFT_RTB_WHEN_OUT_OF_RANGE
+        )
+    )
+    if not (aircraft.rtb or watch_fuel):
+        return np.inf
+    if aircraft.home_base_id != "":
+        home_base = scenario.get_aircraft_homebase(aircraft.id)
+        base_leg = unit_legs.get(home_base.id, 0) if home_base is not None else 0
+    else:
+        home_base = scenario.get_closest_base_to_aircraft(aircraft.id)
+        # the closest base may change on the way, so any ship could be it
+        base_leg = max(
+            (unit_legs.get(ship.id, 0) for ship in scenario.ships), default=0
+        )
+    if home_base is None:
+        return np.inf
+    distance_km = get_distance_between_two_points(
+        aircraft.latitude, aircraft.longitude, home_base.latitude, home_base.longitude
+    )
+    closing_km = unit_legs.get(aircraft.id, 0) + base_leg
+    if aircraft.rtb:
+        return get_ticks_until_closing(
+            np.array([distance_km]),
+            np.array([LANDING_DISTANCE_KM]),
+            np.array([closing_km]),
+        )[0]
+
+    # fuel after k ticks must stay above the margin times the fuel needed to fly
+    # back, with the distance to the base growing by at most closing_km per tick
+    fuel_per_nm = RTB_FUEL_MARGIN * aircraft.fuel_rate / aircraft.speed
+    km_to_nm = 1000 / NAUTICAL_MILES_TO_METERS
+    spare_fuel = aircraft.current_fuel - fuel_per_nm * distance_km * km_to_nm
+    fuel_per_tick = (
+        aircraft.fuel_rate / SECONDS_PER_HOUR + fuel_per_nm * closing_km * km_to_nm
+    )
+    if spare_fuel < 0:
+        return 0
+    return math.floor(spare_fuel / fuel_per_tick) if fuel_per_tick > 0 else np.inf
+
+
+def get_engagement_ticks(
+    scenario: Scenario, unit_legs: dict[str, float], max_ticks: int
+) -> float:
+    # ticks before a hostile aircraft could come within both the detection range
+    # and the weapon range of a shooter. Shooters only ever fire the weapon with
+    # the highest engagement range, so they are harmless once it runs out.
+    shooters = []
+    shooter_weapons = []
+    for entity_name, doctrine_type in ATTACK_DOCTRINES.items():
+        for shooter in getattr(scenario, entity_name):
+            weapon = shooter.get_weapon_with_highest_engagement_range()
+            if (
+                weapon is not None
+                and weapon.current_quantity > 0
+                and scenario.check_side_doctrine(shooter.side_id, doctrine_type)
+            ):
+                shooters.append(shooter)
+                shooter_weapons.append(weapon)
+    targets = scenario.aircraft
+    if len(shooters) == 0 or len(targets) == 0:
+        return np.inf
+    target_sides = [target.side_id for target in targets]
+    side_masks = {
+        side_id: np.asarray(
+            scenario.relationships.get_hostility_mask(side_id, target_sides),
+            dtype=bool,
+        )
+        for side_id in {shooter.side_id for shooter in shooters}
+    }
+    hostility = np.array([side_masks[shooter.side_id] for shooter in shooters])
+    if not hostility.any():
+        return np.inf
+
+    shooter_latitudes = np.array([shooter.latitude for shooter in shooters])
+    shooter_longitudes = np.array([shooter.longitude for shooter in shooters])
+    target_latitudes = np.array([target.latitude for target in targets])
+    target_longitudes = np.array([target.longitude for target in targets])
+    shooter_legs = np.array([unit_legs.get(shooter.id, 0) for shooter in shooters])
+    target_legs = np.array([unit_legs.get(target.id, 0) for target in targets])
+    closing_km = shooter_legs[:, np.newaxis] + target_legs[np.newaxis, :]
+
+    weapon_ranges_km = np.array(
+        [
+            weapon.get_engagement_range() * NAUTICAL_MILES_TO_METERS / 1000
+            for weapon in shooter_weapons
+        ]
+    )
+    weapon_ticks = get_ticks_until_closing(
+        get_distance_matrix(
+            shooter_latitudes, shooter_longitudes, target_latitudes, target_longitudes
+        ),
+        weapon_ranges_km[:, np.newaxis],
+        closing_km,
+    )
+
+    # detection works on raw degrees, where a km of longitude grows with latitude,
+    # so bound it by the highest latitude any unit can reach within max_ticks
+    max_latitude = min(
+        max(np.max(np.abs(shooter_latitudes)), np.max(np.abs(target_latitudes)))
+        + max_ticks * max(unit_legs.values(), default=0) * DEGREES_PER_KM,
+        MAX_LATITUDE,
+    )
+    degrees_per_km = DEGREES_PER_KM * math.sqrt(
+        1 + 1 / math.cos(math.radians(max_latitude)) ** 2
+    )
+    detection_ticks = get_ticks_until_closing(
+        np.hypot(
+            shooter_latitudes[:, np.newaxis] - target_latitudes[np.newaxis, :],
+            shooter_longitudes[:, np.newaxis] - target_longitudes[np.newaxis, :],
+        ),
+        np.array([shooter.get_detection_range() / 60 for shooter in shooters])[
+            :, np.newaxis
+        ],
+        closing_km * degrees_per_km,
+    )
+
+    return np.min(
+        np.where(hostility, np.maximum(weapon_ticks, detection_ticks), np.inf)
+    )
+
+
+def get_event_horizon(scenario: Scenario, max_ticks: int) -> int:
+    # number of ticks, up to max_ticks, during which the scenario surely does
+    # nothing but move units along their routes and burn fuel. Every bound is
+    # conservative, so the horizon may end a few ticks before the actual event.
+    if max_ticks <= 0 or has_per_tick_events(scenario):
+        return 0
+    horizon = max_ticks
+
+    unit_legs = {}
+    for units, entity_type in (
+        (scenario.aircraft, EntityType.AIRCRAFT),
+        (scenario.ships, EntityType.SHIP),
+    ):
+        moving_units, distances, legs = get_route_legs(
+            units, scenario.get_state_store(entity_type)
+        )
+        if len(moving_units) == 0:
+            continue
+        horizon = min(
+            horizon,
+            np.min(
+                get_ticks_until_closing(
+                    distances,
+                    np.full(len(moving_units), WAYPOINT_ARRIVAL_DISTANCE_KM),
+                    legs,
+                )
+            ),
+        )
+        unit_legs.update(
+            (unit.id, leg) for unit, leg in zip(moving_units, legs.tolist())
+        )
+
+    horizon = min(
+        horizon,
+        get_fuel_ticks(scenario.aircraft),
+        get_fuel_ticks([ship for ship in scenario.ships if len(ship.route) > 0]),
+    )
+    for aircraft in scenario.aircraft:
+        if horizon <= 0:
+            break
+        horizon = min(horizon, get_base_ticks(scenario, aircraft, unit_legs))
+    if horizon > 0:
+        horizon = min(horizon, get_engagement_ticks(scenario, unit_legs, horizon))
+    return max(int(horizon), 0)
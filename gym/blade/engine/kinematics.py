@@ -0,0 +1,228 @@
+import numpy as np
+from itertools import compress
+
+from blade.units.Aircraft import Aircraft
+from blade.units.Ship import Ship
+from blade.units.Weapon import Weapon
+from blade.utils.UnitStateStore import UnitStateStore
+from blade.utils.utils import (
+    get_bearing_between_two_points_batch,
+    get_distance_between_two_points_batch,
+    get_leg_distances_batch,
+    get_next_coordinates_batch,
+    get_terminal_coordinates_from_distance_and_bearing_batch,
+)
+
+WAYPOINT_ARRIVAL_DISTANCE_KM = 0.5
+SECONDS_PER_HOUR = 3600
+
+MovingUnit = Aircraft | Ship | Weapon
+UnitGroup = tuple[list[MovingUnit], UnitStateStore | None]
+
+
+def gather_unit_field(
+    units: list[MovingUnit],
+    field: str,
+    state_store: UnitStateStore | None = None,
+    slots: np.ndarray | None = None,
+) -> np.ndarray:
+    if state_store is not None:
+        return state_store.columns[field][slots]
+    return np.fromiter(
+        (getattr(unit, field) for unit in units), dtype=np.float64, count=len(units)
+    )
+
+
+def scatter_unit_field(
+    units: list[MovingUnit],
+    field: str,
+    values: np.ndarray,
+    state_store: UnitStateStore | None = None,
+    slots: np.ndarray | None = None,
+) -> None:
+    if state_store is not None:
+        state_store.columns[field][slots] = values
+        return
+    for unit, value in zip(units, values.tolist()):
+        setattr(unit, field, value)
+
+
+def gather_group_field(
+    groups: list[UnitGroup], field: str, group_slots: list[np.ndarray | None]
+) -> np.ndarray:
+    return np.concatenate(
+        [
+            gather_unit_field(units, field, state_store, slots)
+            for (units, state_store), slots in zip(groups, group_slots)
+        ]
+    )
+
+
+def scatter_group_field(
+    groups: list[UnitGroup],
+    field: str,
+    values: np.ndarray,
+    group_slots: list[np.ndarray | None],
+) -> None:
+    start = 0
+    for (units, state_store), slots in zip(groups, group_slots):
+        scatter_unit_field(
+            units, field, values[start : start + len(units)], state_store, slots
+        )
+        start += len(units)
+
+
+def get_group_slots(groups: list[UnitGroup]) -> list[np.ndarray | None]:
+    return [
+        state_store.get_slots(units) if state_store is not None else None
+        for units, state_store in groups
+    ]
+
+
+def move_units_along_routes(
+    units: list[MovingUnit], state_store: UnitStateStore | None = None
+) -> list[MovingUnit]:
+    return move_unit_groups_along_routes([(units, state_store)])[0]
+
+
+def move_unit_groups_along_routes(groups: list[UnitGroup]) -> list[list[MovingUnit]]:
+    # units of several scenarios, each with its own state store, are moved with one
+    # set of array operations; the result lists each group's units that moved
+    moving_groups = [
+        ([unit for unit in units if len(unit.route) > 0], state_store)
+        for units, state_store in groups
+    ]
+    moving_units = [unit for units, _ in moving_groups for unit in units]
+    if len(moving_units) == 0:
+        return [units for units, _ in moving_groups]
+    group_slots = get_group_slots(moving_groups)
+
+    latitudes = gather_group_field(moving_groups, "latitude", group_slots)
+    longitudes = gather_group_field(moving_groups, "longitude", group_slots)
+    speeds = gather_group_field(moving_groups, "speed", group_slots)
+    headings = gather_group_field(moving_groups, "heading", group_slots)
+    waypoint_latitudes = np.fromiter(
+        (unit.route[0][0] for unit in moving_units),
+        dtype=np.float64,
+        count=len(moving_units),
+    )
+    waypoint_longitudes = np.fromiter(
+        (unit.route[0][1] for unit in moving_units),
+        dtype=np.float64,
+        count=len(moving_units),
+    )
+
+    arrived = (
+        get_distance_between_two_points_batch(
+            latitudes, longitudes, waypoint_latitudes, waypoint_longitudes
+        )
+        < WAYPOINT_ARRIVAL_DISTANCE_KM
+    )
+    next_latitudes, next_longitudes = get_next_coordinates_batch(
+        latitudes, longitudes, waypoint_latitudes, waypoint_longitudes, speeds
+    )
+    next_headings = get_bearing_between_two_points_batch(
+        next_latitudes, next_longitudes, waypoint_latitudes, waypoint_longitudes
+    )
+
+    scatter_group_field(
+        moving_groups,
+        "latitude",
+        np.where(arrived, waypoint_latitudes, next_latitudes),
+        group_slots,
+    )
+    scatter_group_field(
+        moving_groups,
+        "longitude",
+        np.where(arrived, waypoint_longitudes, next_longitudes),
+        group_slots,
+    )
+    scatter_group_field(
+        moving_groups,
+        "heading",
+        np.where(arrived, headings, next_headings),
+        group_slots,
+    )
+    for unit in compress(moving_units, arrived.tolist()):
+        unit.route.pop(0)
+
+    return [units for units, _ in moving_groups]
+
+
+def get_route_legs(
+    units: list[MovingUnit], state_store: UnitStateStore | None = None
+) -> tuple[list[MovingUnit], np.ndarray, np.ndarray]:
+    # the units with a route, their distance in km to the next waypoint and the
+    # distance they cover each tick on the way there
+    moving_units = [unit for unit in units if len(unit.route) > 0]
+    if len(moving_units) == 0:
+        return moving_units, np.zeros(0), np.zeros(0)
+    slots = state_store.get_slots(moving_units) if state_store is not None else None
+    distances = get_distance_between_two_points_batch(
+        gather_unit_field(moving_units, "latitude", state_store, slots),
+        gather_unit_field(moving_units, "longitude", state_store, slots),
+        [unit.route[0][0] for unit in moving_units],
+        [unit.route[0][1] for unit in moving_units],
+    )
+    speeds = gather_unit_field(moving_units, "speed", state_store, slots)
+    return moving_units, distances, get_leg_distances_batch(distances, speeds)
+
+
+def jump_units_along_routes(
+    units: list[MovingUnit], state_store: UnitStateStore | None = None, ticks: int = 1
+) -> list[MovingUnit]:
+    # moves units as far along their routes as the given number of ticks would, in
+    # one step. Only valid while none of them reaches its next waypoint.
+    moving_units = [unit for unit in units if len(unit.route) > 0]
+    if len(moving_units) == 0:
+        return moving_units
+    slots = state_store.get_slots(moving_units) if state_store is not None else None
+
+    latitudes = gather_unit_field(moving_units, "latitude", state_store, slots)
+    longitudes = gather_unit_field(moving_units, "longitude", state_store, slots)
+    speeds = gather_unit_field(moving_units, "speed", state_store, slots)
+    waypoint_latitudes = np.array([unit.route[0][0] for unit in moving_units])
+    waypoint_longitudes = np.array([unit.route[0][1] for unit in moving_units])
+
+    distances = get_distance_between_two_points_batch(
+        latitudes, longitudes, waypoint_latitudes, waypoint_longitudes
+    )
+    jump_distances = np.minimum(
+        get_leg_distances_batch(distances, speeds) * ticks, distances
+    )
+    next_latitudes, next_longitudes = (
+        get_terminal_coordinates_from_distance_and_bearing_batch(
+            latitudes,
+            longitudes,
+            jump_distances,
+            get_bearing_between_two_points_batch(
+                latitudes, longitudes, waypoint_latitudes, waypoint_longitudes
+            ),
+        )
+    )
+    next_headings = get_bearing_between_two_points_batch(
+        next_latitudes, next_longitudes, waypoint_latitudes, waypoint_longitudes
+    )
+
+    scatter_unit_field(moving_units, "latitude", next_latitudes, state_store, slots)
+    scatter_unit_field(moving_units, "longitude", next_longitudes, state_store, slots)
+    scatter_unit_field(moving_units, "heading", next_headings, state_store, slots)
+    return moving_units
+
+
+def burn_fuel(
+    units: list[MovingUnit], state_store: UnitStateStore | None = None, ticks: int = 1
+) -> np.ndarray:
+    return burn_fuel_groups([(units, state_store)], ticks)[0]
+
+
+def burn_fuel_groups(groups: list[UnitGroup], ticks: int = 1) -> list[np.ndarray]:
+    sizes = [len(units) for units, _ in groups]
+    if sum(sizes) == 0:
+        return [np.zeros(0, dtype=np.float64) for _ in groups]
+    group_slots = get_group_slots(groups)
+    current_fuel = gather_group_field(groups, "current_fuel", group_slots)
+    fuel_rates = gather_group_field(groups, "fuel_rate", group_slots)
+    current_fuel -= ticks * fuel_rates / SECONDS_PER_HOUR
+    scatter_group_field(groups, "current_fuel", current_fuel, group_slots)
+    return np.split(current_fuel, np.cumsum(sizes)[:-1])
@@ -3,18 +3,32 @@ from blade.units.Ship import Ship
 from blade.units.Facility import Facility
 from blade.units.Airbase import Airbase
 from blade.units.Weapon import Weapon
-from blade.Scenario import Scenario
+from blade.Scenario import Scenario, EntityType
+from blade.engine.kinematics import (
+    SECONDS_PER_HOUR,
+    gather_unit_field,
+    scatter_unit_field,
+)
+from blade.engine.SpatialIndex import SpatialIndex
+import shapely
+from random import Random
+from typing import Optional
+from itertools import compress
 from shapely.geometry import Point
-from uuid import uuid4
 
 from blade.utils.constants import NAUTICAL_MILES_TO_METERS
+from blade.utils.Profiler import profile_count
 from blade.utils.utils import (
     get_bearing_between_two_points,
+    get_bearing_between_two_points_batch,
     get_distance_between_two_points,
+    get_distance_between_two_points_batch,
+    get_next_coordinates_batch,
     get_next_coordinates,
     get_terminal_coordinates_from_distance_and_bearing,
     random_float,
     random_int,
+    random_uuid,
 )
 
 Target = Aircraft | Facility | Weapon | Airbase | Ship
@@ -31,6 +45,57 @@ def is_threat_detected(
     return detector_geometry.contains(threat_geometry)
 
 
+def get_detected_threats(
+    current_scenario: Scenario,
+    threat_indices: dict[str, SpatialIndex],
+    detector: Facility | Ship | Aircraft,
+) -> list[Aircraft | Weapon]:
+    detection_range_degrees = (
+        detector.get_detection_range() / 60
+    )  # rough conversion from nautical miles to degrees
+    hostile_threat_indices = [
+        threat_index
+        for side_id, threat_index in threat_indices.items()
+        if current_scenario.is_hostile(detector.side_id, side_id)
+    ]
+    candidates = []
+    for threat_index in hostile_threat_indices:
+        candidates.extend(
+            threat_index.query_radius(
+                detector.latitude, detector.longitude, detection_range_degrees
+            )
+        )
+    profile_count(
+        "pair_checks",
+        sum(len(threat_index.units) for threat_index in hostile_threat_indices),
+    )
+    profile_count("detection_tests", len(candidates))
+    if len(candidates) == 0:
+        return []
+    if len(hostile_threat_indices) > 1:
+        candidates = current_scenario.sort_entities(candidates)
+    detector_geometry = Point([detector.latitude, detector.longitude]).buffer(
+        detection_range_degrees
+    )
+    detected = shapely.contains_xy(
+        detector_geometry,
+        [threat.latitude for threat in candidates],
+        [threat.longitude for threat in candidates],
+    )
+    return [
+        threat for threat, is_detected in zip(candidates, detected) if is_detected
+    ]
+
+
+def get_threat_indices(
+    current_scenario: Scenario, entity_type: EntityType
+) -> dict[str, SpatialIndex]:
+    return {
+        side_id: SpatialIndex(units)
+        for side_id, units in current_scenario.get_units_by_side(entity_type).items()
+    }
+
+
 def weapon_can_engage_target(target: Target, weapon: Weapon) -> bool:
     weapon_engagement_range_nm = weapon.get_engagement_range()
 
@@ -44,26 +109,18 @@ def weapon_can_engage_target(target: Target, weapon: Weapon) -> bool:
 
 
 def check_target_tracked_by_count(current_scenario: Scenario, target: Target) -> int:
-    count = 0
-    for weapon in current_scenario.weapons:
-        if weapon.target_id == target.id:
-            count += 1
-    return count
-
-
-def weapon_endgame(current_scenario: Scenario, weapon: Weapon, target: Target) -> bool:
-    current_scenario.weapons.remove(weapon)
-    if random_float(0, 1) <= weapon.lethality:
-        if isinstance(target, Aircraft):
-            current_scenario.aircraft.remove(target)
-        elif isinstance(target, Ship):
-            current_scenario.ships.remove(target)
-        elif isinstance(target, Facility):
-            current_scenario.facilities.remove(target)
-        elif isinstance(target, Airbase):
-            current_scenario.airbases.remove(target)
-        elif isinstance(target, Weapon):
-            current_scenario.weapons.remove(target)
+    return current_scenario.get_target_tracked_by_count(target.id)
+
+
+def weapon_endgame(
+    current_scenario: Scenario,
+    weapon: Weapon,
+    target: Target,
+    rng: Optional[Random] = None,
+) -> bool:
+    current_scenario.remove_entity(weapon)
+    if random_float(0, 1, rng) <= weapon.lethality:
+        current_scenario.remove_entity(target)
         return True
     return False
 
@@ -74,6 +131,7 @@ def launch_weapon(
     target: Target,
     launched_weapon: Weapon,
     launched_weapon_quantity: int,
+    rng: Optional[Random] = None,
 ) -> None:
     if (
         len(origin.weapons) == 0
@@ -92,8 +150,8 @@ def launch_weapon(
         next_weapon_latitude = next_weapon_coordinates[0]
         next_weapon_longitude = next_weapon_coordinates[1]
         new_weapon = Weapon(
-            id=str(uuid4()),
-            name=f"{launched_weapon.name} #{random_int(0, 1000)}",
+            id=random_uuid(rng),
+            name=f"{launched_weapon.name} #{random_int(0, 1000, rng)}",
             side_id=origin.side_id,
             class_name=launched_weapon.class_name,
             latitude=next_weapon_latitude,
@@ -117,17 +175,30 @@ def launch_weapon(
             current_quantity=1,
             max_quantity=1,
         )
-        current_scenario.weapons.append(new_weapon)
+        current_scenario.add_entity(new_weapon)
+        profile_count("weapon_launches")
     launched_weapon.current_quantity -= launched_weapon_quantity
     if launched_weapon.current_quantity < 1:
         origin.weapons.remove(launched_weapon)
 
 
-def weapon_engagement(current_scenario: Scenario, weapon: Weapon) -> None:
+def weapon_engagement(
+    current_scenario: Scenario,
+    weapon: Weapon,
+    rng: Optional[Random] = None,
+    target_coordinates: Optional[tuple[float, float]] = None,
+) -> None:
     target = current_scenario.get_target(weapon.target_id)
     if target is None:
-        current_scenario.weapons.remove(weapon)
+        current_scenario.remove_entity(weapon)
     else:
+        # target_coordinates lets a caller that has already moved the target
+        # this tick aim at where the target was before it moved
+        target_latitude, target_longitude = (
+            target_coordinates
+            if target_coordinates is not None
+            else (target.latitude, target.longitude)
+        )
         weapon_route = weapon.route
         if len(weapon_route) > 0:
             # there is a weird bug where a weapon will be teleported a vast distance if it gets too close to the target but weaponEndgame is not called, current solution is to set threshold to 1 km
@@ -135,18 +206,18 @@ def weapon_engagement(current_scenario: Scenario, weapon: Weapon) -> None:
                 get_distance_between_two_points(
                     weapon.latitude,
                     weapon.longitude,
-                    target.latitude,
-                    target.longitude,
+                    target_latitude,
+                    target_longitude,
                 )
                 < 1
             ):
-                weapon_endgame(current_scenario, weapon, target)
+                weapon_endgame(current_scenario, weapon, target, rng)
             else:
                 next_weapon_coordinates = get_next_coordinates(
                     weapon.latitude,
                     weapon.longitude,
-                    target.latitude,
-                    target.longitude,
+                    target_latitude,
+                    target_longitude,
                     weapon.speed,
                 )
                 next_weapon_latitude = next_weapon_coordinates[0]
@@ -154,14 +225,135 @@ def weapon_engagement(current_scenario: Scenario, weapon: Weapon) -> None:
                 weapon.heading = get_bearing_between_two_points(
                     next_weapon_latitude,
                     next_weapon_longitude,
-                    target.latitude,
-                    target.longitude,
+                    target_latitude,
+                    target_longitude,
                 )
                 weapon.latitude = next_weapon_latitude
                 weapon.longitude = next_weapon_longitude
                 weapon.current_fuel -= weapon.fuel_rate / 3600
                 if weapon.current_fuel <= 0:
-                    current_scenario.weapons.remove(weapon)
+                    current_scenario.remove_entity(weapon)
+
+
+def weapon_engagement_batch(
+    current_scenario: Scenario, rng: Optional[Random] = None
+) -> None:
+    # weapons chasing aircraft, ships or facilities are moved together since their
+    # targets stay put during this phase; weapons chasing other weapons are then
+    # stepped in list order so each sees its target where the per-weapon loop
+    # would have left it
+    weapons = list(current_scenario.weapons)
+    batched_weapons = []
+    batched_targets = []
+    chased_weapon_ids = set()
+    for weapon in weapons:
+        target = current_scenario.get_target(weapon.target_id)
+        if target is None or len(weapon.route) == 0:
+            continue
+        if isinstance(target, Weapon):
+            chased_weapon_ids.add(target.id)
+        else:
+            batched_weapons.append(weapon)
+            batched_targets.append(target)
+
+    endgame_weapon_ids = set()
+    empty_weapon_ids = set()
+    start_coordinates = {}
+    if len(batched_weapons) > 0:
+        state_store = current_scenario.get_state_store(EntityType.WEAPON)
+        slots = (
+            state_store.get_slots(batched_weapons) if state_store is not None else None
+        )
+        latitudes = gather_unit_field(batched_weapons, "latitude", state_store, slots)
+        longitudes = gather_unit_field(batched_weapons, "longitude", state_store, slots)
+        target_latitudes = gather_unit_field(batched_targets, "latitude")
+        target_longitudes = gather_unit_field(batched_targets, "longitude")
+
+        # there is a weird bug where a weapon will be teleported a vast distance if it gets too close to the target but weaponEndgame is not called, current solution is to set threshold to 1 km
+        in_endgame = (
+            get_distance_between_two_points_batch(
+                latitudes, longitudes, target_latitudes, target_longitudes
+            )
+            < 1
+        )
+        in_flight = ~in_endgame
+        in_flight_list = in_flight.tolist()
+        endgame_weapon_ids.update(
+            weapon.id for weapon in compress(batched_weapons, in_endgame.tolist())
+        )
+        flying_weapons = list(compress(batched_weapons, in_flight_list))
+        if len(flying_weapons) > 0:
+            for weapon, latitude, longitude in zip(
+                flying_weapons,
+                latitudes[in_flight].tolist(),
+                longitudes[in_flight].tolist(),
+            ):
+                if weapon.id in chased_weapon_ids:
+                    start_coordinates[weapon.id] = (latitude, longitude)
+            flying_slots = slots[in_flight] if slots is not None else None
+            next_latitudes, next_longitudes = get_next_coordinates_batch(
+                latitudes[in_flight],
+                longitudes[in_flight],
+                target_latitudes[in_flight],
+                target_longitudes[in_flight],
+                gather_unit_field(flying_weapons, "speed", state_store, flying_slots),
+            )
+            headings = get_bearing_between_two_points_batch(
+                next_latitudes,
+                next_longitudes,
+                target_latitudes[in_flight],
+                target_longitudes[in_flight],
+            )
+            current_fuel = gather_unit_field(
+                flying_weapons, "current_fuel", state_store, flying_slots
+            ) - (
+                gather_unit_field(
+                    flying_weapons, "fuel_rate", state_store, flying_slots
+                )
+                / SECONDS_PER_HOUR
+            )
+            scatter_unit_field(
+                flying_weapons, "heading", headings, state_store, flying_slots
+            )
+            scatter_unit_field(
+                flying_weapons, "latitude", next_latitudes, state_store, flying_slots
+            )
+            scatter_unit_field(
+                flying_weapons, "longitude", next_longitudes, state_store, flying_slots
+            )
+            scatter_unit_field(
+                flying_weapons, "current_fuel", current_fuel, state_store, flying_slots
+            )
+            empty_weapon_ids.update(
+                weapon.id
+                for weapon in compress(flying_weapons, (current_fuel <= 0).tolist())
+            )
+
+    # endgames, removals and weapon-on-weapon moves happen in list order, as
+    # they consume the random stream and can destroy weapons further down the list
+    batched_target_by_id = {
+        weapon.id: target for weapon, target in zip(batched_weapons, batched_targets)
+    }
+    resolved_weapon_ids = set()
+    for weapon in weapons:
+        if current_scenario.get_weapon(weapon.id) is not weapon:
+            continue  # destroyed by an earlier endgame this tick
+        target = batched_target_by_id.get(weapon.id)
+        if target is None:
+            target_coordinates = (
+                None
+                if weapon.target_id in resolved_weapon_ids
+                else start_coordinates.get(weapon.target_id)
+            )
+            weapon_engagement(current_scenario, weapon, rng, target_coordinates)
+            continue
+        resolved_weapon_ids.add(weapon.id)
+        if current_scenario.get_target(target.id) is not target:
+            current_scenario.remove_entity(weapon)
+        elif weapon.id in endgame_weapon_ids:
+            weapon_endgame(current_scenario, weapon, target, rng)
+        elif weapon.id in empty_weapon_ids:
+            current_scenario.remove_entity(weapon)
 
 
 def aircraft_pursuit(
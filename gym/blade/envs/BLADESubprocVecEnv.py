@@ -0,0 +1,221 @@
+import os
+import random
+import numpy as np
+import multiprocessing
+from copy import deepcopy
+from multiprocessing.connection import Connection
+from typing import Optional
+from gymnasium.spaces import Text
+from gymnasium.vector import VectorEnv
+from gymnasium.vector.utils import (
+    concatenate,
+    create_shared_memory,
+    iterate,
+    read_from_shared_memory,
+)
+
+from blade.Game import Game
+from blade.envs.blade import BLADE
+from blade.envs.BLADEVectorEnv import BLADEVectorEnv, get_env_seeds
+
+
+def slice_observations(observations, start: int, stop: int):
+    if isinstance(observations, dict):
+        return {
+            key: slice_observations(value, start, stop)
+            for key, value in observations.items()
+        }
+    elif isinstance(observations, tuple):
+        return tuple(slice_observations(value, start, stop) for value in observations)
+    return observations[start:stop]
+
+
+def _worker(
+    connection: Connection,
+    parent_connection: Connection,
+    template_game: Game,
+    num_envs: int,
+    start: int,
+    stop: int,
+    max_episode_steps: Optional[int],
+    env_kwargs: dict,
+    shared_buffers: tuple,
+) -> None:
+    parent_connection.close()
+    # forked workers would otherwise all draw the same random numbers in games that
+    # were never reset with a seed. Seeded games have generators of their own.
+    random.seed()
+    shared_observations, shared_rewards, shared_terminations, shared_truncations = (
+        shared_buffers
+    )
+    vector_env = BLADEVectorEnv(
+        [template_game.clone() for _ in range(stop - start)],
+        max_episode_steps=max_episode_steps,
+        copy=False,
+        **env_kwargs,
+    )
+    observation_space = vector_env.single_observation_space
+    observations = slice_observations(
+        read_from_shared_memory(observation_space, shared_observations, n=num_envs),
+        start,
+        stop,
+    )
+    rewards = np.frombuffer(shared_rewards, dtype=np.float64)[start:stop]
+    terminations = np.frombuffer(shared_terminations, dtype=bool)[start:stop]
+    truncations = np.frombuffer(shared_truncations, dtype=bool)[start:stop]
+    try:
+        while True:
+            command, data = connection.recv()
+            if command == "close":
+                connection.send((True, None))
+                break
+            try:
+                if command == "reset":
+                    seeds, options = data
+                    env_observations, infos = vector_env.reset_envs(seeds, options)
+                elif command == "step":
+                    env_observations, infos = vector_env.step_envs(data)
+                    rewards[:] = vector_env.rewards
+                    terminations[:] = vector_env.terminations
+                    truncations[:] = vector_env.truncations
+                else:
+                    raise ValueError(f"Unknown command {command}")
+                concatenate(observation_space, env_observations, observations)
+                connection.send((True, infos))
+            except Exception as error:
+                connection.send((False, repr(error)))
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        vector_env.close()
+        connection.close()
+
+
+class BLADESubprocVecEnv(VectorEnv):
+
+    # runs num_envs copies of a game in forked workers, each stepping its share of the
+    # envs as a BLADEVectorEnv. The scenario is loaded once in the parent and
+    # inherited by the workers, observations, rewards and done flags are written to
+    # shared memory, and only actions and infos travel through the pipes.
+    def __init__(
+        self,
+        game: Game,
+        num_envs: int,
+        num_workers: Optional[int] = None,
+        max_episode_steps: Optional[int] = None,
+        copy: bool = True,
+        **env_kwargs,
+    ) -> None:
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("BLADESubprocVecEnv needs the fork start method")
+        template_game = game.clone()
+        template_env = BLADE(game=template_game, **env_kwargs)
+        if isinstance(template_env.observation_space, Text):
+            raise ValueError(
+                "BLADESubprocVecEnv needs a numeric observation space, e.g. from an "
+                "ObservationEncoder"
+            )
+        super().__init__(
+            num_envs, template_env.observation_space, template_env.action_space
+        )
+        self.copy = copy
+
+        context = multiprocessing.get_context("fork")
+        shared_observations = create_shared_memory(
+            self.single_observation_space, n=num_envs, ctx=context
+        )
+        shared_rewards = context.RawArray("d", num_envs)
+        shared_terminations = context.RawArray("b", num_envs)
+        shared_truncations = context.RawArray("b", num_envs)
+        self.observations = read_from_shared_memory(
+            self.single_observation_space, shared_observations, n=num_envs
+        )
+        self.rewards = np.frombuffer(shared_rewards, dtype=np.float64)
+        self.terminations = np.frombuffer(shared_terminations, dtype=bool)
+        self.truncations = np.frombuffer(shared_truncations, dtype=bool)
+
+        num_workers = min(num_envs, num_workers or os.cpu_count() or 1)
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int).tolist()
+        self.worker_slices = list(zip(bounds[:-1], bounds[1:]))
+        self.connections: list[Connection] = []
+        self.processes = []
+        for start, stop in self.worker_slices:
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_worker,
+                name=f"BLADEWorker-{len(self.processes)}",
+                args=(
+                    child_connection,
+                    parent_connection,
+                    template_game,
+                    num_envs,
+                    start,
+                    stop,
+                    max_episode_steps,
+                    env_kwargs,
+                    (
+                        shared_observations,
+                        shared_rewards,
+                        shared_terminations,
+                        shared_truncations,
+                    ),
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            self.connections.append(parent_connection)
+            self.processes.append(process)
+
+    def send(self, command: str, get_data) -> None:
+        for connection, (start, stop) in zip(self.connections, self.worker_slices):
+            connection.send((command, get_data(start, stop)))
+
+    def receive(self) -> dict:
+        results = [connection.recv() for connection in self.connections]
+        for success, payload in results:
+            if not success:
+                raise RuntimeError(f"BLADE worker failed: {payload}")
+        infos = {}
+        for (start, _), (_, env_infos) in zip(self.worker_slices, results):
+            for offset, info in enumerate(env_infos):
+                infos = self._add_info(infos, info, start + offset)
+        return infos
+
+    def get_observations(self):
+        return deepcopy(self.observations) if self.copy else self.observations
+
+    def reset_async(self, seed=None, options=None) -> None:
+        seeds = get_env_seeds(seed, self.num_envs)
+        self.send("reset", lambda start, stop: (seeds[start:stop], options))
+
+    def reset_wait(self, seed=None, options=None):
+        infos = self.receive()
+        return self.get_observations(), infos
+
+    def step_async(self, actions) -> None:
+        actions = list(iterate(self.action_space, actions))
+        self.send("step", lambda start, stop: actions[start:stop])
+
+    def step_wait(self):
+        infos = self.receive()
+        return (
+            self.get_observations(),
+            np.copy(self.rewards),
+            np.copy(self.terminations),
+            np.copy(self.truncations),
+            infos,
+        )
+
+    def close_extras(self, timeout: Optional[float] = None, **kwargs) -> None:
+        for connection in self.connections:
+            try:
+                connection.send(("close", None))
+                connection.recv()
+            except (BrokenPipeError, EOFError):
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
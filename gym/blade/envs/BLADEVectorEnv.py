@@ -0,0 +1,166 @@
+import numpy as np
+from copy import deepcopy
+from typing import Optional, Sequence
+from gymnasium.spaces import Text
+from gymnasium.vector import VectorEnv
+from gymnasium.vector.utils import concatenate, create_empty_array, iterate
+
+from blade.Game import Game
+from blade.envs.blade import BLADE
+
+
+def get_env_seeds(seed, num_envs: int) -> list:
+    if seed is None or isinstance(seed, int):
+        return [None if seed is None else seed + index for index in range(num_envs)]
+    return list(seed)
+
+
+class BLADEVectorEnv(VectorEnv):
+
+    # steps one BLADE env per game in lockstep. Sub-environments that terminate or
+    # truncate are reset straight away, and their last observation and info are
+    # returned under "final_observation" and "final_info" as in SyncVectorEnv.
+    def __init__(
+        self,
+        games: Sequence[Game],
+        max_episode_steps: Optional[int] = None,
+        copy: bool = True,
+        **env_kwargs,
+    ) -> None:
+        if len({id(game.current_scenario) for game in games}) != len(games):
+            raise ValueError("Games of a BLADEVectorEnv must not share a scenario")
+        observation_encoder = env_kwargs.pop("observation_encoder", None)
+        self.envs = [
+            BLADE(
+                game=game,
+                # every env encodes into its own buffers
+                observation_encoder=deepcopy(observation_encoder),
+                **env_kwargs,
+            )
+            for game in games
+        ]
+        super().__init__(
+            len(self.envs), self.envs[0].observation_space, self.envs[0].action_space
+        )
+        self.max_episode_steps = max_episode_steps
+        # Scenario observations are live objects, as in BLADE, and never copied
+        self.copy = copy and not isinstance(self.single_observation_space, Text)
+        self.observations = create_empty_array(
+            self.single_observation_space, n=self.num_envs, fn=np.zeros
+        )
+        self.rewards = np.zeros(self.num_envs, dtype=np.float64)
+        self.terminations = np.zeros(self.num_envs, dtype=bool)
+        self.truncations = np.zeros(self.num_envs, dtype=bool)
+        self.episode_steps = np.zeros(self.num_envs, dtype=np.int64)
+        self.actions = None
+
+    @property
+    def games(self) -> list[Game]:
+        return [env.game for env in self.envs]
+
+    def reset_envs(self, seeds: list, options=None) -> tuple[list, list[dict]]:
+        observations = []
+        infos = []
+        for env, env_seed in zip(self.envs, seeds):
+            observation, info = env.reset(seed=env_seed, options=options)
+            observations.append(observation)
+            infos.append(info)
+        self.episode_steps[:] = 0
+        return observations, infos
+
+    def reset_wait(self, seed=None, options=None):
+        observations, env_infos = self.reset_envs(
+            get_env_seeds(seed, self.num_envs), options
+        )
+        return self.batch_observations(observations), self.batch_infos(env_infos)
+
+    def step_async(self, actions) -> None:
+        self.actions = list(iterate(self.action_space, actions))
+
+    def step_envs(self, actions: list) -> tuple[list, list[dict]]:
+        for env, action in zip(self.envs, actions):
+            env.game.handle_action(env._transform_action(action))
+        self.rewards[:] = 0
+        self.terminations[:] = False
+        self.truncations[:] = False
+        # envs that end during a frame skip drop out of the remaining ticks
+        active_indices = list(range(self.num_envs))
+        for _ in range(self.envs[0].frame_skip):
+            Game.update_game_states(
+                [self.envs[index].game for index in active_indices]
+            )
+            remaining_indices = []
+            for index in active_indices:
+                env = self.envs[index]
+                reward, terminated, truncated = env.game.get_tick_result(
+                    env.termination_filter_fnc, env.reward_filter_fnc
+                )
+                self.rewards[index] += reward
+                self.terminations[index] = terminated
+                self.truncations[index] = truncated
+                if not (terminated or truncated):
+                    remaining_indices.append(index)
+            active_indices = remaining_indices
+            if len(active_indices) == 0:
+                break
+
+        observations = []
+        infos = []
+        self.episode_steps += 1
+        for index, env in enumerate(self.envs):
+            observation, reward, terminated, truncated, info = env._filter_step(
+                env.game._get_observation(),
+                self.rewards[index],
+                self.terminations[index],
+                self.truncations[index],
+                env.game._get_info(),
+            )
+            if (
+                self.max_episode_steps is not None
+                and self.episode_steps[index] >= self.max_episode_steps
+            ):
+                truncated = True
+            self.rewards[index] = reward
+            self.terminations[index] = terminated
+            self.truncations[index] = truncated
+            if terminated or truncated:
+                # encoded observations live in buffers that the reset overwrites
+                final_observation = (
+                    observation
+                    if isinstance(self.single_observation_space, Text)
+                    else deepcopy(observation)
+                )
+                final_info = info
+                observation, info = env.reset()
+                self.episode_steps[index] = 0
+                info["final_observation"] = final_observation
+                info["final_info"] = final_info
+            observations.append(observation)
+            infos.append(info)
+        return observations, infos
+
+    def step_wait(self):
+        observations, env_infos = self.step_envs(self.actions)
+        return (
+            self.batch_observations(observations),
+            np.copy(self.rewards),
+            np.copy(self.terminations),
+            np.copy(self.truncations),
+            self.batch_infos(env_infos),
+        )
+
+    def batch_observations(self, observations: list):
+        self.observations = concatenate(
+            self.single_observation_space, observations, self.observations
+        )
+        return deepcopy(self.observations) if self.copy else self.observations
+
+    def batch_infos(self, env_infos: list[dict]) -> dict:
+        infos = {}
+        for index, info in enumerate(env_infos):
+            infos = self._add_info(infos, info, index)
+        return infos
+
+    def close_extras(self, **kwargs) -> None:
+        for env in self.envs:
+            env.close()
@@ -0,0 +1,46 @@
+import numpy as np
+from typing import Optional
+from gymnasium.spaces import Box
+
+from blade.Scenario import Scenario
+from blade.envs.ObservationEncoder import DEFAULT_MAX_AIRCRAFT
+from blade.envs.MultiDiscreteActionAdapter import DEFAULT_BOUNDS
+from blade.utils.actions import ActionType, make_action_records
+
+
+class BoxActionAdapter:
+
+    # row i of the action is the next (latitude, longitude) waypoint of aircraft row
+    # i of the ObservationEncoder layout. Rows without an aircraft, or with one of
+    # another side, are ignored. The moves are returned as one batch of records.
+    def __init__(
+        self,
+        max_aircraft: int = DEFAULT_MAX_AIRCRAFT,
+        bounds: tuple = DEFAULT_BOUNDS,
+        side_id: Optional[str] = None,
+    ) -> None:
+        self.max_aircraft = max_aircraft
+        self.side_id = side_id
+        (latitude_low, latitude_high), (longitude_low, longitude_high) = bounds
+        self.low = np.tile([latitude_low, longitude_low], (max_aircraft, 1))
+        self.high = np.tile([latitude_high, longitude_high], (max_aircraft, 1))
+        self.action_space = Box(low=self.low, high=self.high, dtype=np.float64)
+
+    def to_action(
+        self, action: np.ndarray, scenario: Scenario, side_id: Optional[str] = None
+    ) -> np.ndarray:
+        if self.side_id is not None:
+            side_id = self.side_id
+        aircraft = scenario.aircraft[: self.max_aircraft]
+        rows = [
+            row
+            for row, unit in enumerate(aircraft)
+            if side_id is None or unit.side_id == side_id
+        ]
+        waypoints = np.clip(np.asarray(action), self.low, self.high)[rows]
+        records = make_action_records(len(rows))
+        records["action_type"] = ActionType.MOVE_AIRCRAFT
+        records["unit_id"] = [aircraft[row].id for row in rows]
+        records["latitude"] = waypoints[:, 0]
+        records["longitude"] = waypoints[:, 1]
+        return records
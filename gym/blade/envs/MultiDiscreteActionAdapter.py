@@ -0,0 +1,129 @@
+import numpy as np
+from typing import Optional
+from gymnasium.spaces import MultiDiscrete
+
+from blade.Scenario import Scenario
+from blade.envs.ObservationEncoder import (
+    DEFAULT_MAX_AIRCRAFT,
+    DEFAULT_MAX_SHIPS,
+    DEFAULT_MAX_FACILITIES,
+)
+from blade.utils.actions import ActionType
+
+DEFAULT_LATITUDE_BINS = 180
+DEFAULT_LONGITUDE_BINS = 360
+DEFAULT_BOUNDS = ((-90.0, 90.0), (-180.0, 180.0))
+DEFAULT_ACTION_TYPES = (
+    ActionType.NOOP,
+    ActionType.MOVE_AIRCRAFT,
+    ActionType.AIRCRAFT_ATTACK,
+    ActionType.AIRCRAFT_RETURN_TO_BASE,
+)
+SUPPORTED_ACTION_TYPES = DEFAULT_ACTION_TYPES + (
+    ActionType.LAND_AIRCRAFT,
+    ActionType.REMOVE_AIRCRAFT,
+)
+
+
+class MultiDiscreteActionAdapter:
+
+    # one command per step as [action type, aircraft row, target row, latitude bin,
+    # longitude bin]. Rows follow the ObservationEncoder layout, with target rows
+    # running over the aircraft, then the ships, then the facilities. Commands for
+    # empty rows or units of another side become no-ops. action_types picks the
+    # commands the first entry indexes, out of SUPPORTED_ACTION_TYPES.
+    def __init__(
+        self,
+        max_aircraft: int = DEFAULT_MAX_AIRCRAFT,
+        max_ships: int = DEFAULT_MAX_SHIPS,
+        max_facilities: int = DEFAULT_MAX_FACILITIES,
+        latitude_bins: int = DEFAULT_LATITUDE_BINS,
+        longitude_bins: int = DEFAULT_LONGITUDE_BINS,
+        bounds: tuple = DEFAULT_BOUNDS,
+        action_types: tuple[ActionType, ...] = DEFAULT_ACTION_TYPES,
+        side_id: Optional[str] = None,
+    ) -> None:
+        unsupported_action_types = [
+            action_type
+            for action_type in action_types
+            if action_type not in SUPPORTED_ACTION_TYPES
+        ]
+        if len(unsupported_action_types) > 0:
+            raise ValueError(
+                f"Unsupported action types {unsupported_action_types}, expected "
+                f"some of {list(SUPPORTED_ACTION_TYPES)}"
+            )
+        self.max_aircraft = max_aircraft
+        self.max_targets = {
+            "aircraft": max_aircraft,
+            "ships": max_ships,
+            "facilities": max_facilities,
+        }
+        self.bounds = bounds
+        self.action_types = action_types
+        self.side_id = side_id
+        self.action_space = MultiDiscrete(
+            [
+                len(action_types),
+                max_aircraft,
+                max_aircraft + max_ships + max_facilities,
+                latitude_bins,
+                longitude_bins,
+            ]
+        )
+        (latitude_low, latitude_high), (longitude_low, longitude_high) = bounds
+        self.latitudes = latitude_low + (np.arange(latitude_bins) + 0.5) * (
+            (latitude_high - latitude_low) / latitude_bins
+        )
+        self.longitudes = longitude_low + (np.arange(longitude_bins) + 0.5) * (
+            (longitude_high - longitude_low) / longitude_bins
+        )
+
+    def get_target(self, scenario: Scenario, target_index: int):
+        for entity_name, max_entities in self.max_targets.items():
+            if target_index < max_entities:
+                entities = getattr(scenario, entity_name)
+                if target_index < min(len(entities), max_entities):
+                    return entities[target_index]
+                return None
+            target_index -= max_entities
+        return None
+
+    def to_action(
+        self, action: np.ndarray, scenario: Scenario, side_id: Optional[str] = None
+    ) -> tuple:
+        if self.side_id is not None:
+            side_id = self.side_id
+        action_type_index, aircraft_index, target_index, latitude_bin, longitude_bin = (
+            int(value) for value in action
+        )
+        action_type = self.action_types[action_type_index]
+        if action_type == ActionType.NOOP or aircraft_index >= min(
+            len(scenario.aircraft), self.max_aircraft
+        ):
+            return (ActionType.NOOP,)
+        aircraft = scenario.aircraft[aircraft_index]
+        if side_id is not None and aircraft.side_id != side_id:
+            return (ActionType.NOOP,)
+
+        if action_type == ActionType.MOVE_AIRCRAFT:
+            return (
+                ActionType.MOVE_AIRCRAFT,
+                aircraft.id,
+                [
+                    [
+                        float(self.latitudes[latitude_bin]),
+                        float(self.longitudes[longitude_bin]),
+                    ]
+                ],
+            )
+        elif action_type == ActionType.AIRCRAFT_ATTACK:
+            target = self.get_target(scenario, target_index)
+            weapon = next(
+                (weapon for weapon in aircraft.weapons if weapon.current_quantity > 0),
+                None,
+            )
+            if target is None or weapon is None:
+                return (ActionType.NOOP,)
+            return (ActionType.AIRCRAFT_ATTACK, aircraft.id, target.id, weapon.id, 1)
+        return (action_type, aircraft.id)
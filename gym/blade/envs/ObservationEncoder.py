@@ -0,0 +1,145 @@
+import numpy as np
+from typing import Optional
+from gymnasium.spaces import Box, Dict
+
+from blade.Scenario import Scenario
+
+DEFAULT_MAX_AIRCRAFT = 32
+DEFAULT_MAX_SHIPS = 16
+DEFAULT_MAX_FACILITIES = 32
+DEFAULT_MAX_WEAPONS = 64
+
+MOVING_UNIT_FEATURES = (
+    "latitude",
+    "longitude",
+    "altitude",
+    "heading",
+    "speed",
+    "fuel_fraction",
+    "range",
+    "weapon_count",
+    "own_side",
+    "hostile",
+)
+ENTITY_FEATURES = {
+    "aircraft": MOVING_UNIT_FEATURES,
+    "ships": MOVING_UNIT_FEATURES,
+    "facilities": (
+        "latitude",
+        "longitude",
+        "altitude",
+        "range",
+        "weapon_count",
+        "own_side",
+        "hostile",
+    ),
+    "weapons": (
+        "latitude",
+        "longitude",
+        "altitude",
+        "heading",
+        "speed",
+        "fuel_fraction",
+        "own_side",
+        "hostile",
+    ),
+}
+
+
+def get_fuel_fraction(unit) -> float:
+    return unit.current_fuel / unit.max_fuel if unit.max_fuel else 0.0
+
+
+def get_weapon_count(unit) -> int:
+    return sum(weapon.current_quantity for weapon in unit.weapons)
+
+
+FEATURE_GETTERS = {
+    "fuel_fraction": get_fuel_fraction,
+    "weapon_count": get_weapon_count,
+}
+
+
+class ObservationEncoder:
+
+    # encodes the scenario into fixed-size per-entity feature tensors padded with
+    # zeros, with a mask marking the rows that hold a unit. Units beyond the maximum
+    # are dropped in scenario order. The returned arrays are reused on every call,
+    # so callers that keep an observation must copy it.
+    def __init__(
+        self,
+        max_aircraft: int = DEFAULT_MAX_AIRCRAFT,
+        max_ships: int = DEFAULT_MAX_SHIPS,
+        max_facilities: int = DEFAULT_MAX_FACILITIES,
+        max_weapons: int = DEFAULT_MAX_WEAPONS,
+        side_id: Optional[str] = None,
+        dtype=np.float32,
+    ) -> None:
+        self.max_entities = {
+            "aircraft": max_aircraft,
+            "ships": max_ships,
+            "facilities": max_facilities,
+            "weapons": max_weapons,
+        }
+        self.side_id = side_id
+        self.dtype = dtype
+        spaces = {}
+        for entity_name, features in ENTITY_FEATURES.items():
+            max_entities = self.max_entities[entity_name]
+            spaces[entity_name] = Box(
+                low=-np.inf,
+                high=np.inf,
+                shape=(max_entities, len(features)),
+                dtype=dtype,
+            )
+            spaces[f"{entity_name}_mask"] = Box(
+                low=0, high=1, shape=(max_entities,), dtype=np.int8
+            )
+        spaces["elapsed_time"] = Box(low=0, high=np.inf, shape=(1,), dtype=dtype)
+        self.observation_space = Dict(spaces)
+        self.buffers = {
+            name: np.zeros(space.shape, dtype=space.dtype)
+            for name, space in self.observation_space.items()
+        }
+
+    def get_feature_names(self, entity_name: str) -> tuple[str, ...]:
+        return ENTITY_FEATURES[entity_name]
+
+    def encode_entities(
+        self, scenario: Scenario, entity_name: str, side_id: Optional[str]
+    ) -> None:
+        units = getattr(scenario, entity_name)[: self.max_entities[entity_name]]
+        buffer = self.buffers[entity_name]
+        mask = self.buffers[f"{entity_name}_mask"]
+        count = len(units)
+        buffer[count:] = 0
+        mask[count:] = 0
+        mask[:count] = 1
+        if count == 0:
+            return
+        for column, feature in enumerate(ENTITY_FEATURES[entity_name]):
+            if feature == "own_side":
+                values = [unit.side_id == side_id for unit in units]
+            elif feature == "hostile":
+                if side_id is None:
+                    values = 0
+                else:
+                    values = scenario.relationships.get_hostility_mask(
+                        side_id, [unit.side_id for unit in units]
+                    )
+            elif feature in FEATURE_GETTERS:
+                getter = FEATURE_GETTERS[feature]
+                values = [getter(unit) for unit in units]
+            else:
+                values = [getattr(unit, feature) for unit in units]
+            buffer[:count, column] = values
+
+    def encode(
+        self, scenario: Scenario, side_id: Optional[str] = None
+    ) -> dict[str, np.ndarray]:
+        if self.side_id is not None:
+            side_id = self.side_id
+        for entity_name in ENTITY_FEATURES:
+            self.encode_entities(scenario, entity_name, side_id)
+        self.buffers["elapsed_time"][0] = scenario.current_time - scenario.start_time
+        return self.buffers
@@ -1 +1,6 @@
 from blade.envs.blade import BLADE
+from blade.envs.ObservationEncoder import ObservationEncoder
+from blade.envs.MultiDiscreteActionAdapter import MultiDiscreteActionAdapter
+from blade.envs.BoxActionAdapter import BoxActionAdapter
+from blade.envs.BLADEVectorEnv import BLADEVectorEnv
+from blade.envs.BLADESubprocVecEnv import BLADESubprocVecEnv
@@ -3,6 +3,9 @@ import gymnasium as gym
 from gymnasium.spaces import Text
 
 from blade.Game import Game
+from blade.envs.ObservationEncoder import ObservationEncoder
+from blade.envs.MultiDiscreteActionAdapter import MultiDiscreteActionAdapter
+from blade.envs.BoxActionAdapter import BoxActionAdapter
 from blade.Scenario import Scenario
 from blade.utils.constants import (
     BLADE_ENV_OBSERVATION_SPACE_MAX_CHARACTERS,
@@ -22,14 +25,26 @@ class BLADE(gym.Env):
         observation_filter_fnc=None,
         reward_filter_fnc=None,
         termination_filter_fnc=None,
+        observation_encoder: ObservationEncoder = None,
+        action_adapter: MultiDiscreteActionAdapter | BoxActionAdapter = None,
+        frame_skip: int = 1,
     ):
-        if observation_space is None:
+        if frame_skip < 1:
+            raise ValueError("frame_skip must be at least 1")
+        self.frame_skip = frame_skip
+        self.observation_encoder = observation_encoder
+        if observation_space is None and observation_encoder is not None:
+            self.observation_space = observation_encoder.observation_space
+        elif observation_space is None:
             self.observation_space = Text(
                 max_length=BLADE_ENV_OBSERVATION_SPACE_MAX_CHARACTERS
             )
         else:
             self.observation_space = observation_space
-        if action_space is None:
+        self.action_adapter = action_adapter
+        if action_space is None and action_adapter is not None:
+            self.action_space = action_adapter.action_space
+        elif action_space is None:
             self.action_space = Text(max_length=BLADE_ENV_ACTION_SPACE_MAX_CHARACTERS)
         else:
             self.action_space = action_space
@@ -40,8 +55,13 @@ class BLADE(gym.Env):
         self.render_mode = render_mode
         self.game = game
 
+    def _encode_observation(self, observation):
+        if self.observation_encoder is None:
+            return observation
+        return self.observation_encoder.encode(observation, self.game.current_side_id)
+
     def _get_obs(self):
-        obs = self.game._get_observation()
+        obs = self._encode_observation(self.game._get_observation())
         if self.observation_filter_fnc is not None:
             obs = self.observation_filter_fnc(obs)
         return obs
@@ -50,19 +70,41 @@ class BLADE(gym.Env):
         return self.game._get_info()
 
     def reset(self, seed=None, options=None):
-        self.game.reset()
+        # a seed gives the game its own random generator, which later resets without
+        # a seed keep drawing from
+        super().reset(seed=seed)
+        self.game.reset(seed=seed)
         observation = self._get_obs()
         info = self._get_info()
         return observation, info
 
-    def step(self, action):
+    def _transform_action(self, action):
+        if self.action_adapter is not None:
+            action = self.action_adapter.to_action(
+                action, self.game.current_scenario, self.game.current_side_id
+            )
         if self.action_transform_fnc is not None:
             action = self.action_transform_fnc(self.game.current_scenario, action)
-        observation, reward, terminated, truncated, info = self.game.step(action=action)
-        if self.reward_filter_fnc is not None:
-            reward = self.reward_filter_fnc(observation)
-        if self.termination_filter_fnc is not None:
-            terminated = self.termination_filter_fnc(observation)
+        return action
+
+    def step(self, action):
+        # advances frame_skip ticks per action. The termination and reward filters
+        # run on every tick and the rewards are summed, the observation is built once
+        # at the end.
+        self.game.handle_action(self._transform_action(action))
+        reward, terminated, truncated = self.game.advance(
+            self.frame_skip, self.termination_filter_fnc, self.reward_filter_fnc
+        )
+        return self._filter_step(
+            self.game._get_observation(),
+            reward,
+            terminated,
+            truncated,
+            self.game._get_info(),
+        )
+
+    def _filter_step(self, observation, reward, terminated, truncated, info):
+        observation = self._encode_observation(observation)
         if self.observation_filter_fnc is not None:
             observation = self.observation_filter_fnc(observation)
         return observation, reward, terminated, truncated, info
@@ -75,5 +117,6 @@ class BLADE(gym.Env):
 
     def pretty_print(self, observation: Scenario = None):
         if observation == None:
-            observation = self._get_obs()
+            # _get_obs returns the encoded dict when an observation_encoder is set
+            observation = self.game.current_scenario
         print("Current Time: " + str(observation.current_time))
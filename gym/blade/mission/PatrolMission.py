@@ -1,6 +1,6 @@
 import json
-from typing import List
-from random import random
+from typing import List, Optional
+from random import Random, random
 from shapely.geometry import Point, Polygon
 from blade.units.ReferencePoint import ReferencePoint
 
@@ -39,11 +39,15 @@ class PatrolMission:
             return True
         return False
 
-    def generate_random_coordinates_within_patrol_area(self) -> List[float]:
+    def generate_random_coordinates_within_patrol_area(
+        self, rng: Optional[Random] = None
+    ) -> List[float]:
+        random_value = random if rng is None else rng.random
         random_coordinates = [
-            random() * (self.assigned_area[2].latitude - self.assigned_area[0].latitude)
+            random_value()
+            * (self.assigned_area[2].latitude - self.assigned_area[0].latitude)
             + self.assigned_area[0].latitude,
-            random()
+            random_value()
             * (self.assigned_area[1].longitude - self.assigned_area[0].longitude)
             + self.assigned_area[0].longitude,
         ]
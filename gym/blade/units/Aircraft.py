@@ -2,6 +2,7 @@ import json
 from typing import List, Optional
 from blade.units.Weapon import Weapon
 from blade.utils.colors import convert_color_name_to_side_color, SIDE_COLOR
+from blade.utils.UnitStateStore import StateField
 
 
 class BlackBox:
@@ -76,6 +77,24 @@ class BlackBox:
 
 
 class Aircraft:
+    STATE_FIELDS = (
+        "latitude",
+        "longitude",
+        "altitude",
+        "heading",
+        "speed",
+        "current_fuel",
+        "fuel_rate",
+    )
+    latitude = StateField()
+    longitude = StateField()
+    altitude = StateField()
+    heading = StateField()
+    speed = StateField()
+    current_fuel = StateField()
+    fuel_rate = StateField()
+    _state_store = None
+    _state_slot = -1
 
     def __init__(
         self,
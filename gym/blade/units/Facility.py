@@ -2,9 +2,17 @@ import json
 from typing import List, Optional
 from blade.units.Weapon import Weapon
 from blade.utils.colors import convert_color_name_to_side_color, SIDE_COLOR
+from blade.utils.UnitStateStore import StateField
 
 
 class Facility:
+    STATE_FIELDS = ("latitude", "longitude", "altitude")
+    latitude = StateField()
+    longitude = StateField()
+    altitude = StateField()
+    _state_store = None
+    _state_slot = -1
+
     def __init__(
         self,
         id: str,
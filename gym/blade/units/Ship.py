@@ -3,9 +3,28 @@ from typing import List, Optional
 from blade.units.Aircraft import Aircraft
 from blade.units.Weapon import Weapon
 from blade.utils.colors import convert_color_name_to_side_color, SIDE_COLOR
+from blade.utils.UnitStateStore import StateField
 
 
 class Ship:
+    STATE_FIELDS = (
+        "latitude",
+        "longitude",
+        "altitude",
+        "heading",
+        "speed",
+        "current_fuel",
+        "fuel_rate",
+    )
+    latitude = StateField()
+    longitude = StateField()
+    altitude = StateField()
+    heading = StateField()
+    speed = StateField()
+    current_fuel = StateField()
+    fuel_rate = StateField()
+    _state_store = None
+    _state_slot = -1
 
     def __init__(
         self,
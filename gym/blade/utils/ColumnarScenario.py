@@ -0,0 +1,466 @@
+import json
+import numpy as np
+from typing import Optional
+
+MAGIC = b"BLADECOL"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+MAX_EXACT_FLOAT_INTEGER = 2**53
+
+# scenario collections stored as tables, and the table that each nested entity list
+# (e.g. an aircraft's weapons or a ship's hangar) is stored in
+COLLECTION_TABLES = {
+    "aircraft": "aircraft",
+    "ships": "ships",
+    "facilities": "facilities",
+    "airbases": "airbases",
+    "weapons": "weapons",
+    "referencePoints": "referencePoints",
+    "missions": "missions",
+}
+NESTED_TABLES = {
+    "aircraft": "aircraft",
+    "weapons": "weapons",
+    "assignedArea": "referencePoints",
+}
+
+TABLE_ENCODING_ORDER = [
+    "missions",
+    "ships",
+    "airbases",
+    "aircraft",
+    "facilities",
+    "weapons",
+    "referencePoints",
+]
+
+_MISSING = object()
+
+
+def align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_point_list(value) -> bool:
+    return isinstance(value, list) and all(
+        isinstance(point, list) and all(is_number(item) for item in point)
+        for point in value
+    )
+
+
+class ColumnarScenarioWriter:
+
+    def __init__(self) -> None:
+        self.tables: dict[str, list[dict]] = {
+            name: [] for name in COLLECTION_TABLES.values()
+        }
+        self.strings: dict[str, int] = {}
+        self.arrays: list[np.ndarray] = []
+        self.encoded_tables: set[str] = set()
+
+    def add_string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings[value] = index
+        return index
+
+    def add_array(self, array: np.ndarray) -> int:
+        self.arrays.append(np.ascontiguousarray(array))
+        return len(self.arrays) - 1
+
+    def add_rows(self, table_name: str, rows: list[dict]) -> tuple[int, int]:
+        table = self.tables[table_name]
+        start = len(table)
+        table.extend(rows)
+        return start, len(table)
+
+    def get_column_keys(self, rows: list[dict]) -> list[str]:
+        return list(dict.fromkeys(key for row in rows for key in row))
+
+    def encode_offsets(self, lengths: list[int]) -> int:
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return self.add_array(offsets)
+
+    def encode_numbers(self, values: list, column: dict, name: str) -> None:
+        if all(isinstance(value, int) for value in values) and all(
+            -(2**63) <= value < 2**63 for value in values
+        ):
+            column["arrays"][name] = self.add_array(np.array(values, dtype=np.int64))
+            column["arrays"][f"{name}_is_int"] = None
+            return
+        column["arrays"][name] = self.add_array(np.array(values, dtype=np.float64))
+        is_int = [isinstance(value, int) for value in values]
+        column["arrays"][f"{name}_is_int"] = (
+            self.add_array(np.array(is_int, dtype=bool)) if any(is_int) else None
+        )
+
+    def encode_column(self, table_name: str, key: str, rows: list[dict]) -> dict:
+        values = [row.get(key, _MISSING) for row in rows]
+        present_values = [value for value in values if value is not _MISSING]
+        column = {"key": key, "arrays": {}}
+        if len(present_values) < len(values):
+            column["arrays"]["present"] = self.add_array(
+                np.array([value is not _MISSING for value in values], dtype=bool)
+            )
+        values = present_values
+
+        if all(isinstance(value, bool) for value in values):
+            column["kind"] = "bool"
+            column["arrays"]["values"] = self.add_array(np.array(values, dtype=bool))
+        elif all(is_number(value) for value in values) and all(
+            isinstance(value, float) or abs(value) < MAX_EXACT_FLOAT_INTEGER
+            for value in values
+        ):
+            column["kind"] = "number"
+            self.encode_numbers(values, column, "values")
+        elif all(isinstance(value, str) for value in values):
+            column["kind"] = "string"
+            column["arrays"]["values"] = self.add_array(
+                np.array([self.add_string(value) for value in values], dtype=np.int32)
+            )
+        elif (
+            key in NESTED_TABLES
+            and NESTED_TABLES[key] != table_name
+            and NESTED_TABLES[key] not in self.encoded_tables
+        ) and all(
+            isinstance(value, list) and all(isinstance(item, dict) for item in value)
+            for value in values
+        ):
+            column["kind"] = "entities"
+            column["table"] = NESTED_TABLES[key]
+            column["arrays"]["offsets"] = self.encode_offsets(
+                [len(value) for value in values]
+            )
+            column["start"] = len(self.tables[column["table"]])
+            for value in values:
+                self.add_rows(column["table"], value)
+        elif all(
+            isinstance(value, list) and all(isinstance(item, str) for item in value)
+            for value in values
+        ):
+            column["kind"] = "string_list"
+            column["arrays"]["offsets"] = self.encode_offsets(
+                [len(value) for value in values]
+            )
+            column["arrays"]["values"] = self.add_array(
+                np.array(
+                    [self.add_string(item) for value in values for item in value],
+                    dtype=np.int32,
+                )
+            )
+        elif all(is_point_list(value) for value in values) and (
+            len({len(point) for value in values for point in value}) <= 1
+        ):
+            points = [point for value in values for point in value]
+            dimensions = len(points[0]) if points else 2
+            column["kind"] = "points"
+            column["dimensions"] = dimensions
+            column["arrays"]["offsets"] = self.encode_offsets(
+                [len(value) for value in values]
+            )
+            self.encode_numbers(
+                [item for point in points for item in point], column, "values"
+            )
+        else:
+            column["kind"] = "json"
+            column["arrays"]["values"] = self.add_array(
+                np.array(
+                    [self.add_string(json.dumps(value)) for value in values],
+                    dtype=np.int32,
+                )
+            )
+        return column
+
+    def encode_table(self, table_name: str) -> dict:
+        rows = self.tables[table_name]
+        self.encoded_tables.add(table_name)
+        column_keys = self.get_column_keys(rows)
+        table = {
+            "rows": len(rows),
+            "columns": [
+                self.encode_column(table_name, key, rows) for key in column_keys
+            ],
+            "key_orders": None,
+        }
+        # rows keep their own key order, which only needs storing when it differs
+        # from the column order
+        key_orders = {tuple(column_keys): 0}
+        row_key_orders = [
+            key_orders.setdefault(tuple(row), len(key_orders)) for row in rows
+        ]
+        if len(key_orders) > 1:
+            table["key_orders"] = {
+                "keys": [list(keys) for keys in key_orders],
+                "indices": self.add_array(np.array(row_key_orders, dtype=np.int32)),
+            }
+        return table
+
+    def encode_strings(self) -> dict:
+        # offsets are in characters so the whole blob can be decoded in one call
+        strings = list(self.strings)
+        lengths = [len(value) for value in strings]
+        return {
+            "offsets": self.encode_offsets(lengths),
+            "data": self.add_array(
+                np.frombuffer(
+                    "".join(strings).encode("utf-8", "surrogatepass"), dtype=np.uint8
+                )
+            ),
+        }
+
+    def write(self, export_object: dict, file_path: str) -> None:
+        saved_scenario = export_object["currentScenario"]
+        scenario = {}
+        collections = {}
+        for key, value in saved_scenario.items():
+            if key in COLLECTION_TABLES and isinstance(value, list):
+                table_name = COLLECTION_TABLES[key]
+                start, stop = self.add_rows(table_name, value)
+                collections[key] = {"table": table_name, "start": start, "stop": stop}
+            else:
+                scenario[key] = value
+
+        # tables are encoded parents first because encoding a parent appends its
+        # nested entities to the child tables
+        tables = {
+            table_name: self.encode_table(table_name)
+            for table_name in TABLE_ENCODING_ORDER
+        }
+        strings = self.encode_strings()
+
+        array_offset = 0
+        array_layout = []
+        for array in self.arrays:
+            array_offset = align(array_offset)
+            array_layout.append(
+                {
+                    "offset": array_offset,
+                    "dtype": array.dtype.str,
+                    "shape": list(array.shape),
+                }
+            )
+            array_offset += array.nbytes
+
+        def resolve(references: dict) -> dict:
+            return {
+                name: None if index is None else array_layout[index]
+                for name, index in references.items()
+            }
+
+        for table in tables.values():
+            for column in table["columns"]:
+                column["arrays"] = resolve(column["arrays"])
+            if table["key_orders"] is not None:
+                table["key_orders"]["indices"] = array_layout[
+                    table["key_orders"]["indices"]
+                ]
+        header = {
+            "version": FORMAT_VERSION,
+            "export": {
+                key: value
+                for key, value in export_object.items()
+                if key != "currentScenario"
+            },
+            "export_keys": list(export_object),
+            "scenario": scenario,
+            "scenario_keys": list(saved_scenario),
+            "collections": collections,
+            "tables": tables,
+            "strings": resolve(strings),
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = align(len(MAGIC) + 8 + len(header_bytes))
+
+        with open(file_path, "wb") as file:
+            file.write(MAGIC)
+            file.write(np.uint64(len(header_bytes)).tobytes())
+            file.write(header_bytes)
+            for array, layout in zip(self.arrays, array_layout):
+                file.write(b"\0" * (data_start + layout["offset"] - file.tell()))
+                file.write(array.tobytes())
+
+
+class ColumnarScenario:
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.buffer = np.memmap(file_path, dtype=np.uint8, mode="r")
+        if bytes(self.buffer[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{file_path} is not a columnar scenario file")
+        header_length = int(
+            self.buffer[len(MAGIC) : len(MAGIC) + 8].view(np.uint64)[0]
+        )
+        header_start = len(MAGIC) + 8
+        self.header = json.loads(
+            bytes(self.buffer[header_start : header_start + header_length])
+        )
+        if self.header["version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported columnar scenario version {self.header['version']}"
+            )
+        self.data_start = align(header_start + header_length)
+        self._strings: Optional[list[str]] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.buffer = None
+
+    def get_array(self, layout: dict) -> np.ndarray:
+        return np.ndarray(
+            shape=tuple(layout["shape"]),
+            dtype=np.dtype(layout["dtype"]),
+            buffer=self.buffer,
+            offset=self.data_start + layout["offset"],
+        )
+
+    def get_table_names(self) -> list[str]:
+        return list(self.header["tables"])
+
+    def get_column_names(self, table_name: str) -> list[str]:
+        return [
+            column["key"] for column in self.header["tables"][table_name]["columns"]
+        ]
+
+    def get_column(self, table_name: str, key: str, name: str = "values") -> np.ndarray:
+        for column in self.header["tables"][table_name]["columns"]:
+            if column["key"] == key:
+                return self.get_array(column["arrays"][name])
+        raise KeyError(f"{table_name} has no column {key}")
+
+    def get_strings(self) -> list[str]:
+        if self._strings is None:
+            offsets = self.get_array(self.header["strings"]["offsets"]).tolist()
+            data = bytes(self.get_array(self.header["strings"]["data"])).decode(
+                "utf-8", "surrogatepass"
+            )
+            self._strings = [
+                data[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])
+            ]
+        return self._strings
+
+    def decode_numbers(self, column: dict, name: str) -> list:
+        values = self.get_array(column["arrays"][name]).tolist()
+        is_int = column["arrays"][f"{name}_is_int"]
+        if is_int is not None:
+            values = [
+                int(value) if value_is_int else value
+                for value, value_is_int in zip(
+                    values, self.get_array(is_int).tolist()
+                )
+            ]
+        return values
+
+    def decode_column(self, column: dict, rows: dict[str, list[dict]]) -> list:
+        kind = column["kind"]
+        strings = self.get_strings()
+        if kind == "bool":
+            return self.get_array(column["arrays"]["values"]).tolist()
+        elif kind == "number":
+            return self.decode_numbers(column, "values")
+        elif kind == "string":
+            return [
+                strings[index]
+                for index in self.get_array(column["arrays"]["values"]).tolist()
+            ]
+        elif kind == "json":
+            return [
+                json.loads(strings[index])
+                for index in self.get_array(column["arrays"]["values"]).tolist()
+            ]
+
+        offsets = self.get_array(column["arrays"]["offsets"]).tolist()
+        if kind == "entities":
+            child_rows = self.get_rows(column["table"], rows)
+            start = column["start"]
+            return [
+                child_rows[start + first : start + last]
+                for first, last in zip(offsets[:-1], offsets[1:])
+            ]
+        elif kind == "string_list":
+            items = [
+                strings[index]
+                for index in self.get_array(column["arrays"]["values"]).tolist()
+            ]
+        elif kind == "points":
+            numbers = self.decode_numbers(column, "values")
+            dimensions = column["dimensions"]
+            items = [
+                numbers[index : index + dimensions]
+                for index in range(0, len(numbers), dimensions)
+            ]
+        else:
+            raise ValueError(f"Unknown column kind {kind}")
+        return [items[first:last] for first, last in zip(offsets[:-1], offsets[1:])]
+
+    def get_rows(self, table_name: str, rows: dict[str, list[dict]]) -> list[dict]:
+        if table_name in rows:
+            return rows[table_name]
+        table = self.header["tables"][table_name]
+        table_rows = [{} for _ in range(table["rows"])]
+        for column in table["columns"]:
+            values = iter(self.decode_column(column, rows))
+            key = column["key"]
+            present = column["arrays"].get("present")
+            if present is None:
+                for row, value in zip(table_rows, values):
+                    row[key] = value
+            else:
+                for row, is_present in zip(
+                    table_rows, self.get_array(present).tolist()
+                ):
+                    if is_present:
+                        row[key] = next(values)
+        key_orders = table["key_orders"]
+        if key_orders is not None:
+            indices = self.get_array(key_orders["indices"]).tolist()
+            table_rows = [
+                (
+                    row
+                    if index == 0
+                    else {key: row[key] for key in key_orders["keys"][index]}
+                )
+                for row, index in zip(table_rows, indices)
+            ]
+        rows[table_name] = table_rows
+        return table_rows
+
+    def to_export_object(self) -> dict:
+        rows: dict[str, list[dict]] = {}
+        collections = self.header["collections"]
+        saved_scenario = {}
+        for key in self.header["scenario_keys"]:
+            if key in collections:
+                collection = collections[key]
+                saved_scenario[key] = self.get_rows(collection["table"], rows)[
+                    collection["start"] : collection["stop"]
+                ]
+            else:
+                saved_scenario[key] = self.header["scenario"][key]
+        return {
+            key: (
+                saved_scenario
+                if key == "currentScenario"
+                else self.header["export"][key]
+            )
+            for key in self.header["export_keys"]
+        }
+
+
+def write_columnar_scenario(export_object: dict, file_path: str) -> None:
+    ColumnarScenarioWriter().write(export_object, file_path)
+
+
+def read_columnar_scenario(file_path: str) -> dict:
+    with ColumnarScenario(file_path) as columnar_scenario:
+        return columnar_scenario.to_export_object()
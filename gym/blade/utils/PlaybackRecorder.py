@@ -1,10 +1,28 @@
-from typing import Optional
+import os
+import gzip
+import json
+import lzma
+from copy import deepcopy
+from typing import BinaryIO, Optional
 from blade.Scenario import Scenario
+from blade.utils.recordingDelta import (
+    SCENARIO_KEY,
+    get_recording_delta,
+    make_delta_frame,
+    make_keyframe,
+)
 from blade.utils.utils import unix_to_local_time
 
 FILE_SIZE_LIMIT_MB = 10
-CHARACTER_LIMIT = FILE_SIZE_LIMIT_MB * 1024 * 1024
+SEGMENT_SIZE_LIMIT_BYTES = FILE_SIZE_LIMIT_MB * 1024 * 1024
+WRITE_BUFFER_SIZE = 64 * 1024
 RECORDING_INTERVAL_SECONDS = 10
+KEYFRAME_INTERVAL = 30
+RECORDING_EXTENSIONS = {None: ".jsonl", "gzip": ".jsonl.gz", "lzma": ".jsonl.xz"}
+IN_PROGRESS_SUFFIX = ".part"
+INDEX_SUFFIX = ".index.json"
+MANIFEST_SUFFIX = ".manifest.json"
+RECORDING_FORMAT_VERSION = 1
 
 
 class PlaybackRecorder:
@@ -13,15 +31,44 @@ class PlaybackRecorder:
         self,
         record_every_seconds: Optional[int] = None,
         recording_export_path: Optional[str] = ".",
+        delta_encoding: bool = False,
+        keyframe_interval: Optional[int] = None,
+        compression: Optional[str] = None,
+        segment_size_limit_bytes: Optional[int] = None,
     ) -> None:
+        if compression not in RECORDING_EXTENSIONS:
+            raise ValueError(
+                f"Unsupported recording compression {compression}, "
+                f"expected one of {list(RECORDING_EXTENSIONS)}"
+            )
         self.scenario_name: str = "New Scenario"
         self.current_scenario_time: int = 0
-        self.recording: str = ""
         self.recording_start_time: int = 0
         self.record_every_seconds: int = (
             record_every_seconds if record_every_seconds else RECORDING_INTERVAL_SECONDS
         )
         self.recording_export_path: str = recording_export_path
+        self.delta_encoding: bool = delta_encoding
+        self.keyframe_interval: int = (
+            keyframe_interval if keyframe_interval else KEYFRAME_INTERVAL
+        )
+        self.compression: Optional[str] = compression
+        self.segment_size_limit_bytes: int = (
+            segment_size_limit_bytes
+            if segment_size_limit_bytes
+            else SEGMENT_SIZE_LIMIT_BYTES
+        )
+        self.previous_frame: Optional[dict] = None
+        self.frames_since_keyframe: int = 0
+        self.segment_path: Optional[str] = None
+        self.segment_file: Optional[BinaryIO] = None
+        self.segment_stream: Optional[BinaryIO] = None
+        self.segment_bytes: int = 0
+        self.segment_index: dict[str, list] = {}
+        self.stream_offset: int = 0
+        self.stream_frames: int = 0
+        self.session_start_time: int = 0
+        self.manifest_segments: list[dict] = []
 
     def should_record(self, current_scenario_time: int) -> bool:
         if (
@@ -33,47 +80,188 @@ class PlaybackRecorder:
         return False
 
     def reset(self):
+        # an unfinished segment is kept rather than thrown away with the recording
+        self.export_recording(self.current_scenario_time)
         self.scenario_name = "New Scenario"
-        self.recording = ""
         self.current_scenario_time = 0
         self.recording_start_time = 0
+        self.previous_frame = None
+        self.frames_since_keyframe = 0
+        self.session_start_time = 0
+        self.manifest_segments = []
 
     def start_recording(self, scenario: Scenario):
         self.reset()
         self.scenario_name = scenario.name
         self.current_scenario_time = scenario.current_time
         self.recording_start_time = scenario.current_time
+        self.session_start_time = scenario.current_time
+
+    def get_segment_path(
+        self, recording_start_time_unix: int, recording_end_time_unix: Optional[int]
+    ) -> str:
+        suffix = unix_to_local_time(recording_start_time_unix, separator="")
+        if recording_end_time_unix is not None:
+            suffix += " - " + unix_to_local_time(recording_end_time_unix, separator="")
+        extension = RECORDING_EXTENSIONS[self.compression]
+        return f"{self.recording_export_path}/{self.scenario_name} Recording {suffix}{extension}"
+
+    def open_segment(self) -> None:
+        # frames stream into a .part file, renamed once the segment's end is known
+        self.segment_path = (
+            self.get_segment_path(self.recording_start_time, None) + IN_PROGRESS_SUFFIX
+        )
+        self.segment_file = open(self.segment_path, "wb", buffering=WRITE_BUFFER_SIZE)
+        self.segment_bytes = 0
+        self.segment_index = {
+            "times": [],
+            "offsets": [],
+            "keyframes": [],
+            "compressedOffsets": self.compression == "gzip",
+        }
+        self.open_segment_stream()
+
+    def open_segment_stream(self) -> None:
+        # gzip segments are a series of independent members, each starting at a
+        # keyframe, so readers can seek straight to one. xz segments are kept whole,
+        # as restarting the stream costs them much of their compression, so seeking
+        # in them decompresses everything before the frame.
+        self.stream_offset = self.segment_file.tell()
+        self.stream_frames = 0
+        if self.compression == "gzip":
+            self.segment_stream = gzip.GzipFile(fileobj=self.segment_file, mode="wb")
+        elif self.compression == "lzma":
+            self.segment_stream = lzma.LZMAFile(self.segment_file, mode="wb")
+        else:
+            self.segment_stream = self.segment_file
+
+    def close_segment(self) -> None:
+        if self.segment_stream is not self.segment_file:
+            self.segment_stream.close()
+        self.segment_file.close()
+        self.segment_path = None
+        self.segment_file = None
+        self.segment_stream = None
+        self.segment_bytes = 0
+
+    def flush(self) -> None:
+        if self.segment_stream is not None:
+            self.segment_stream.flush()
+            self.segment_file.flush()
+
+    def get_manifest_path(self) -> str:
+        session_start = unix_to_local_time(self.session_start_time, separator="")
+        return f"{self.recording_export_path}/{self.scenario_name} Recording {session_start}{MANIFEST_SUFFIX}"
+
+    def write_json(self, file_path: str, value: dict) -> None:
+        # written to a temporary file first so readers never see a partial file
+        with open(file_path + IN_PROGRESS_SUFFIX, "w", encoding="utf-8") as file:
+            json.dump(value, file, separators=(",", ":"))
+        os.replace(file_path + IN_PROGRESS_SUFFIX, file_path)
 
-    def record_step(self, current_step: str, current_scenario_time: int):
-        self.recording += current_step + "\n"
-        if len(self.recording) > CHARACTER_LIMIT:
+    def write_manifest(self) -> None:
+        self.write_json(
+            self.get_manifest_path(),
+            {
+                "version": RECORDING_FORMAT_VERSION,
+                "scenarioName": self.scenario_name,
+                "compression": self.compression,
+                "deltaEncoding": self.delta_encoding,
+                "recordEverySeconds": self.record_every_seconds,
+                "segments": self.manifest_segments,
+            },
+        )
+
+    def record_step(
+        self, current_step: str, current_scenario_time: int, is_keyframe: bool = True
+    ):
+        line = current_step.encode("utf-8")
+        separator = b"\n"
+        if self.segment_stream is None:
+            self.open_segment()
+            separator = b""
+        elif (
+            self.compression == "gzip"
+            and is_keyframe
+            and self.stream_frames >= self.keyframe_interval
+        ):
+            # the previous stream keeps the line break so the frames still split
+            # into lines once the streams are decompressed back to back
+            self.segment_stream.write(separator)
+            self.segment_stream.close()
+            self.segment_bytes += len(separator)
+            self.open_segment_stream()
+            separator = b""
+        if self.compression == "gzip":
+            offset = self.stream_offset
+        else:
+            offset = self.segment_bytes + len(separator)
+        self.segment_index["times"].append(current_scenario_time)
+        self.segment_index["offsets"].append(offset)
+        self.segment_index["keyframes"].append(is_keyframe)
+        self.segment_stream.write(separator + line)
+        self.segment_bytes += len(separator) + len(line)
+        self.stream_frames += 1
+        if self.segment_bytes > self.segment_size_limit_bytes:
             self.export_recording(current_scenario_time, self.recording_start_time)
-            self.recording_start_time = current_scenario_time
-            self.recording = ""
+
+    def record_frame(self, export_object: dict, current_scenario_time: int):
+        recording_delta = None
+        if (
+            self.previous_frame is not None
+            and self.frames_since_keyframe < self.keyframe_interval
+        ):
+            recording_delta = get_recording_delta(self.previous_frame, export_object)
+        if recording_delta is None:
+            frame = make_keyframe(export_object, current_scenario_time)
+            self.frames_since_keyframe = 0
+        else:
+            frame = make_delta_frame(recording_delta, current_scenario_time)
+        self.frames_since_keyframe += 1
+        # the scenario is serialized afresh for every frame, but the other entries,
+        # such as the map view, are live objects that may change in place
+        self.previous_frame = {
+            key: value if key == SCENARIO_KEY else deepcopy(value)
+            for key, value in export_object.items()
+        }
+        self.record_step(
+            json.dumps(frame, separators=(",", ":")),
+            current_scenario_time,
+            is_keyframe=recording_delta is None,
+        )
 
     def export_recording(
         self,
         recording_end_time_unix: int,
         recording_start_time_unix: Optional[int] = None,
     ):
-        if not self.recording:
+        if self.segment_stream is None:
             return
 
         if recording_start_time_unix is None:
             recording_start_time_unix = self.recording_start_time
 
-        formatted_recording_start_time = unix_to_local_time(
-            recording_start_time_unix, separator=""
+        segment_path = self.segment_path
+        segment_index = self.segment_index
+        self.close_segment()
+        filename = self.get_segment_path(
+            recording_start_time_unix, recording_end_time_unix
         )
-        formatted_recording_end_time = unix_to_local_time(
-            recording_end_time_unix, separator=""
+        os.replace(segment_path, filename)
+        self.write_json(filename + INDEX_SUFFIX, segment_index)
+        self.manifest_segments.append(
+            {
+                "file": os.path.basename(filename),
+                "index": os.path.basename(filename) + INDEX_SUFFIX,
+                "startTime": segment_index["times"][0],
+                "endTime": segment_index["times"][-1],
+                "frames": len(segment_index["times"]),
+            }
         )
-        suffix = f"{formatted_recording_start_time} - {formatted_recording_end_time}"
-
-        filename = f"{self.recording_export_path}/{self.scenario_name} Recording {suffix}.jsonl"
-
-        with open(filename, "w", encoding="utf-8") as file:
-            file.write(self.recording.rstrip("\n"))
+        self.write_manifest()
+        self.recording_start_time = recording_end_time_unix
+        # every exported segment starts with a keyframe so it can be read alone
+        self.previous_frame = None
 
         print(f"Recording exported to '{filename}'")
 
@@ -0,0 +1,142 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+PROFILER_COUNTERS = (
+    "pair_checks",
+    "detection_tests",
+    "weapon_launches",
+    "entity_removals",
+    "geodesy_calls",
+)
+DEFAULT_MAX_TRACE_EVENTS = 1_000_000
+
+_DISABLED_PHASE = nullcontext()
+_active_profiler: Optional["Profiler"] = None
+
+
+def profile_count(counter: str, amount: int = 1) -> None:
+    if _active_profiler is not None:
+        _active_profiler.counters[counter] += amount
+
+
+class Profiler:
+
+    def __init__(
+        self, enabled: bool = False, max_trace_events: int = DEFAULT_MAX_TRACE_EVENTS
+    ) -> None:
+        self.enabled = enabled
+        self.max_trace_events = max_trace_events
+        self.reset()
+
+    def reset(self) -> None:
+        self.counters: defaultdict[str, int] = defaultdict(int)
+        for counter in PROFILER_COUNTERS:
+            self.counters[counter] = 0
+        self.phase_calls: defaultdict[str, int] = defaultdict(int)
+        self.phase_seconds: defaultdict[str, float] = defaultdict(float)
+        self.phase_max_seconds: defaultdict[str, float] = defaultdict(float)
+        self.last_tick_phase_seconds: dict[str, float] = {}
+        self.trace_events: list[dict] = []
+        self.start_time_ns = time.perf_counter_ns()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def activate(self):
+        if not self.enabled:
+            return _DISABLED_PHASE
+        return self._activate()
+
+    @contextmanager
+    def _activate(self):
+        global _active_profiler
+        previous_profiler = _active_profiler
+        _active_profiler = self
+        self.last_tick_phase_seconds = {}
+        try:
+            yield self
+        finally:
+            _active_profiler = previous_profiler
+            self._add_counter_event()
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _DISABLED_PHASE
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name: str):
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end_ns = time.perf_counter_ns()
+            seconds = (end_ns - start_ns) / 1e9
+            self.phase_calls[name] += 1
+            self.phase_seconds[name] += seconds
+            self.phase_max_seconds[name] = max(self.phase_max_seconds[name], seconds)
+            self.last_tick_phase_seconds[name] = (
+                self.last_tick_phase_seconds.get(name, 0.0) + seconds
+            )
+            self._add_trace_event(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start_ns - self.start_time_ns) / 1000,
+                    "dur": (end_ns - start_ns) / 1000,
+                    "pid": 0,
+                    "tid": 0,
+                }
+            )
+
+    def _add_counter_event(self) -> None:
+        self._add_trace_event(
+            {
+                "name": "counters",
+                "ph": "C",
+                "ts": (time.perf_counter_ns() - self.start_time_ns) / 1000,
+                "pid": 0,
+                "tid": 0,
+                "args": dict(self.counters),
+            }
+        )
+
+    def _add_trace_event(self, event: dict) -> None:
+        if len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append(event)
+
+    def get_counters(self) -> dict[str, int]:
+        return dict(self.counters)
+
+    def get_stats(self) -> dict:
+        return {
+            "phases": {
+                name: {
+                    "calls": calls,
+                    "total_seconds": self.phase_seconds[name],
+                    "mean_seconds": self.phase_seconds[name] / calls,
+                    "max_seconds": self.phase_max_seconds[name],
+                }
+                for name, calls in self.phase_calls.items()
+            },
+            "counters": self.get_counters(),
+        }
+
+    def get_info(self) -> dict:
+        return {
+            "counters": self.get_counters(),
+            "phase_seconds": dict(self.last_tick_phase_seconds),
+        }
+
+    def get_chrome_trace(self) -> dict:
+        return {"traceEvents": list(self.trace_events), "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, file_path: str) -> None:
+        with open(file_path, "w") as trace_file:
+            json.dump(self.get_chrome_trace(), trace_file)
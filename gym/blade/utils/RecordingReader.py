@@ -0,0 +1,175 @@
+import os
+import gzip
+import json
+import lzma
+from bisect import bisect_left, bisect_right
+from typing import BinaryIO, Iterator, Optional
+from blade.utils.recordingDelta import KEYFRAME, DELTA, apply_recording_delta
+from blade.utils.PlaybackRecorder import (
+    IN_PROGRESS_SUFFIX,
+    INDEX_SUFFIX,
+    MANIFEST_SUFFIX,
+)
+
+
+def open_recording_segment(file_path: str, raw_file: BinaryIO) -> BinaryIO:
+    extension_path = file_path.removesuffix(IN_PROGRESS_SUFFIX)
+    if extension_path.endswith(".gz"):
+        return gzip.GzipFile(fileobj=raw_file, mode="rb")
+    elif extension_path.endswith(".xz"):
+        return lzma.LZMAFile(raw_file, mode="rb")
+    return raw_file
+
+
+def get_frame_time(record: dict) -> int:
+    if "frameType" in record:
+        return record["time"]
+    return record["currentScenario"]["currentTime"]
+
+
+class RecordingReader:
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.manifest: Optional[dict] = None
+        if file_path.endswith(MANIFEST_SUFFIX):
+            with open(file_path, "r", encoding="utf-8") as manifest_file:
+                self.manifest = json.load(manifest_file)
+            folder = os.path.dirname(file_path)
+            self.segment_paths = [
+                os.path.join(folder, segment["file"])
+                for segment in self.manifest["segments"]
+            ]
+        else:
+            self.segment_paths = [file_path]
+        self.segment_indexes: dict[str, dict[str, list]] = {}
+
+    def get_segment_index(self, segment_path: str) -> dict[str, list]:
+        segment_index = self.segment_indexes.get(segment_path)
+        if segment_index is not None:
+            return segment_index
+        if os.path.exists(segment_path + INDEX_SUFFIX):
+            with open(segment_path + INDEX_SUFFIX, "r", encoding="utf-8") as index_file:
+                segment_index = json.load(index_file)
+        else:
+            # segments without a sidecar (e.g. cut short by a crash) are indexed by
+            # scanning them once
+            segment_index = {"times": [], "offsets": [], "keyframes": []}
+            offset = 0
+            with open(segment_path, "rb") as raw_file, open_recording_segment(
+                segment_path, raw_file
+            ) as segment_file:
+                for line in segment_file:
+                    if line.strip():
+                        record = json.loads(line)
+                        segment_index["times"].append(get_frame_time(record))
+                        segment_index["offsets"].append(offset)
+                        segment_index["keyframes"].append(
+                            record.get("frameType") != DELTA
+                        )
+                    offset += len(line)
+        self.segment_indexes[segment_path] = segment_index
+        return segment_index
+
+    def iter_segment(
+        self, segment_path: str, offset: int = 0, compressed_offset: bool = False
+    ) -> Iterator[tuple[int, dict]]:
+        frame: Optional[dict] = None
+        with open(segment_path, "rb") as raw_file:
+            if compressed_offset:
+                raw_file.seek(offset)
+            with open_recording_segment(segment_path, raw_file) as segment_file:
+                if not compressed_offset:
+                    # without an offset into the file, seeking a compressed segment
+                    # decompresses it from the start
+                    segment_file.seek(offset)
+                for line in segment_file:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    frame_type = record.get("frameType")
+                    if frame_type == KEYFRAME:
+                        frame = record["frame"]
+                    elif frame_type == DELTA:
+                        if frame is None:
+                            raise ValueError(
+                                f"{segment_path} has a delta frame before a keyframe"
+                            )
+                        frame = apply_recording_delta(frame, record["delta"])
+                    else:
+                        # recordings made without delta encoding hold a full export
+                        # a line
+                        frame = record
+                    yield get_frame_time(record), frame
+
+    def iter_timed_frames(
+        self, start_time: Optional[int] = None
+    ) -> Iterator[tuple[int, dict]]:
+        for segment_path in self.segment_paths:
+            if start_time is None:
+                yield from self.iter_segment(segment_path)
+                continue
+            segment_index = self.get_segment_index(segment_path)
+            frame_index = bisect_left(segment_index["times"], start_time)
+            if frame_index == len(segment_index["times"]):
+                continue
+            keyframe_index = self.get_keyframe_index(segment_index, frame_index)
+            for frame_time, frame in self.iter_segment(
+                segment_path,
+                segment_index["offsets"][keyframe_index],
+                segment_index.get("compressedOffsets", False),
+            ):
+                if frame_time >= start_time:
+                    yield frame_time, frame
+            start_time = None
+
+    def get_keyframe_index(
+        self, segment_index: dict[str, list], frame_index: int
+    ) -> int:
+        keyframes = segment_index["keyframes"]
+        while frame_index > 0 and not keyframes[frame_index]:
+            frame_index -= 1
+        # several frames share the offset of the compressed stream holding them, and
+        # reading always starts at the first of them
+        offsets = segment_index["offsets"]
+        return bisect_left(offsets, offsets[frame_index], hi=frame_index)
+
+    def __iter__(self) -> Iterator[dict]:
+        for _, frame in self.iter_timed_frames():
+            yield frame
+
+    def read_frames(self) -> list[dict]:
+        return list(self)
+
+    def get_frame(self, index: int) -> dict:
+        for frame_index, frame in enumerate(self):
+            if frame_index == index:
+                return frame
+        raise IndexError(f"{self.file_path} has no frame {index}")
+
+    def get_times(self) -> list[int]:
+        return [
+            frame_time
+            for segment_path in self.segment_paths
+            for frame_time in self.get_segment_index(segment_path)["times"]
+        ]
+
+    def seek(self, time: int) -> Optional[dict]:
+        # returns the last frame recorded at or before the given scenario time
+        for segment_path in reversed(self.segment_paths):
+            segment_index = self.get_segment_index(segment_path)
+            frame_index = bisect_right(segment_index["times"], time) - 1
+            if frame_index < 0:
+                continue
+            keyframe_index = self.get_keyframe_index(segment_index, frame_index)
+            frames = self.iter_segment(
+                segment_path,
+                segment_index["offsets"][keyframe_index],
+                segment_index.get("compressedOffsets", False),
+            )
+            for _ in range(frame_index - keyframe_index):
+                next(frames)
+            frame = next(frames)[1]
+            frames.close()
+            return frame
+        return None
@@ -0,0 +1,142 @@
+import json
+from typing import Callable, TextIO
+from blade.Scenario import Scenario
+from blade.utils.serialization import COLLECTION_DECODERS, deserialize_scenario
+
+READ_CHUNK_SIZE = 1024 * 1024
+WHITESPACE = " \t\n\r"
+
+
+class ScenarioStreamReader:
+
+    # walks the export object incrementally: entity arrays of the scenario are
+    # decoded one element at a time and materialised immediately, so only one
+    # entity's dict and a chunk of text are alive on top of the objects built so far
+    def __init__(self, scenario_file: TextIO, chunk_size: int = READ_CHUNK_SIZE):
+        self.scenario_file = scenario_file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.end_of_file = False
+
+    def read_chunk(self, minimum_size: int = 0) -> bool:
+        if self.end_of_file:
+            return False
+        if self.position > 0:
+            self.buffer = self.buffer[self.position :]
+            self.position = 0
+        chunk = self.scenario_file.read(max(self.chunk_size, minimum_size))
+        if not chunk:
+            self.end_of_file = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.position < len(self.buffer):
+                if self.buffer[self.position] not in WHITESPACE:
+                    return self.buffer[self.position]
+                self.position += 1
+            if not self.read_chunk():
+                raise ValueError("Unexpected end of scenario file")
+
+    def expect(self, character: str) -> None:
+        if self.peek() != character:
+            raise ValueError(
+                f"Expected '{character}' in scenario file, found '{self.peek()}'"
+            )
+        self.position += 1
+
+    def read_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # a value that ends with the buffer may be a truncated number
+                if end < len(self.buffer) or self.end_of_file:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.end_of_file:
+                    raise
+            # grow geometrically so an entity larger than a chunk is not re-parsed
+            # once per chunk
+            self.read_chunk(len(self.buffer) - self.position)
+
+    def read_object(self, read_item: Callable[[str], None]) -> None:
+        self.expect("{")
+        if self.peek() == "}":
+            self.position += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            read_item(key)
+            if self.peek() == "}":
+                self.position += 1
+                return
+            self.expect(",")
+
+    def read_array(self, read_element: Callable[[], None]) -> None:
+        self.expect("[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        while True:
+            read_element()
+            if self.peek() == "]":
+                self.position += 1
+                return
+            self.expect(",")
+
+    def read_entities(self, decode_entity: Callable) -> list:
+        if self.peek() != "[":
+            value = self.read_value()
+            return [decode_entity(entity) for entity in value] if value else []
+        entities = []
+        self.read_array(lambda: entities.append(decode_entity(self.read_value())))
+        return entities
+
+    def read_scenario(self) -> Scenario:
+        saved_scenario = {}
+        collections = {}
+
+        def read_item(key: str) -> None:
+            if key in COLLECTION_DECODERS:
+                collections[key] = self.read_entities(COLLECTION_DECODERS[key])
+            else:
+                saved_scenario[key] = self.read_value()
+
+        self.read_object(read_item)
+        return deserialize_scenario(saved_scenario, collections)
+
+    def read(self) -> tuple[dict, Scenario]:
+        import_object = {}
+        scenario = None
+
+        def read_item(key: str) -> None:
+            nonlocal scenario
+            if key == "currentScenario":
+                scenario = self.read_scenario()
+            else:
+                import_object[key] = self.read_value()
+
+        self.read_object(read_item)
+        if scenario is None:
+            raise KeyError("currentScenario")
+        return import_object, scenario
+
+
+def read_scenario_stream(
+    scenario_file: TextIO, chunk_size: int = READ_CHUNK_SIZE
+) -> tuple[dict, Scenario]:
+    return ScenarioStreamReader(scenario_file, chunk_size).read()
+
+
+def read_scenario_file(
+    file_path: str, chunk_size: int = READ_CHUNK_SIZE
+) -> tuple[dict, Scenario]:
+    with open(file_path, "r", encoding="utf-8") as scenario_file:
+        return read_scenario_stream(scenario_file, chunk_size)
@@ -0,0 +1,183 @@
+import os
+import numpy as np
+from typing import Optional
+from blade.utils.RecordingReader import RecordingReader
+
+TRAJECTORY_COLLECTIONS = {
+    "aircraft": "aircraft",
+    "ships": "ship",
+    "facilities": "facility",
+    "airbases": "airbase",
+    "weapons": "weapon",
+}
+UNIT_ARRAYS = ("unit_ids", "unit_names", "unit_types", "unit_side_ids", "offsets")
+SAMPLE_ARRAYS = ("times", "latitude", "longitude", "heading", "fuel", "alive")
+
+
+class TrajectoryStore:
+
+    # samples are stored unit by unit and ordered by time, so a unit's track is the
+    # slice offsets[unit_index]:offsets[unit_index + 1]. A unit that disappears from
+    # the recording gets one last sample at the time it was gone with alive False.
+    def __init__(self, arrays: dict[str, np.ndarray]) -> None:
+        self.arrays = arrays
+        self.unit_indices = {
+            unit_id: unit_index
+            for unit_index, unit_id in enumerate(arrays["unit_ids"].tolist())
+        }
+
+    @classmethod
+    def from_recording(cls, recording_path: str) -> "TrajectoryStore":
+        unit_indices: dict[str, int] = {}
+        unit_names: list[str] = []
+        unit_types: list[str] = []
+        unit_side_ids: list[str] = []
+        samples: dict[str, list] = {name: [] for name in SAMPLE_ARRAYS}
+        sample_units: list[int] = []
+        last_samples: dict[int, tuple] = {}
+
+        for frame_time, frame in RecordingReader(recording_path).iter_timed_frames():
+            scenario = frame["currentScenario"]
+            frame_samples = {}
+            for collection, unit_type in TRAJECTORY_COLLECTIONS.items():
+                for unit in scenario.get(collection, []):
+                    unit_index = unit_indices.get(unit["id"])
+                    if unit_index is None:
+                        unit_index = len(unit_indices)
+                        unit_indices[unit["id"]] = unit_index
+                        unit_names.append(unit.get("name", ""))
+                        unit_types.append(unit_type)
+                        unit_side_ids.append(unit.get("sideId", ""))
+                    frame_samples[unit_index] = (
+                        unit["latitude"],
+                        unit["longitude"],
+                        unit.get("heading", np.nan),
+                        unit.get("currentFuel", np.nan),
+                    )
+            for unit_index, last_sample in last_samples.items():
+                if unit_index not in frame_samples:
+                    cls.add_sample(
+                        samples,
+                        sample_units,
+                        unit_index,
+                        frame_time,
+                        last_sample,
+                        False,
+                    )
+            for unit_index, sample in frame_samples.items():
+                cls.add_sample(
+                    samples, sample_units, unit_index, frame_time, sample, True
+                )
+            last_samples = frame_samples
+
+        times = np.array(samples["times"], dtype=np.int64)
+        sample_unit_indices = np.array(sample_units, dtype=np.int64)
+        order = np.lexsort((times, sample_unit_indices))
+        arrays = {
+            "unit_ids": np.array(list(unit_indices), dtype=str),
+            "unit_names": np.array(unit_names, dtype=str),
+            "unit_types": np.array(unit_types, dtype=str),
+            "unit_side_ids": np.array(unit_side_ids, dtype=str),
+            "offsets": np.concatenate(
+                (
+                    [0],
+                    np.cumsum(
+                        np.bincount(sample_unit_indices, minlength=len(unit_indices))
+                    ),
+                )
+            ).astype(np.int64),
+            "times": times[order],
+        }
+        for name in ("latitude", "longitude", "heading", "fuel"):
+            arrays[name] = np.array(samples[name], dtype=np.float64)[order]
+        arrays["alive"] = np.array(samples["alive"], dtype=bool)[order]
+        return cls(arrays)
+
+    @staticmethod
+    def add_sample(
+        samples: dict[str, list],
+        sample_units: list[int],
+        unit_index: int,
+        frame_time: int,
+        sample: tuple,
+        alive: bool,
+    ) -> None:
+        sample_units.append(unit_index)
+        samples["times"].append(frame_time)
+        samples["latitude"].append(sample[0])
+        samples["longitude"].append(sample[1])
+        samples["heading"].append(sample[2])
+        samples["fuel"].append(sample[3])
+        samples["alive"].append(alive)
+
+    def save(self, path: str) -> None:
+        # a .npz path writes a single archive, anything else a directory of .npy
+        # files that load() memory-maps
+        if path.endswith(".npz"):
+            np.savez(path, **self.arrays)
+            return
+        os.makedirs(path, exist_ok=True)
+        for name, array in self.arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+    @classmethod
+    def load(cls, path: str) -> "TrajectoryStore":
+        if path.endswith(".npz"):
+            with np.load(path) as archive:
+                return cls({name: archive[name] for name in archive.files})
+        return cls(
+            {
+                name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                for name in UNIT_ARRAYS + SAMPLE_ARRAYS
+            }
+        )
+
+    def get_unit_ids(
+        self, unit_type: Optional[str] = None, side_id: Optional[str] = None
+    ) -> list[str]:
+        mask = np.ones(len(self.arrays["unit_ids"]), dtype=bool)
+        if unit_type is not None:
+            mask &= self.arrays["unit_types"] == unit_type
+        if side_id is not None:
+            mask &= self.arrays["unit_side_ids"] == side_id
+        return self.arrays["unit_ids"][mask].tolist()
+
+    def get_unit_index(self, unit_id: str) -> int:
+        return self.unit_indices[unit_id]
+
+    def get_unit_track(
+        self,
+        unit_id: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+    ) -> dict[str, np.ndarray]:
+        unit_index = self.get_unit_index(unit_id)
+        start = int(self.arrays["offsets"][unit_index])
+        stop = int(self.arrays["offsets"][unit_index + 1])
+        times = self.arrays["times"][start:stop]
+        if start_time is not None:
+            start += int(np.searchsorted(times, start_time, side="left"))
+        if end_time is not None:
+            stop = int(self.arrays["offsets"][unit_index]) + int(
+                np.searchsorted(times, end_time, side="right")
+            )
+        return {name: self.arrays[name][start:stop] for name in SAMPLE_ARRAYS}
+
+    def get_time_window(
+        self, start_time: int, end_time: int
+    ) -> dict[str, np.ndarray]:
+        times = self.arrays["times"]
+        sample_indices = np.flatnonzero((times >= start_time) & (times <= end_time))
+        window = {name: self.arrays[name][sample_indices] for name in SAMPLE_ARRAYS}
+        window["unit_index"] = (
+            np.searchsorted(self.arrays["offsets"], sample_indices, side="right") - 1
+        )
+        return window
+
+
+def convert_recording_to_trajectory_store(
+    recording_path: str, output_path: str
+) -> TrajectoryStore:
+    trajectory_store = TrajectoryStore.from_recording(recording_path)
+    trajectory_store.save(output_path)
+    return trajectory_store
@@ -0,0 +1,106 @@
+import numpy as np
+
+DEFAULT_CAPACITY = 64
+
+_UNSET = object()
+
+
+class StateField:
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, unit, owner=None):
+        if unit is None:
+            return self
+        value = unit.__dict__.get(self.name, _UNSET)
+        if value is _UNSET:
+            return unit._state_store.get(unit._state_slot, self.name)
+        return value
+
+    def __set__(self, unit, value):
+        store = unit.__dict__.get("_state_store")
+        if store is None:
+            unit.__dict__[self.name] = value
+        else:
+            store.set(unit._state_slot, self.name, value)
+
+
+class UnitStateStore:
+
+    def __init__(self, fields: tuple[str, ...], capacity: int = DEFAULT_CAPACITY):
+        self.fields = fields
+        self.capacity = max(capacity, 1)
+        self.columns: dict[str, np.ndarray] = {
+            field: np.zeros(self.capacity, dtype=np.float64) for field in fields
+        }
+        self.units: list = [None] * self.capacity
+        self.free_slots: list[int] = []
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size - len(self.free_slots)
+
+    def get(self, slot: int, field: str) -> float:
+        return self.columns[field].item(slot)
+
+    def set(self, slot: int, field: str, value: float) -> None:
+        self.columns[field][slot] = value
+
+    def get_column(self, field: str) -> np.ndarray:
+        return self.columns[field][: self.size]
+
+    def get_slots(self, units: list) -> np.ndarray:
+        return np.fromiter(
+            (unit._state_slot for unit in units), dtype=np.intp, count=len(units)
+        )
+
+    def _grow(self) -> None:
+        new_capacity = self.capacity * 2
+        for field in self.fields:
+            column = np.zeros(new_capacity, dtype=np.float64)
+            column[: self.capacity] = self.columns[field]
+            self.columns[field] = column
+        self.units.extend([None] * (new_capacity - self.capacity))
+        self.capacity = new_capacity
+
+    def attach(self, unit) -> int:
+        if unit.__dict__.get("_state_store") is not None:
+            raise ValueError(f"Unit {unit.id} is already attached to a state store")
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            slot = self.size
+            self.size += 1
+        for field in self.fields:
+            self.columns[field][slot] = unit.__dict__.pop(field)
+        unit._state_store = self
+        unit._state_slot = slot
+        self.units[slot] = unit
+        return slot
+
+    def detach(self, unit) -> None:
+        if unit.__dict__.get("_state_store") is not self:
+            return
+        slot = unit._state_slot
+        for field in self.fields:
+            unit.__dict__[field] = self.columns[field].item(slot)
+        unit._state_store = None
+        unit._state_slot = -1
+        self.units[slot] = None
+        self.free_slots.append(slot)
+
+    def compact(self) -> None:
+        units = [unit for unit in self.units[: self.size] if unit is not None]
+        slots = self.get_slots(units)
+        for field in self.fields:
+            self.columns[field][: len(units)] = self.columns[field][slots]
+        for slot, unit in enumerate(units):
+            unit._state_slot = slot
+            self.units[slot] = unit
+        for slot in range(len(units), self.size):
+            self.units[slot] = None
+        self.size = len(units)
+        self.free_slots = []
@@ -0,0 +1,125 @@
+import numpy as np
+from enum import IntEnum
+from typing import Iterable, Iterator
+
+
+class ActionType(IntEnum):
+    NOOP = 0
+    MOVE_AIRCRAFT = 1
+    MOVE_SHIP = 2
+    AIRCRAFT_ATTACK = 3
+    SHIP_ATTACK = 4
+    AIRCRAFT_RETURN_TO_BASE = 5
+    LAUNCH_AIRCRAFT_FROM_AIRBASE = 6
+    LAUNCH_AIRCRAFT_FROM_SHIP = 7
+    LAND_AIRCRAFT = 8
+    REMOVE_AIRCRAFT = 9
+    ADD_REFERENCE_POINT = 10
+    REMOVE_REFERENCE_POINT = 11
+    CREATE_PATROL_MISSION = 12
+    UPDATE_PATROL_MISSION = 13
+    CREATE_STRIKE_MISSION = 14
+    UPDATE_STRIKE_MISSION = 15
+    DELETE_MISSION = 16
+
+
+ACTION_METHODS = {
+    ActionType.MOVE_AIRCRAFT: "move_aircraft",
+    ActionType.MOVE_SHIP: "move_ship",
+    ActionType.AIRCRAFT_ATTACK: "handle_aircraft_attack",
+    ActionType.SHIP_ATTACK: "handle_ship_attack",
+    ActionType.AIRCRAFT_RETURN_TO_BASE: "aircraft_return_to_base",
+    ActionType.LAUNCH_AIRCRAFT_FROM_AIRBASE: "launch_aircraft_from_airbase",
+    ActionType.LAUNCH_AIRCRAFT_FROM_SHIP: "launch_aircraft_from_ship",
+    ActionType.LAND_AIRCRAFT: "land_aicraft",
+    ActionType.REMOVE_AIRCRAFT: "remove_aircraft",
+    ActionType.ADD_REFERENCE_POINT: "add_reference_point",
+    ActionType.REMOVE_REFERENCE_POINT: "remove_reference_point",
+    ActionType.CREATE_PATROL_MISSION: "create_patrol_mission",
+    ActionType.UPDATE_PATROL_MISSION: "update_patrol_mission",
+    ActionType.CREATE_STRIKE_MISSION: "create_strike_mission",
+    ActionType.UPDATE_STRIKE_MISSION: "update_strike_mission",
+    ActionType.DELETE_MISSION: "delete_mission",
+}
+
+ID_LENGTH = 64
+ACTION_DTYPE = np.dtype(
+    [
+        ("action_type", np.int16),
+        ("unit_id", f"U{ID_LENGTH}"),
+        ("target_id", f"U{ID_LENGTH}"),
+        ("weapon_id", f"U{ID_LENGTH}"),
+        ("quantity", np.int32),
+        ("latitude", np.float64),
+        ("longitude", np.float64),
+        ("name", f"U{ID_LENGTH}"),
+    ]
+)
+
+MOVE_ACTIONS = (ActionType.MOVE_AIRCRAFT, ActionType.MOVE_SHIP)
+ATTACK_ACTIONS = (ActionType.AIRCRAFT_ATTACK, ActionType.SHIP_ATTACK)
+UNIT_ACTIONS = (
+    ActionType.AIRCRAFT_RETURN_TO_BASE,
+    ActionType.LAUNCH_AIRCRAFT_FROM_AIRBASE,
+    ActionType.LAUNCH_AIRCRAFT_FROM_SHIP,
+    ActionType.LAND_AIRCRAFT,
+    ActionType.REMOVE_AIRCRAFT,
+    ActionType.REMOVE_REFERENCE_POINT,
+    ActionType.DELETE_MISSION,
+)
+
+
+def make_action_records(size: int) -> np.ndarray:
+    return np.zeros(size, dtype=ACTION_DTYPE)
+
+
+def get_record_arguments(record: tuple) -> tuple:
+    # records hold one waypoint and no lists, so mission actions need the tuple form
+    action_type, unit_id, target_id, weapon_id, quantity, latitude, longitude, name = (
+        record
+    )
+    if action_type in MOVE_ACTIONS:
+        return unit_id, [[latitude, longitude]]
+    elif action_type in ATTACK_ACTIONS:
+        return unit_id, target_id, weapon_id, quantity
+    elif action_type in UNIT_ACTIONS:
+        return (unit_id,)
+    elif action_type == ActionType.ADD_REFERENCE_POINT:
+        return name, latitude, longitude
+    raise ValueError(f"Action type {action_type} cannot be given as a record")
+
+
+def is_single_action(action) -> bool:
+    # a tuple or list led by its action type is one action, any other sequence is
+    # a batch of actions
+    return (
+        isinstance(action, (tuple, list))
+        and len(action) > 0
+        and isinstance(action[0], (int, np.integer))
+    )
+
+
+def iter_actions(action) -> Iterator[str | tuple[int, tuple]]:
+    # yields source strings for the exec compatibility path and (action type,
+    # arguments) pairs for everything else; batches may mix both forms
+    if action is None:
+        return
+    elif isinstance(action, str):
+        if action:
+            yield action
+    elif isinstance(action, (np.ndarray, np.void)) and action.dtype.names:
+        records = [action.item()] if action.ndim == 0 else action.ravel().tolist()
+        for record in records:
+            if record[0] != ActionType.NOOP:
+                yield record[0], get_record_arguments(record)
+    elif is_single_action(action):
+        if action[0] != ActionType.NOOP:
+            yield action[0], action[1:]
+    elif isinstance(action, Iterable):
+        for sub_action in action:
+            yield from iter_actions(sub_action)
+    else:
+        raise ValueError(
+            f"Unsupported action {action!r}: expected a source string, a tuple or "
+            "list led by its ActionType, action records, or a sequence of these"
+        )
@@ -0,0 +1,152 @@
+from typing import Optional
+
+KEYFRAME = "keyframe"
+DELTA = "delta"
+SCENARIO_KEY = "currentScenario"
+
+
+def is_entity_list(value) -> bool:
+    return isinstance(value, list) and all(
+        isinstance(item, dict) and "id" in item for item in value
+    )
+
+
+def get_entity_list_delta(previous: list[dict], current: list[dict]) -> Optional[dict]:
+    previous_entities = {entity["id"]: entity for entity in previous}
+    current_ids = [entity["id"] for entity in current]
+    if len(previous_entities) != len(previous) or len(set(current_ids)) != len(
+        current_ids
+    ):
+        return None
+
+    added = []
+    changed = {}
+    current_id_set = set(current_ids)
+    removed = [
+        entity_id for entity_id in previous_entities if entity_id not in current_id_set
+    ]
+    for entity in current:
+        previous_entity = previous_entities.get(entity["id"])
+        if previous_entity is None:
+            added.append(entity)
+        elif previous_entity != entity:
+            entity_delta = get_dict_delta(previous_entity, entity)
+            if entity_delta is None:
+                # a different set of fields is sent as a removal plus an addition
+                removed.append(entity["id"])
+                added.append(entity)
+            else:
+                changed[entity["id"]] = entity_delta
+
+    list_delta = {}
+    if removed:
+        list_delta["removed"] = removed
+    if changed:
+        list_delta["changed"] = changed
+    if added:
+        list_delta["added"] = added
+    removed_ids = set(removed)
+    added_ids = [entity["id"] for entity in added]
+    expected_ids = [
+        entity["id"] for entity in previous if entity["id"] not in removed_ids
+    ] + added_ids
+    if expected_ids != current_ids:
+        list_delta["order"] = current_ids
+    return list_delta
+
+
+def apply_entity_list_delta(previous: list[dict], list_delta: dict) -> list[dict]:
+    removed = set(list_delta.get("removed", ()))
+    changed = list_delta.get("changed", {})
+    entities = []
+    for entity in previous:
+        if entity["id"] in removed:
+            continue
+        entity_delta = changed.get(entity["id"])
+        entities.append(
+            entity if entity_delta is None else apply_dict_delta(entity, entity_delta)
+        )
+    entities.extend(list_delta.get("added", ()))
+    order = list_delta.get("order")
+    if order is not None:
+        entities_by_id = {entity["id"]: entity for entity in entities}
+        entities = [entities_by_id[entity_id] for entity_id in order]
+    return entities
+
+
+def get_dict_delta(previous: dict, current: dict) -> Optional[dict]:
+    if list(previous) != list(current):
+        return None
+    fields = {}
+    collections = {}
+    for key, value in current.items():
+        previous_value = previous[key]
+        if previous_value == value:
+            continue
+        list_delta = None
+        if is_entity_list(previous_value) and is_entity_list(value):
+            list_delta = get_entity_list_delta(previous_value, value)
+        if list_delta is None:
+            fields[key] = value
+        else:
+            collections[key] = list_delta
+    dict_delta = {}
+    if fields:
+        dict_delta["fields"] = fields
+    if collections:
+        dict_delta["collections"] = collections
+    return dict_delta
+
+
+def apply_dict_delta(previous: dict, dict_delta: dict) -> dict:
+    current = {**previous, **dict_delta.get("fields", {})}
+    for key, list_delta in dict_delta.get("collections", {}).items():
+        current[key] = apply_entity_list_delta(previous[key], list_delta)
+    return current
+
+
+def get_recording_delta(previous: dict, current: dict) -> Optional[dict]:
+    if list(previous) != list(current) or SCENARIO_KEY not in current:
+        return None
+    export_delta = get_dict_delta(
+        {key: value for key, value in previous.items() if key != SCENARIO_KEY},
+        {key: value for key, value in current.items() if key != SCENARIO_KEY},
+    )
+    scenario_delta = get_dict_delta(previous[SCENARIO_KEY], current[SCENARIO_KEY])
+    if export_delta is None or scenario_delta is None:
+        return None
+    recording_delta = {}
+    if export_delta:
+        recording_delta["export"] = export_delta
+    if scenario_delta:
+        recording_delta["scenario"] = scenario_delta
+    return recording_delta
+
+
+def apply_recording_delta(previous: dict, recording_delta: dict) -> dict:
+    current = (
+        apply_dict_delta(previous, recording_delta["export"])
+        if "export" in recording_delta
+        else dict(previous)
+    )
+    if "scenario" in recording_delta:
+        current[SCENARIO_KEY] = apply_dict_delta(
+            previous[SCENARIO_KEY], recording_delta["scenario"]
+        )
+    return current
+
+
+def make_keyframe(export_object: dict, current_scenario_time: int) -> dict:
+    return {
+        "frameType": KEYFRAME,
+        "time": current_scenario_time,
+        "frame": export_object,
+    }
+
+
+def make_delta_frame(recording_delta: dict, current_scenario_time: int) -> dict:
+    return {
+        "frameType": DELTA,
+        "time": current_scenario_time,
+        "delta": recording_delta,
+    }
@@ -0,0 +1,416 @@
+from typing import Optional
+from blade.Side import Side
+from blade.Scenario import Scenario
+from blade.Relationships import Relationships
+from blade.units.Aircraft import Aircraft
+from blade.units.Airbase import Airbase
+from blade.units.Facility import Facility
+from blade.units.ReferencePoint import ReferencePoint
+from blade.units.Ship import Ship
+from blade.units.Weapon import Weapon
+from blade.mission.PatrolMission import PatrolMission
+from blade.mission.StrikeMission import StrikeMission
+from blade.utils.colors import SIDE_COLOR
+from blade.utils.utils import to_camelcase
+
+SIDE_FIELDS = ("id", "name", "total_score", "color")
+WEAPON_FIELDS = (
+    "id",
+    "name",
+    "side_id",
+    "class_name",
+    "latitude",
+    "longitude",
+    "altitude",
+    "heading",
+    "speed",
+    "current_fuel",
+    "max_fuel",
+    "fuel_rate",
+    "range",
+    "target_id",
+    "lethality",
+    "max_quantity",
+    "current_quantity",
+    "route",
+    "side_color",
+)
+AIRCRAFT_FIELDS = (
+    "id",
+    "name",
+    "side_id",
+    "class_name",
+    "latitude",
+    "longitude",
+    "altitude",
+    "heading",
+    "speed",
+    "current_fuel",
+    "max_fuel",
+    "fuel_rate",
+    "range",
+    "route",
+    "selected",
+    "side_color",
+    "weapons",
+    "home_base_id",
+    "rtb",
+    "target_id",
+)
+SHIP_FIELDS = (
+    "id",
+    "name",
+    "side_id",
+    "class_name",
+    "latitude",
+    "longitude",
+    "altitude",
+    "heading",
+    "speed",
+    "current_fuel",
+    "max_fuel",
+    "fuel_rate",
+    "range",
+    "route",
+    "selected",
+    "side_color",
+    "weapons",
+    "aircraft",
+)
+FACILITY_FIELDS = (
+    "id",
+    "name",
+    "side_id",
+    "class_name",
+    "latitude",
+    "longitude",
+    "altitude",
+    "range",
+    "side_color",
+    "weapons",
+)
+AIRBASE_FIELDS = (
+    "id",
+    "name",
+    "side_id",
+    "class_name",
+    "latitude",
+    "longitude",
+    "altitude",
+    "side_color",
+    "aircraft",
+)
+REFERENCE_POINT_FIELDS = (
+    "id",
+    "name",
+    "side_id",
+    "latitude",
+    "longitude",
+    "altitude",
+    "side_color",
+)
+PATROL_MISSION_FIELDS = (
+    "id",
+    "name",
+    "side_id",
+    "assigned_unit_ids",
+    "assigned_area",
+    "active",
+)
+STRIKE_MISSION_FIELDS = (
+    "id",
+    "name",
+    "side_id",
+    "assigned_unit_ids",
+    "assigned_target_ids",
+    "active",
+)
+
+ENTITY_FIELDS = {
+    Side: SIDE_FIELDS,
+    Weapon: WEAPON_FIELDS,
+    Aircraft: AIRCRAFT_FIELDS,
+    Ship: SHIP_FIELDS,
+    Facility: FACILITY_FIELDS,
+    Airbase: AIRBASE_FIELDS,
+    ReferencePoint: REFERENCE_POINT_FIELDS,
+    PatrolMission: PATROL_MISSION_FIELDS,
+    StrikeMission: STRIKE_MISSION_FIELDS,
+}
+
+_camelcase_keys: dict[str, str] = {}
+
+
+def get_camelcase_key(key: str) -> str:
+    camelcase_key = _camelcase_keys.get(key)
+    if camelcase_key is None:
+        camelcase_key = to_camelcase(key) if isinstance(key, str) else key
+        _camelcase_keys[key] = camelcase_key
+    return camelcase_key
+
+
+def encode_id(value) -> str:
+    return str(value)
+
+
+def encode_ids(values: list) -> list[str]:
+    return [str(value) for value in values]
+
+
+def encode_color(value) -> str:
+    return value.value if isinstance(value, SIDE_COLOR) else value
+
+
+def encode_route(route: list) -> list[list[float]]:
+    return [list(point) for point in route]
+
+
+def encode_entities(entities: list) -> list[dict]:
+    return [serialize_entity(entity) for entity in entities]
+
+
+FIELD_ENCODERS = {
+    "id": encode_id,
+    "side_id": encode_id,
+    "home_base_id": encode_id,
+    "target_id": encode_id,
+    "assigned_unit_ids": encode_ids,
+    "assigned_target_ids": encode_ids,
+    "color": encode_color,
+    "side_color": encode_color,
+    "route": encode_route,
+    "weapons": encode_entities,
+    "aircraft": encode_entities,
+    "assigned_area": encode_entities,
+}
+
+
+# fields are sorted by their snake_case name so the key order matches the
+# sort_keys=True export the client has always received
+def build_field_table(fields: tuple[str, ...]) -> tuple:
+    return tuple(
+        (field, get_camelcase_key(field), FIELD_ENCODERS.get(field))
+        for field in sorted(fields)
+    )
+
+
+FIELD_TABLES = {
+    entity_class: build_field_table(fields)
+    for entity_class, fields in ENTITY_FIELDS.items()
+}
+
+
+def serialize_entity(entity) -> dict:
+    field_table = FIELD_TABLES.get(type(entity))
+    if field_table is None:
+        return serialize_value(entity.to_dict())
+    serialized_entity = {}
+    for field, key, encoder in field_table:
+        value = getattr(entity, field)
+        serialized_entity[key] = value if encoder is None else encoder(value)
+    return serialized_entity
+
+
+def serialize_value(value):
+    if type(value) in FIELD_TABLES:
+        return serialize_entity(value)
+    elif hasattr(value, "to_dict"):
+        return serialize_value(value.to_dict())
+    elif isinstance(value, dict):
+        return {
+            get_camelcase_key(key): serialize_value(item)
+            for key, item in sorted(value.items())
+        }
+    elif isinstance(value, (list, tuple)):
+        return [serialize_value(item) for item in value]
+    return value
+
+
+def serialize_scenario(scenario: Scenario) -> dict:
+    return {
+        get_camelcase_key(key): serialize_value(value)
+        for key, value in sorted(scenario.__dict__.items())
+        if key[0] != "_"
+    }
+
+
+_REQUIRED = object()
+
+OPTIONAL_FIELD_DEFAULTS = {
+    Aircraft: {"target_id": ""},
+    Ship: {"selected": False},
+}
+
+
+def decode_target_id(value) -> str:
+    return value if value else ""
+
+
+def decode_ids(values: list) -> list:
+    return list(values)
+
+
+def decode_route(route: list) -> list[list[float]]:
+    return [list(point) for point in route]
+
+
+def decode_weapons(weapons: list | None) -> list[Weapon]:
+    return [decode_weapon(weapon) for weapon in weapons] if weapons else []
+
+
+def decode_aircraft_list(aircraft: list | None) -> list[Aircraft]:
+    return [decode_aircraft(plane) for plane in aircraft] if aircraft else []
+
+
+def decode_reference_points(points: list) -> list[ReferencePoint]:
+    return [decode_reference_point(point) for point in points]
+
+
+FIELD_DECODERS = {
+    "route": decode_route,
+    "weapons": decode_weapons,
+    "aircraft": decode_aircraft_list,
+    "assigned_area": decode_reference_points,
+    "assigned_unit_ids": decode_ids,
+    "assigned_target_ids": decode_ids,
+}
+ENTITY_FIELD_DECODERS = {
+    Aircraft: {"target_id": decode_target_id},
+}
+
+
+def build_decode_table(entity_class: type) -> tuple:
+    optional_field_defaults = OPTIONAL_FIELD_DEFAULTS.get(entity_class, {})
+    field_decoders = {**FIELD_DECODERS, **ENTITY_FIELD_DECODERS.get(entity_class, {})}
+    return tuple(
+        (
+            field,
+            get_camelcase_key(field),
+            field_decoders.get(field),
+            optional_field_defaults.get(field, _REQUIRED),
+        )
+        for field in ENTITY_FIELDS[entity_class]
+    )
+
+
+DECODE_TABLES = {
+    entity_class: build_decode_table(entity_class) for entity_class in ENTITY_FIELDS
+}
+
+
+def decode_fields(entity_class: type, data: dict) -> dict:
+    fields = {}
+    for field, key, decoder, default in DECODE_TABLES[entity_class]:
+        if key in data:
+            value = data[key]
+            fields[field] = value if decoder is None else decoder(value)
+        elif default is _REQUIRED:
+            raise KeyError(key)
+        else:
+            fields[field] = default
+    return fields
+
+
+def decode_side(data: dict) -> Side:
+    return Side(**decode_fields(Side, data))
+
+
+def decode_weapon(data: dict) -> Weapon:
+    return Weapon(**decode_fields(Weapon, data))
+
+
+def decode_aircraft(data: dict) -> Aircraft:
+    return Aircraft(**decode_fields(Aircraft, data))
+
+
+def decode_ship(data: dict) -> Ship:
+    return Ship(**decode_fields(Ship, data))
+
+
+def decode_facility(data: dict) -> Facility:
+    return Facility(**decode_fields(Facility, data))
+
+
+def decode_airbase(data: dict) -> Airbase:
+    return Airbase(**decode_fields(Airbase, data))
+
+
+def decode_reference_point(data: dict) -> ReferencePoint:
+    return ReferencePoint(**decode_fields(ReferencePoint, data))
+
+
+def decode_mission(data: dict) -> PatrolMission | StrikeMission:
+    if "assignedArea" in data:
+        return PatrolMission(**decode_fields(PatrolMission, data))
+    return StrikeMission(**decode_fields(StrikeMission, data))
+
+
+def decode_relationship(relationship: dict | None) -> dict[str, list[str]]:
+    if not relationship:
+        return {}
+    return {side_id: list(side_ids) for side_id, side_ids in relationship.items()}
+
+
+def decode_doctrine(doctrine: dict | None) -> dict | None:
+    if doctrine is None:
+        return None
+    return {
+        side_id: dict(side_doctrine) for side_id, side_doctrine in doctrine.items()
+    }
+
+
+COLLECTION_DECODERS = {
+    "sides": decode_side,
+    "aircraft": decode_aircraft,
+    "ships": decode_ship,
+    "facilities": decode_facility,
+    "airbases": decode_airbase,
+    "weapons": decode_weapon,
+    "referencePoints": decode_reference_point,
+    "missions": decode_mission,
+}
+OPTIONAL_COLLECTIONS = ("referencePoints", "missions")
+
+
+def decode_collection(
+    saved_scenario: dict, collections: dict[str, list], key: str
+) -> list:
+    if key in collections:
+        return collections[key]
+    if key in OPTIONAL_COLLECTIONS and key not in saved_scenario:
+        return []
+    decode_entity = COLLECTION_DECODERS[key]
+    return [decode_entity(entity) for entity in saved_scenario[key] or []]
+
+
+# collections that were already decoded (e.g. while streaming the file) are passed
+# in separately from the rest of the saved scenario
+def deserialize_scenario(
+    saved_scenario: dict, collections: Optional[dict[str, list]] = None
+) -> Scenario:
+    if collections is None:
+        collections = {}
+    relationships = saved_scenario.get("relationships") or {}
+    return Scenario(
+        id=saved_scenario["id"],
+        name=saved_scenario["name"],
+        start_time=saved_scenario["startTime"],
+        current_time=saved_scenario["currentTime"],
+        duration=saved_scenario["duration"],
+        sides=decode_collection(saved_scenario, collections, "sides"),
+        time_compression=saved_scenario["timeCompression"],
+        aircraft=decode_collection(saved_scenario, collections, "aircraft"),
+        ships=decode_collection(saved_scenario, collections, "ships"),
+        facilities=decode_collection(saved_scenario, collections, "facilities"),
+        airbases=decode_collection(saved_scenario, collections, "airbases"),
+        weapons=decode_collection(saved_scenario, collections, "weapons"),
+        reference_points=decode_collection(
+            saved_scenario, collections, "referencePoints"
+        ),
+        missions=decode_collection(saved_scenario, collections, "missions"),
+        relationships=Relationships(
+            hostiles=decode_relationship(relationships.get("hostiles")),
+            allies=decode_relationship(relationships.get("allies")),
+        ),
+        doctrine=decode_doctrine(saved_scenario.get("doctrine")),
+    )
@@ -1,9 +1,13 @@
 import re
 import math
 import random
+import numpy as np
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Tuple
+from uuid import UUID, uuid4
+from numpy.typing import ArrayLike
 from blade.utils.constants import EARTH_RADIUS_KM, KILOMETERS_TO_NAUTICAL_MILES
+from blade.utils.Profiler import profile_count
 
 
 def to_radians(degrees: float) -> float:
@@ -20,6 +24,7 @@ def get_bearing_between_two_points(
     destination_latitude: float,
     destination_longitude: float,
 ) -> float:
+    profile_count("geodesy_calls")
     start_latitude = to_radians(start_latitude)
     start_longitude = to_radians(start_longitude)
     destination_latitude = to_radians(destination_latitude)
@@ -44,6 +49,7 @@ def get_distance_between_two_points(
     destination_latitude: float,
     destination_longitude: float,
 ) -> float:
+    profile_count("geodesy_calls")
     φ1 = to_radians(start_latitude)
     φ2 = to_radians(destination_latitude)
     Δφ = to_radians(destination_latitude - start_latitude)
@@ -62,6 +68,7 @@ def get_distance_between_two_points(
 def get_terminal_coordinates_from_distance_and_bearing(
     start_latitude: float, start_longitude: float, distance: float, bearing: float
 ) -> List[float]:
+    profile_count("geodesy_calls")
     bearing_in_radians = to_radians(bearing)
 
     initial_latitude = to_radians(start_latitude)
@@ -87,12 +94,25 @@ def get_terminal_coordinates_from_distance_and_bearing(
     return [final_latitude, final_longitude]
 
 
-def random_float(min_value: float, max_value: float) -> float:
-    return random.uniform(min_value, max_value)
+# functions taking an rng draw from the global random module when it is None
 
 
-def random_int(min_value: int, max_value: int) -> int:
-    return random.randint(min_value, max_value)
+def random_float(
+    min_value: float, max_value: float, rng: Optional[random.Random] = None
+) -> float:
+    return (random if rng is None else rng).uniform(min_value, max_value)
+
+
+def random_int(
+    min_value: int, max_value: int, rng: Optional[random.Random] = None
+) -> int:
+    return (random if rng is None else rng).randint(min_value, max_value)
+
+
+def random_uuid(rng: Optional[random.Random] = None) -> str:
+    if rng is None:
+        return str(uuid4())
+    return str(UUID(int=rng.getrandbits(128), version=4))
 
 
 def get_next_coordinates(
@@ -124,6 +144,153 @@ def get_next_coordinates(
     )
 
 
+def get_bearing_between_two_points_batch(
+    start_latitudes: ArrayLike,
+    start_longitudes: ArrayLike,
+    destination_latitudes: ArrayLike,
+    destination_longitudes: ArrayLike,
+) -> np.ndarray:
+    start_latitudes = np.radians(start_latitudes)
+    start_longitudes = np.radians(start_longitudes)
+    destination_latitudes = np.radians(destination_latitudes)
+    destination_longitudes = np.radians(destination_longitudes)
+
+    y = np.sin(destination_longitudes - start_longitudes) * np.cos(
+        destination_latitudes
+    )
+    x = np.cos(start_latitudes) * np.sin(destination_latitudes) - np.sin(
+        start_latitudes
+    ) * np.cos(destination_latitudes) * np.cos(
+        destination_longitudes - start_longitudes
+    )
+    bearings = (np.degrees(np.arctan2(y, x)) + 360) % 360
+    profile_count("geodesy_calls", np.size(bearings))
+
+    return bearings
+
+
+def get_distance_between_two_points_batch(
+    start_latitudes: ArrayLike,
+    start_longitudes: ArrayLike,
+    destination_latitudes: ArrayLike,
+    destination_longitudes: ArrayLike,
+) -> np.ndarray:
+    start_latitudes = np.asarray(start_latitudes, dtype=np.float64)
+    destination_latitudes = np.asarray(destination_latitudes, dtype=np.float64)
+    φ1 = np.radians(start_latitudes)
+    φ2 = np.radians(destination_latitudes)
+    Δφ = np.radians(destination_latitudes - start_latitudes)
+    Δλ = np.radians(
+        np.asarray(destination_longitudes, dtype=np.float64)
+        - np.asarray(start_longitudes, dtype=np.float64)
+    )
+
+    a = np.sin(Δφ / 2) * np.sin(Δφ / 2) + np.cos(φ1) * np.cos(φ2) * np.sin(
+        Δλ / 2
+    ) * np.sin(Δλ / 2)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    profile_count("geodesy_calls", np.size(c))
+
+    return EARTH_RADIUS_KM * c  # in kilometers
+
+
+def get_distance_matrix(
+    start_latitudes: ArrayLike,
+    start_longitudes: ArrayLike,
+    destination_latitudes: ArrayLike,
+    destination_longitudes: ArrayLike,
+) -> np.ndarray:
+    # rows are start points, columns are destination points
+    return get_distance_between_two_points_batch(
+        np.asarray(start_latitudes, dtype=np.float64)[:, np.newaxis],
+        np.asarray(start_longitudes, dtype=np.float64)[:, np.newaxis],
+        np.asarray(destination_latitudes, dtype=np.float64)[np.newaxis, :],
+        np.asarray(destination_longitudes, dtype=np.float64)[np.newaxis, :],
+    )
+
+
+def get_terminal_coordinates_from_distance_and_bearing_batch(
+    start_latitudes: ArrayLike,
+    start_longitudes: ArrayLike,
+    distances: ArrayLike,
+    bearings: ArrayLike,
+) -> Tuple[np.ndarray, np.ndarray]:
+    bearings_in_radians = np.radians(bearings)
+    angular_distances = np.asarray(distances, dtype=np.float64) / EARTH_RADIUS_KM
+
+    initial_latitudes = np.radians(start_latitudes)
+    initial_longitudes = np.radians(start_longitudes)
+
+    final_latitudes = np.arcsin(
+        np.sin(initial_latitudes) * np.cos(angular_distances)
+        + np.cos(initial_latitudes)
+        * np.sin(angular_distances)
+        * np.cos(bearings_in_radians)
+    )
+    final_longitudes = initial_longitudes + np.arctan2(
+        np.sin(bearings_in_radians)
+        * np.sin(angular_distances)
+        * np.cos(initial_latitudes),
+        np.cos(angular_distances) - np.sin(initial_latitudes) * np.sin(final_latitudes),
+    )
+    profile_count("geodesy_calls", np.size(final_latitudes))
+
+    return np.degrees(final_latitudes), np.degrees(final_longitudes)
+
+
+def get_leg_distances_batch(
+    total_distances_km: ArrayLike, platform_speeds: ArrayLike
+) -> np.ndarray:
+    # distance in km a platform covers each second on its way to a waypoint
+    total_distances_km = np.asarray(total_distances_km, dtype=np.float64)
+    platform_speeds = np.abs(np.asarray(platform_speeds, dtype=np.float64))
+    # stationary platforms stay where they are instead of dividing by zero
+    is_moving = platform_speeds > 0
+    total_time_hours = (total_distances_km * KILOMETERS_TO_NAUTICAL_MILES) / np.where(
+        is_moving, platform_speeds, 1
+    )
+    total_time_seconds = np.maximum(
+        np.floor(total_time_hours * 3600), 0.0001
+    )  # prevent divide-by-zero
+    return np.where(is_moving, total_distances_km / total_time_seconds, 0)
+
+
+def get_next_coordinates_batch(
+    origin_latitudes: ArrayLike,
+    origin_longitudes: ArrayLike,
+    destination_latitudes: ArrayLike,
+    destination_longitudes: ArrayLike,
+    platform_speeds: ArrayLike,
+) -> Tuple[np.ndarray, np.ndarray]:
+    origin_latitudes = np.asarray(origin_latitudes, dtype=np.float64)
+    origin_longitudes = np.asarray(origin_longitudes, dtype=np.float64)
+    destination_latitudes = np.asarray(destination_latitudes, dtype=np.float64)
+    destination_longitudes = np.asarray(destination_longitudes, dtype=np.float64)
+    platform_speeds = np.abs(np.asarray(platform_speeds, dtype=np.float64))
+
+    headings = get_bearing_between_two_points_batch(
+        origin_latitudes, origin_longitudes, destination_latitudes, destination_longitudes
+    )
+    total_distances_km = get_distance_between_two_points_batch(
+        origin_latitudes, origin_longitudes, destination_latitudes, destination_longitudes
+    )
+    is_moving = platform_speeds > 0
+    leg_distances_km = get_leg_distances_batch(total_distances_km, platform_speeds)
+
+    next_latitudes, next_longitudes = (
+        get_terminal_coordinates_from_distance_and_bearing_batch(
+            origin_latitudes, origin_longitudes, leg_distances_km, headings
+        )
+    )
+    overshoots = total_distances_km < leg_distances_km
+    next_latitudes = np.where(overshoots, destination_latitudes, next_latitudes)
+    next_longitudes = np.where(overshoots, destination_longitudes, next_longitudes)
+    next_latitudes = np.where(is_moving, next_latitudes, origin_latitudes)
+    next_longitudes = np.where(is_moving, next_longitudes, origin_longitudes)
+
+    return next_latitudes, next_longitudes
+
+
 def to_camelcase(s):
     return re.sub(r"(?!^)_([a-zA-Z])", lambda m: m.group(1).upper(), s)
 
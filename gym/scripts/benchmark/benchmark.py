@@ -0,0 +1,312 @@
+import os
+import sys
+import copy
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import blade
+from blade.Game import Game
+from blade.Scenario import Scenario
+from generate_load_test_scenario import generate_scenario
+
+BENCHMARK_FOLDER = os.path.dirname(os.path.abspath(__file__))
+BUNDLED_SCENARIO_FOLDER = os.path.join(os.path.dirname(blade.__file__), "scenarios")
+BUNDLED_SCENARIOS = ["SCS.json", "default_scenario.json"]
+DEFAULT_BASELINE_PATH = os.path.join(BENCHMARK_FOLDER, "baseline.json")
+DEFAULT_SIDES = [2, 4]
+DEFAULT_UNITS = [10, 25]
+DEFAULT_LARGE_UNITS = 500
+DEFAULT_STEPS = 30
+DEFAULT_REPEATS = 5
+DEFAULT_RESETS = 20
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_SEED = 0
+LOAD_TEST_LATITUDE_RANGE = 20
+LOAD_TEST_LONGITUDE_RANGE = 40
+CALIBRATION_ITERATIONS = 200_000
+HIGHER_IS_BETTER_METRICS = {
+    "steps_per_second",
+    "resets_per_second",
+    "deepcopy_resets_per_second",
+}
+# reported for comparison only, the engine no longer resets through deepcopy
+UNGATED_METRICS = {"deepcopy_resets_per_second"}
+
+
+def time_call(function, *args) -> float:
+    start_time = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start_time
+
+
+def calibration_workload() -> float:
+    # a fixed mix of the interpreter work the engine does: float math, attribute and
+    # dict access, list building
+    values = {}
+    total = 0.0
+    for index in range(CALIBRATION_ITERATIONS):
+        key = index % 1024
+        values[key] = math.sin(index) * math.cos(total) + values.get(key, 0.0) * 0.5
+        total += values[key]
+    return total
+
+
+def calibrate(repeats: int) -> float:
+    return min(time_call(calibration_workload) for _ in range(repeats))
+
+
+def get_relative_metrics(
+    metrics: dict[str, float], calibration_seconds: float
+) -> dict[str, float]:
+    # timings in units of the calibration workload, so that baselines recorded on
+    # one machine can be compared on another
+    relative_metrics = {}
+    for metric, value in metrics.items():
+        if metric in UNGATED_METRICS:
+            continue
+        if metric.endswith("_per_second"):
+            relative_metrics[metric] = value * calibration_seconds
+        elif metric.endswith("_seconds"):
+            relative_metrics[metric] = value / calibration_seconds
+        else:
+            relative_metrics[metric] = value
+    return relative_metrics
+
+
+def run_game(
+    scenario_string: str, steps: int, seed: int, export_path: str
+) -> dict[str, float]:
+    random.seed(seed)
+    game = Game(current_scenario=Scenario(), recording_export_path=export_path)
+    timings = {
+        "load_scenario_seconds": time_call(game.load_scenario, scenario_string),
+        "reset_seconds": time_call(game.reset),
+    }
+    start_time = time.perf_counter()
+    for _ in range(steps):
+        game.step("")
+    timings["steps_per_second"] = steps / (time.perf_counter() - start_time)
+    timings["export_scenario_seconds"] = time_call(game.export_scenario)
+    game.start_recording()
+    timings["record_step_seconds"] = time_call(game.record_step, True)
+    return timings
+
+
+def run_resets(scenario_string: str, resets: int) -> dict[str, float]:
+    game = Game(current_scenario=Scenario())
+    game.load_scenario(scenario_string)
+    game.reset()
+    timings = {
+        "resets_per_second": resets
+        / sum(time_call(game.reset) for _ in range(resets))
+    }
+    # the deepcopy that reset used before scenario snapshots, kept for comparison
+    initial_scenario = game.initial_scenario
+    timings["deepcopy_resets_per_second"] = resets / sum(
+        time_call(copy.deepcopy, initial_scenario) for _ in range(resets)
+    )
+    return timings
+
+
+def benchmark_scenario(
+    scenario_string: str, steps: int, repeats: int, seed: int
+) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as export_path:
+        runs = [
+            run_game(scenario_string, steps, seed, export_path) for _ in range(repeats)
+        ]
+        tracemalloc.start()
+        try:
+            run_game(scenario_string, steps, seed, export_path)
+            peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    for run in runs:
+        run.update(run_resets(scenario_string, DEFAULT_RESETS))
+
+    # best-of-n like timeit, which is far less sensitive to machine noise than the mean
+    results = {
+        metric: (max if metric in HIGHER_IS_BETTER_METRICS else min)(
+            run[metric] for run in runs
+        )
+        for metric in runs[0]
+    }
+    results["peak_memory_mb"] = peak_memory_bytes / (1024 * 1024)
+    return results
+
+
+def get_benchmark_scenarios(
+    sides: list[int], units: list[int], large_units: int, seed: int
+) -> dict[str, str]:
+    scenarios = {}
+    for scenario_file_name in BUNDLED_SCENARIOS:
+        with open(os.path.join(BUNDLED_SCENARIO_FOLDER, scenario_file_name), "r") as f:
+            scenarios[os.path.splitext(scenario_file_name)[0]] = f.read()
+    for num_sides in sides:
+        for units_per_side in units:
+            random.seed(seed)
+            scenarios[f"load_test_{num_sides}x{units_per_side}"] = json.dumps(
+                generate_scenario(
+                    num_sides,
+                    units_per_side,
+                    hostile=True,
+                    latitude_range=LOAD_TEST_LATITUDE_RANGE,
+                    longitude_range=LOAD_TEST_LONGITUDE_RANGE,
+                    armed_weapons=True,
+                )
+            )
+    if large_units > 0:
+        # a single side never engages, so this case mostly measures loading, resetting
+        # and exporting a large scenario
+        random.seed(seed)
+        scenarios[f"load_test_1x{large_units}"] = json.dumps(
+            generate_scenario(1, large_units, armed_weapons=True)
+        )
+    return scenarios
+
+
+def get_relative_results(results: dict) -> dict:
+    calibration_seconds = results["metadata"]["calibration_seconds"]
+    return {
+        "metadata": {**results["metadata"], "relative_to_calibration": True},
+        "scenarios": {
+            scenario_name: get_relative_metrics(metrics, calibration_seconds)
+            for scenario_name, metrics in results["scenarios"].items()
+        },
+    }
+
+
+def compare_results(
+    relative_results: dict, baseline: dict, tolerance: float
+) -> list[str]:
+    regressions = []
+    for scenario_name, metrics in relative_results["scenarios"].items():
+        baseline_metrics = baseline["scenarios"].get(scenario_name)
+        if baseline_metrics is None:
+            continue
+        for metric, value in metrics.items():
+            baseline_value = baseline_metrics.get(metric)
+            if not baseline_value:
+                continue
+            change = (value - baseline_value) / baseline_value
+            if metric in HIGHER_IS_BETTER_METRICS:
+                regressed = change < -tolerance
+            else:
+                regressed = change > tolerance
+            status = "REGRESSION" if regressed else "ok"
+            print(
+                f"{scenario_name:<24} {metric:<26} {baseline_value:>12.6g} -> {value:>12.6g} ({change:+.1%}) {status}"
+            )
+            if regressed:
+                regressions.append(f"{scenario_name} {metric}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the BLADE engine on load-test and bundled scenarios"
+    )
+    parser.add_argument(
+        "-s", "--sides", type=int, nargs="+", default=DEFAULT_SIDES, help="Sides sweep"
+    )
+    parser.add_argument(
+        "-u",
+        "--units",
+        type=int,
+        nargs="+",
+        default=DEFAULT_UNITS,
+        help="Units of each type per side sweep",
+    )
+    parser.add_argument(
+        "--large-units",
+        type=int,
+        default=DEFAULT_LARGE_UNITS,
+        help="Units of each type in the single-side large scenario, 0 to skip it",
+    )
+    parser.add_argument(
+        "--steps", type=int, default=DEFAULT_STEPS, help="Steps per benchmark run"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=DEFAULT_REPEATS, help="Runs per scenario"
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="benchmark_results.json",
+        help="Path the benchmark results are written to",
+    )
+    parser.add_argument(
+        "-b", "--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline results path"
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed relative slowdown, after calibration, before a metric counts as "
+        "a regression",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Overwrite the baseline with these results instead of comparing",
+    )
+    args = parser.parse_args()
+
+    results = {
+        "metadata": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "steps": args.steps,
+            "repeats": args.repeats,
+            "seed": args.seed,
+            "timestamp": int(time.time()),
+            "calibration_seconds": calibrate(args.repeats),
+        },
+        "scenarios": {},
+    }
+    scenarios = get_benchmark_scenarios(
+        args.sides, args.units, args.large_units, args.seed
+    )
+    for scenario_name, scenario_string in scenarios.items():
+        results["scenarios"][scenario_name] = benchmark_scenario(
+            scenario_string, args.steps, args.repeats, args.seed
+        )
+        print(f"{scenario_name}: {json.dumps(results['scenarios'][scenario_name])}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Benchmark results written to {args.output}")
+
+    relative_results = get_relative_results(results)
+    if args.update_baseline:
+        # only calibrated ratios are stored, raw timings are specific to this machine
+        with open(args.baseline, "w") as f:
+            json.dump(relative_results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if not baseline["metadata"].get("relative_to_calibration"):
+            print(
+                f"Baseline at {args.baseline} holds raw timings, rerun with "
+                "--update-baseline to record calibrated ratios"
+            )
+            sys.exit(1)
+        regressions = compare_results(relative_results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) found: {', '.join(regressions)}")
+            sys.exit(1)
+        print("No regressions found")
+    else:
+        print(f"No baseline found at {args.baseline}, skipping comparison")
@@ -0,0 +1,25 @@
+import argparse
+
+from blade.utils.TrajectoryStore import convert_recording_to_trajectory_store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert a BLADE recording into per-unit trajectory arrays"
+    )
+    parser.add_argument(
+        "recording", help="Recording manifest (.manifest.json) or segment file"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="trajectories.npz",
+        help="Output .npz file, or a directory of memory-mappable .npy files",
+    )
+    args = parser.parse_args()
+
+    trajectory_store = convert_recording_to_trajectory_store(
+        args.recording, args.output
+    )
+    print(
+        f"Trajectories of {len(trajectory_store.arrays['unit_ids'])} units written to {args.output}"
+    )
@@ -16,7 +16,9 @@ def generate_route(lat, lon, num_waypoints=3, max_offset=1.0):
     ]
 
 
-def create_weapon(side_id: str, color: str, base_lat: float, base_lon: float) -> dict:
+def create_weapon(
+    side_id: str, color: str, base_lat: float, base_lon: float, armed: bool = False
+) -> dict:
     """Factory for a single weapon."""
     return {
         "id": str(uuid.uuid4()),
@@ -28,20 +30,27 @@ def create_weapon(side_id: str, color: str, base_lat: float, base_lon: float) ->
         "altitude": 0,
         "heading": random.uniform(0, 360),
         "speed": random.uniform(100, 1000),
-        "currentFuel": 0,
-        "maxFuel": 0,
-        "fuelRate": 0,
+        "currentFuel": 50 if armed else 0,
+        "maxFuel": 50 if armed else 0,
+        "fuelRate": random.uniform(100, 500) if armed else 0,
         "range": random.uniform(10, 100),
         "route": [],
         "sideColor": color,
-        "targetId": None,
+        "targetId": "" if armed else None,
         "lethality": random.uniform(0.1, 1),
         "maxQuantity": random.randint(1, 100),
         "currentQuantity": random.randint(1, 100),
     }
 
 
-def generate_scenario(num_sides: int, units_per_side: int) -> dict:
+def generate_scenario(
+    num_sides: int,
+    units_per_side: int,
+    hostile: bool = False,
+    latitude_range: float = 90,
+    longitude_range: float = 180,
+    armed_weapons: bool = False,
+) -> dict:
     timestamp = int(time.time())
     scenario = {
         "currentScenario": {
@@ -84,8 +93,8 @@ def generate_scenario(num_sides: int, units_per_side: int) -> dict:
         for j in range(units_per_side):
             idx = f"{i}-{j}"
             # Random base coordinates
-            lat = random.uniform(-90, 90)
-            lon = random.uniform(-180, 180)
+            lat = random.uniform(-latitude_range, latitude_range)
+            lon = random.uniform(-longitude_range, longitude_range)
 
             # Aircraft
             aircraft = {
@@ -105,7 +114,10 @@ def generate_scenario(num_sides: int, units_per_side: int) -> dict:
                 "route": generate_route(lat, lon),
                 "selected": False,
                 "sideColor": color,
-                "weapons": [create_weapon(side_id, color, lat, lon)],
+                "weapons": [create_weapon(side_id, color, lat, lon, armed_weapons)],
+                "homeBaseId": "",
+                "rtb": False,
+                "targetId": "",
             }
             scenario["currentScenario"]["aircraft"].append(aircraft)
 
@@ -129,7 +141,9 @@ def generate_scenario(num_sides: int, units_per_side: int) -> dict:
                 "route": generate_route(ship_lat, ship_lon),
                 "selected": False,
                 "sideColor": color,
-                "weapons": [create_weapon(side_id, color, ship_lat, ship_lon)],
+                "weapons": [
+                    create_weapon(side_id, color, ship_lat, ship_lon, armed_weapons)
+                ],
                 "aircraft": [],
             }
             scenario["currentScenario"]["ships"].append(ship)
@@ -147,7 +161,11 @@ def generate_scenario(num_sides: int, units_per_side: int) -> dict:
                 "altitude": 0,
                 "range": random.uniform(50, 300),
                 "sideColor": color,
-                "weapons": [create_weapon(side_id, color, facility_lat, facility_lon)],
+                "weapons": [
+                    create_weapon(
+                        side_id, color, facility_lat, facility_lon, armed_weapons
+                    )
+                ],
             }
             scenario["currentScenario"]["facilities"].append(facility)
 
@@ -181,6 +199,13 @@ def generate_scenario(num_sides: int, units_per_side: int) -> dict:
             }
             scenario["currentScenario"]["referencePoints"].append(reference_point)
 
+    if hostile:
+        side_ids = [side["id"] for side in scenario["currentScenario"]["sides"]]
+        for side_id in side_ids:
+            scenario["currentScenario"]["relationships"]["hostiles"][side_id] = [
+                hostile_id for hostile_id in side_ids if hostile_id != side_id
+            ]
+
     # Set currentSideId to first side
     if scenario["currentScenario"]["sides"]:
         scenario["currentSideId"] = scenario["currentScenario"]["sides"][0]["id"]
@@ -196,9 +221,36 @@ if __name__ == "__main__":
     parser.add_argument(
         "-u", "--units", type=int, default=500, help="Number of each unit type per side"
     )
+    parser.add_argument(
+        "--hostile", action="store_true", help="Make every side hostile to all others"
+    )
+    parser.add_argument(
+        "--latitude-range",
+        type=float,
+        default=90,
+        help="Place units between -range and +range degrees of latitude",
+    )
+    parser.add_argument(
+        "--longitude-range",
+        type=float,
+        default=180,
+        help="Place units between -range and +range degrees of longitude",
+    )
+    parser.add_argument(
+        "--armed-weapons",
+        action="store_true",
+        help="Give weapons fuel so they have an engagement range and can be fired",
+    )
     args = parser.parse_args()
 
-    scenario = generate_scenario(args.sides, args.units)
+    scenario = generate_scenario(
+        args.sides,
+        args.units,
+        hostile=args.hostile,
+        latitude_range=args.latitude_range,
+        longitude_range=args.longitude_range,
+        armed_weapons=args.armed_weapons,
+    )
     with open("load_test_scenario.json", "w") as f:
         json.dump(scenario, f, indent=2)
     print(
@@ -5,6 +5,7 @@ from blade.Scenario import Scenario
 from stable_baselines3 import PPO
 from gymnasium.spaces import Box
 from blade.utils.utils import get_bearing_between_two_points
+from blade.utils.actions import ActionType
 
 DEBUG = False
 demo_folder = "./gym/scripts/stable_baselines"
@@ -46,7 +47,7 @@ def action_transform_fnc(observation: Scenario, action: np.ndarray):
     if DEBUG:
         print(f"log: {aircraft.black_box.get_last_log_pp()}")
 
-    action = f"move_aircraft('{aircraft.id}', [[{action[0]}, {action[1]}]])"
+    action = (ActionType.MOVE_AIRCRAFT, aircraft.id, [[action[0], action[1]]])
     return action
 
 